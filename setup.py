@@ -35,6 +35,7 @@ setup(
     license="Apache Software License",
     author="Zoomus Contributors",
     install_requires=["requests", "PyJWT"],
+    extras_require={"async": ["httpx"]},
     author_email="zoomus@googlegroups.com",
     description=description,
     long_description=long_description,
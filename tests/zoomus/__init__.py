@@ -0,0 +1,21 @@
+import json
+
+import requests
+
+
+def make_response(data=None, status_code=200, headers=None, content=None):
+    """A :class:`requests.Response` to return from a mocked request
+
+    :param data: The JSON body, ``{}`` when neither it nor ``content`` is
+                 given
+    :param status_code: The status code
+    :param headers: The response headers
+    :param content: The raw body, instead of ``data``
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    if content is None:
+        content = json.dumps({} if data is None else data).encode("utf-8")
+    response._content = content
+    return response
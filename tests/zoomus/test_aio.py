@@ -0,0 +1,138 @@
+import asyncio
+import json
+import unittest
+
+from zoomus import components, retry, util
+from zoomus.client import COMPONENT_CLASSES
+
+try:
+    import httpx
+    from zoomus import aio
+except ImportError:
+    httpx = None
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock  # type: ignore
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(AsyncZoomClientTestCase))
+    return suite
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class AsyncZoomClientTestCase(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+        self.token_requests = 0
+        self.responses = {}
+
+    def handler(self, request):
+        if request.url.host == "zoom.us":
+            self.token_requests += 1
+            return httpx.Response(
+                200,
+                json={
+                    "access_token": "TOKEN{}".format(self.token_requests),
+                    "expires_in": 3600,
+                },
+            )
+        self.requests.append(request)
+        queued = self.responses.get(request.url.path)
+        if queued:
+            return queued.pop(0)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    def make_client(self, **kwargs):
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        return aio.AsyncZoomClient(
+            "KEY", "SECRET", "ACCOUNT", http_client=http_client, **kwargs
+        )
+
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def test_init_does_not_fetch_token(self):
+        self.make_client()
+        self.assertEqual(self.token_requests, 0)
+
+    def test_exposes_same_components_as_zoom_client(self):
+        client = self.make_client()
+        self.assertEqual(
+            set(client.components.keys()), set(COMPONENT_CLASSES[util.API_VERSION_2])
+        )
+        self.assertIsInstance(client.user, components.user.UserComponentV2)
+        self.assertIsInstance(client.user, aio.AsyncClientMixin)
+        self.assertIs(client.meeting.session, client.session)
+
+    def test_component_methods_are_awaitable(self):
+        client = self.make_client()
+        response = self.run_async(client.meeting.get(id="42"))
+        self.assertEqual(response.json(), {"path": "/v2/meetings/42"})
+        self.assertEqual(self.requests[0].headers["Authorization"], "Bearer TOKEN1")
+
+    def test_posts_json_data(self):
+        client = self.make_client()
+        self.run_async(client.user.create(action="create"))
+        self.assertEqual(self.requests[0].method, "POST")
+        self.assertEqual(json.loads(self.requests[0].content), {"action": "create"})
+        self.assertEqual(self.requests[0].headers["Content-Type"], "application/json")
+
+    def test_concurrent_calls_share_one_token_fetch(self):
+        client = self.make_client()
+
+        async def fan_out():
+            return await asyncio.gather(
+                *[client.meeting.get(id=str(i)) for i in range(20)]
+            )
+
+        responses = self.run_async(fan_out())
+        self.assertEqual(len(responses), 20)
+        self.assertEqual(self.token_requests, 1)
+        self.assertEqual(client.config["token"], "TOKEN1")
+
+    def test_unauthorized_request_is_replayed_with_renewed_token(self):
+        self.responses["/v2/users/me"] = [httpx.Response(401)]
+        client = self.make_client()
+        response = self.run_async(client.user.me())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.token_requests, 2)
+        self.assertEqual(self.requests[1].headers["Authorization"], "Bearer TOKEN2")
+
+    def test_retries_with_retry_policy(self):
+        self.responses["/v2/users/me"] = [httpx.Response(503)]
+        client = self.make_client(retry_policy=retry.RetryPolicy(backoff_factor=0))
+        response = self.run_async(client.user.me())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.requests), 2)
+
+    def test_paces_with_rate_limiter(self):
+        limiter = mock.Mock()
+        limiter.reserve.return_value = 0
+        client = self.make_client(rate_limiter=limiter)
+        self.run_async(client.report.get_daily_report(month=1, year=2020))
+        limiter.reserve.assert_called_once_with("GET", "/report/daily")
+
+    def test_setting_credentials_fetches_new_token_on_next_call(self):
+        client = self.make_client()
+        self.run_async(client.user.me())
+        client.client_id = "NEW-KEY"
+        self.assertEqual(client.client_id, "NEW-KEY")
+        self.run_async(client.user.me())
+        self.assertEqual(self.token_requests, 2)
+
+    def test_closes_owned_http_client(self):
+        async def use_client():
+            async with aio.AsyncZoomClient("KEY", "SECRET", "ACCOUNT") as client:
+                pass
+            return client.session.is_closed
+
+        self.assertTrue(self.run_async(use_client()))
+
+
+if __name__ == "__main__":
+    unittest.main()
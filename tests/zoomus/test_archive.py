@@ -0,0 +1,144 @@
+import datetime
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from zoomus import archive
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock  # type: ignore
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(RecordingArchiverTestCase))
+    return suite
+
+
+def make_meeting(uuid, sizes):
+    return {
+        "uuid": uuid,
+        "recording_files": [
+            {
+                "id": "{}-{}".format(uuid, index),
+                "download_url": "http://foo.com/{}/{}".format(uuid, index),
+                "file_size": size,
+                "file_extension": "MP4",
+            }
+            for index, size in enumerate(sizes)
+        ],
+    }
+
+
+class RecordingArchiverTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.client = mock.Mock()
+        self.client.user.iter_list.return_value = [{"id": "u1"}, {"id": "u2"}]
+        self.meetings = {
+            "u1": [make_meeting("m1", [10, 20])],
+            "u2": [make_meeting("/m2", [30]), {"uuid": "m3"}],
+        }
+        self.client.recording.iter_list.side_effect = lambda user_id, **kwargs: (
+            self.meetings[user_id]
+        )
+        self.client.recording.download.side_effect = self.download
+        self.downloads = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def download(self, url, path, file_size=None, segments=1):
+        with self.lock:
+            self.downloads.append(url)
+        with open(path, "wb") as fh:
+            fh.write(b"x" * file_size)
+
+    def make_archiver(self, **kwargs):
+        return archive.RecordingArchiver(
+            self.client,
+            self.directory,
+            datetime.date(2020, 1, 1),
+            datetime.date(2020, 12, 31),
+            **kwargs,
+        )
+
+    def test_archives_every_recording_file(self):
+        progress = self.make_archiver(delete=True).run()
+        self.assertEqual(
+            progress.snapshot(),
+            {
+                "list": 3,
+                "download": 3,
+                "verify": 3,
+                "delete": 3,
+                "skipped": 0,
+                "bytes": 60,
+                "failed": 0,
+            },
+        )
+        self.assertTrue(os.path.exists(os.path.join(self.directory, "m1", "m1-1.mp4")))
+        self.assertTrue(
+            os.path.exists(os.path.join(self.directory, "_m2", "_m2-0.mp4"))
+        )
+        self.client.recording.delete_single_recording.assert_any_call(
+            meeting_id="%252Fm2", recording_id="/m2-0", action="trash"
+        )
+        self.client.recording.iter_list.assert_any_call(
+            user_id="u1",
+            start=datetime.date(2020, 1, 1),
+            end=datetime.date(2020, 12, 31),
+        )
+
+    def test_skips_archived_files(self):
+        self.make_archiver().run()
+        self.downloads = []
+        progress = self.make_archiver().run()
+        self.assertEqual(self.downloads, [])
+        self.assertEqual(progress.snapshot()["skipped"], 3)
+        self.assertEqual(progress.snapshot()["verify"], 3)
+
+    def test_failed_files_are_not_deleted(self):
+        def verify(path, recording_file):
+            return recording_file["id"] != "m1-0"
+
+        progress = self.make_archiver(delete=True, verify=verify).run()
+        self.assertEqual(progress.snapshot()["delete"], 2)
+        self.assertEqual(len(progress.failures), 1)
+        stage, item, error = progress.failures[0]
+        self.assertEqual(stage, archive.VERIFY)
+        self.assertEqual(item.recording_file["id"], "m1-0")
+        self.assertIsInstance(error, IOError)
+
+    def test_queues_are_bounded(self):
+        self.meetings["u1"] = [make_meeting("m{}".format(i), [1]) for i in range(50)]
+        self.meetings["u2"] = []
+        release = threading.Event()
+        outstanding = []
+
+        def slow_download(url, path, file_size=None, segments=1):
+            release.wait(5)
+            self.download(url, path, file_size)
+
+        def on_progress(progress):
+            counts = progress.snapshot()
+            outstanding.append(counts["list"] - counts["download"])
+            if counts["list"] >= 4:
+                release.set()
+
+        self.client.recording.download.side_effect = slow_download
+        self.make_archiver(
+            download_workers=1, queue_size=2, on_progress=on_progress
+        ).run()
+        # Two queued, one being downloaded and one waiting to be queued
+        self.assertLessEqual(max(outstanding), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
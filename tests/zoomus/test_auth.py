@@ -0,0 +1,215 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from zoomus import auth
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock  # type: ignore
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(TokenManagerTestCase))
+    suite.addTest(unittest.makeSuite(TokenManagerStoreTestCase))
+    suite.addTest(unittest.makeSuite(FileTokenStoreTestCase))
+    suite.addTest(unittest.makeSuite(SQLiteTokenStoreTestCase))
+    return suite
+
+
+@mock.patch("zoomus.auth.time.time", return_value=1000)
+@mock.patch("zoomus.auth.util.request_access_token")
+class TokenManagerTestCase(unittest.TestCase):
+    def test_fetches_token_on_first_use(self, mock_request, mock_time):
+        mock_request.return_value = {"access_token": "TOKEN", "expires_in": 3600}
+        manager = auth.TokenManager("KEY", "SECRET", "ACCOUNT")
+        self.assertEqual(manager.token, "TOKEN")
+        self.assertEqual(manager.expires_at, 4600)
+        mock_request.assert_called_once_with("KEY", "SECRET", "ACCOUNT", session=None)
+
+    def test_reuses_token_until_refresh_margin(self, mock_request, mock_time):
+        mock_request.return_value = {"access_token": "TOKEN", "expires_in": 3600}
+        manager = auth.TokenManager("KEY", "SECRET", "ACCOUNT", refresh_margin=300)
+        manager.token
+        mock_time.return_value = 4299
+        manager.token
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_refreshes_token_within_refresh_margin(self, mock_request, mock_time):
+        mock_request.return_value = {"access_token": "OLD", "expires_in": 3600}
+        manager = auth.TokenManager("KEY", "SECRET", "ACCOUNT", refresh_margin=300)
+        manager.token
+        mock_time.return_value = 4300
+        mock_request.return_value = {"access_token": "NEW", "expires_in": 3600}
+        self.assertEqual(manager.token, "NEW")
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_failed_fetch_is_retried_on_next_use(self, mock_request, mock_time):
+        mock_request.return_value = {"reason": "Invalid client_id or client_secret"}
+        manager = auth.TokenManager("KEY", "SECRET", "ACCOUNT")
+        self.assertIsNone(manager.token)
+        self.assertIsNone(manager.token)
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_concurrent_first_uses_fetch_once(self, mock_request, mock_time):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_request(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return {"access_token": "TOKEN", "expires_in": 3600}
+
+        mock_request.side_effect = slow_request
+        manager = auth.TokenManager("KEY", "SECRET", "ACCOUNT")
+        tokens = []
+        threads = [
+            threading.Thread(target=lambda: tokens.append(manager.token))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        started.wait(5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(tokens, ["TOKEN"] * 8)
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_renew_fetches_once_for_same_rejected_token(self, mock_request, mock_time):
+        mock_request.return_value = {"access_token": "OLD", "expires_in": 3600}
+        manager = auth.TokenManager("KEY", "SECRET", "ACCOUNT")
+        manager.token
+        mock_request.return_value = {"access_token": "NEW", "expires_in": 3600}
+        self.assertEqual(manager.renew("OLD"), "NEW")
+        self.assertEqual(manager.renew("OLD"), "NEW")
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_renew_ignores_unknown_tokens(self, mock_request, mock_time):
+        mock_request.return_value = {"access_token": "TOKEN", "expires_in": 3600}
+        manager = auth.TokenManager("KEY", "SECRET", "ACCOUNT")
+        manager.token
+        self.assertIsNone(manager.renew("SOMETHING-ELSE"))
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_calls_on_refresh_with_new_token(self, mock_request, mock_time):
+        mock_request.return_value = {"access_token": "TOKEN", "expires_in": 3600}
+        on_refresh = mock.Mock()
+        manager = auth.TokenManager("KEY", "SECRET", "ACCOUNT", on_refresh=on_refresh)
+        manager.refresh()
+        on_refresh.assert_called_once_with("TOKEN")
+
+    @mock.patch("zoomus.auth.threading.Timer")
+    def test_schedules_background_refresh(self, mock_timer, mock_request, mock_time):
+        mock_request.return_value = {"access_token": "TOKEN", "expires_in": 3600}
+        manager = auth.TokenManager(
+            "KEY", "SECRET", "ACCOUNT", refresh_margin=300, background_refresh=True
+        )
+        manager.refresh()
+        mock_timer.assert_called_once_with(3300, manager._refresh_in_background)
+        mock_timer.return_value.start.assert_called_once_with()
+        manager.close()
+        mock_timer.return_value.cancel.assert_called_once_with()
+
+
+@mock.patch("zoomus.auth.time.time", return_value=1000)
+@mock.patch("zoomus.auth.util.request_access_token")
+class TokenManagerStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = auth.SQLiteTokenStore(os.path.join(self.directory, "tokens.db"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_fetched_token_is_stored(self, mock_request, mock_time):
+        mock_request.return_value = {"access_token": "TOKEN", "expires_in": 3600}
+        manager = auth.TokenManager("KEY", "SECRET", "ACCOUNT", store=self.store)
+        self.assertEqual(manager.token, "TOKEN")
+        self.assertEqual(self.store.get("ACCOUNT:KEY"), ("TOKEN", 4600))
+
+    def test_uses_valid_stored_token_without_fetching(self, mock_request, mock_time):
+        self.store.set("ACCOUNT:KEY", "SHARED", 4600)
+        manager = auth.TokenManager("KEY", "SECRET", "ACCOUNT", store=self.store)
+        self.assertEqual(manager.token, "SHARED")
+        self.assertEqual(manager.expires_at, 4600)
+        mock_request.assert_not_called()
+
+    def test_fetches_when_stored_token_is_expiring(self, mock_request, mock_time):
+        self.store.set("ACCOUNT:KEY", "SHARED", 1200)
+        mock_request.return_value = {"access_token": "TOKEN", "expires_in": 3600}
+        manager = auth.TokenManager("KEY", "SECRET", "ACCOUNT", store=self.store)
+        self.assertEqual(manager.token, "TOKEN")
+
+    def test_managers_share_one_fetch(self, mock_request, mock_time):
+        mock_request.return_value = {"access_token": "TOKEN", "expires_in": 3600}
+        first = auth.TokenManager("KEY", "SECRET", "ACCOUNT", store=self.store)
+        second = auth.TokenManager("KEY", "SECRET", "ACCOUNT", store=self.store)
+        self.assertEqual(first.token, "TOKEN")
+        self.assertEqual(second.token, "TOKEN")
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_renew_takes_token_renewed_by_other_manager(self, mock_request, mock_time):
+        mock_request.return_value = {"access_token": "OLD", "expires_in": 3600}
+        first = auth.TokenManager("KEY", "SECRET", "ACCOUNT", store=self.store)
+        second = auth.TokenManager("KEY", "SECRET", "ACCOUNT", store=self.store)
+        first.token
+        second.token
+        mock_request.return_value = {"access_token": "NEW", "expires_in": 3600}
+        self.assertEqual(first.renew("OLD"), "NEW")
+        self.assertEqual(second.renew("OLD"), "NEW")
+        self.assertEqual(mock_request.call_count, 2)
+
+
+class FileTokenStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = auth.FileTokenStore(os.path.join(self.directory, "tokens.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_missing_token_returns_none(self):
+        self.assertIsNone(self.store.get("ACCOUNT:KEY"))
+
+    def test_can_set_and_get_tokens(self):
+        with self.store.lock("ACCOUNT:KEY"):
+            self.store.set("ACCOUNT:KEY", "TOKEN", 4600)
+            self.store.set("OTHER:KEY", "OTHER", 5600)
+        self.assertEqual(self.store.get("ACCOUNT:KEY"), ("TOKEN", 4600))
+        self.assertEqual(self.store.get("OTHER:KEY"), ("OTHER", 5600))
+
+
+class SQLiteTokenStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "tokens.db")
+        self.store = auth.SQLiteTokenStore(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_missing_token_returns_none(self):
+        self.assertIsNone(self.store.get("ACCOUNT:KEY"))
+
+    def test_tokens_are_visible_to_other_stores(self):
+        with self.store.lock("ACCOUNT:KEY"):
+            self.store.set("ACCOUNT:KEY", "TOKEN", 4600)
+        other = auth.SQLiteTokenStore(self.path)
+        self.assertEqual(other.get("ACCOUNT:KEY"), ("TOKEN", 4600))
+
+    def test_failed_lock_body_discards_changes(self):
+        with self.assertRaises(RuntimeError):
+            with self.store.lock("ACCOUNT:KEY"):
+                self.store.set("ACCOUNT:KEY", "TOKEN", 4600)
+                raise RuntimeError
+        self.assertIsNone(self.store.get("ACCOUNT:KEY"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import unittest
+
+from tests.zoomus import make_response
+from zoomus import cache, components, util
+import responses
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(ResponseCacheTestCase))
+    suite.addTest(unittest.makeSuite(CachedComponentTestCase))
+    return suite
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = cache.ResponseCache(clock=self.clock)
+
+    def test_ttl_by_route(self):
+        self.assertEqual(self.cache.ttl_for("GET", "/users/abc/settings"), 300)
+        self.assertEqual(self.cache.ttl_for("GET", "phone/calling_plans/"), 3600)
+        self.assertIsNone(self.cache.ttl_for("GET", "/users"))
+        self.assertIsNone(self.cache.ttl_for("PATCH", "/users/abc"))
+        self.assertEqual(
+            cache.ResponseCache(default_ttl=10).ttl_for("GET", "/users"), 10
+        )
+
+    def test_canonical_key(self):
+        self.assertEqual(
+            self.cache.key("get", "users/abc/", {"b": 1, "a": "x", "c": None}),
+            self.cache.key("GET", "/users/abc", {"a": "x", "b": 1}),
+        )
+        self.assertNotEqual(
+            self.cache.key("GET", "/users/abc", {"a": 1}),
+            self.cache.key("GET", "/users/abc", {"a": 2}),
+        )
+
+    def test_expires(self):
+        sent = []
+
+        def send():
+            sent.append(1)
+            return make_response()
+
+        for now in (0, 299, 300):
+            self.clock.now = now
+            self.cache.fetch("GET", "/users/abc", None, send)
+        self.assertEqual(len(sent), 2)
+        self.assertEqual(
+            self.cache.stats(),
+            {"hits": 1, "misses": 2, "evictions": 0, "entries": 1, "size": 2},
+        )
+
+    def test_uncached_endpoints_and_errors(self):
+        sent = []
+
+        def send(status_code):
+            sent.append(status_code)
+            return make_response(status_code=status_code)
+
+        for _ in range(2):
+            self.cache.fetch("GET", "/users", None, lambda: send(200))
+            self.cache.fetch("GET", "/users/abc", None, lambda: send(404))
+        self.assertEqual(sent, [200, 404, 200, 404])
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+    def test_evicts_least_recently_used(self):
+        lru = cache.ResponseCache(max_size=10, clock=self.clock)
+        for name in "abc":
+            lru.set(("GET", name, "{}"), make_response(content=b"x" * 4), 60)
+            lru.get(("GET", "a", "{}"))
+        self.assertIsNotNone(lru.get(("GET", "a", "{}")))
+        self.assertIsNone(lru.get(("GET", "b", "{}")))
+        self.assertEqual(lru.stats()["evictions"], 1)
+        self.assertEqual(lru.size, 8)
+        lru.set(("GET", "d", "{}"), make_response(content=b"x" * 11), 60)
+        self.assertIsNone(lru.get(("GET", "d", "{}")))
+
+    def test_scoped_key(self):
+        self.assertNotEqual(
+            self.cache.key("GET", "/users/abc", scope=("http://a.com", "1")),
+            self.cache.key("GET", "/users/abc", scope=("http://b.com", "1")),
+        )
+
+    def test_invalidate(self):
+        for endpoint in ("/users/abc", "/users/abc/settings", "/users/abcd"):
+            self.cache.set(self.cache.key("GET", endpoint), make_response(), 60)
+        self.cache.invalidate("users/abc")
+        self.assertEqual(self.cache.stats()["entries"], 1)
+        self.assertIsNotNone(self.cache.get(self.cache.key("GET", "/users/abcd")))
+
+    def test_invalidate_endpoints_above(self):
+        for endpoint in ("/users/abc", "/users/abc/settings", "/users/abd"):
+            self.cache.set(self.cache.key("GET", endpoint), make_response(), 60)
+        self.cache.invalidate("/users/abc/email")
+        self.assertEqual(self.cache.stats()["entries"], 2)
+        self.assertIsNone(self.cache.get(self.cache.key("GET", "/users/abc")))
+        self.cache.invalidate()
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+
+class CachedComponentTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache = cache.ResponseCache()
+        self.component = components.user.UserComponentV2(
+            base_uri="http://foo.com",
+            config={"version": util.API_VERSION_2, "token": "token"},
+            response_cache=self.cache,
+        )
+
+    @responses.activate
+    def test_caches_get_requests(self):
+        responses.add(responses.GET, "http://foo.com/users/abc/settings", json={"a": 1})
+        for _ in range(3):
+            response = self.component.get_settings(id="abc")
+            self.assertEqual(response.json(), {"a": 1})
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(self.cache.stats()["hits"], 2)
+
+    @responses.activate
+    def test_writes_invalidate(self):
+        responses.add(responses.GET, "http://foo.com/users/abc/settings", json={"a": 1})
+        responses.add(responses.PATCH, "http://foo.com/users/abc/settings", status=204)
+        self.component.get_settings(id="abc")
+        self.component.update_settings(id="abc", a=2)
+        self.component.get_settings(id="abc")
+        self.assertEqual(
+            [call.request.method for call in responses.calls], ["GET", "PATCH", "GET"]
+        )
+
+    @responses.activate
+    def test_writes_below_invalidate_the_resource(self):
+        responses.add(responses.GET, "http://foo.com/users/abc", json={"email": "a"})
+        responses.add(responses.PUT, "http://foo.com/users/abc/email", status=204)
+        responses.add(responses.GET, "http://foo.com/users/abc", json={"email": "b"})
+        self.component.get(id="abc")
+        self.component.update_email(id="abc", email="b")
+        self.assertEqual(self.component.get(id="abc").json(), {"email": "b"})
+
+    @responses.activate
+    def test_clients_sharing_the_cache_are_kept_apart(self):
+        responses.add(responses.GET, "http://foo.com/users/abc", json={"a": 1})
+        responses.add(responses.GET, "http://eu.foo.com/users/abc", json={"a": 2})
+        other = components.user.UserComponentV2(
+            base_uri="http://eu.foo.com",
+            config={"version": util.API_VERSION_2, "token": "other"},
+            response_cache=self.cache,
+        )
+        self.assertEqual(self.component.get(id="abc").json(), {"a": 1})
+        self.assertEqual(other.get(id="abc").json(), {"a": 2})
+        self.assertEqual(len(responses.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
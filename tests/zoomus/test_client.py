@@ -1,7 +1,13 @@
+import hashlib
+import hmac
+import json
+import time
 import unittest
 
-from zoomus import components, ZoomClient, util
-from zoomus.client import API_BASE_URIS
+import requests
+
+from zoomus import components, ratelimit, ZoomClient, util
+from zoomus.client import API_BASE_URIS, validate_webhook
 
 try:
     from unittest import mock
@@ -13,6 +19,7 @@ def suite():
     """Define all the tests of the module."""
     suite = unittest.TestSuite()
     suite.addTest(unittest.makeSuite(ZoomClientTestCase))
+    suite.addTest(unittest.makeSuite(ValidateWebhookTestCase))
     return suite
 
 
@@ -221,12 +228,112 @@ class ZoomClientTestCase(unittest.TestCase):
         with ZoomClient("KEY", "SECRET", "ACCOUNT") as client:
             self.assertIsInstance(client, ZoomClient)
 
-    @mock.patch("zoomus.client.util.generate_jwt")
-    def test_refresh_token_replaces_config_token_with_new_jwt(self, mock_jwt):
+    @mock.patch("zoomus.client.util.request_access_token")
+    def test_refresh_token_replaces_config_token_with_new_jwt(self, mock_request):
+        mock_request.return_value = {"access_token": "OLD", "expires_in": 3600}
         client = ZoomClient("KEY", "SECRET", "ACCOUNT")
+        mock_request.return_value = {"access_token": "NEW", "expires_in": 3600}
         client.refresh_token()
-        mock_jwt.assert_called_with("KEY", "SECRET", "ACCOUNT")
-        self.assertEqual(client.config["token"], (mock_jwt.return_value,))
+        mock_request.assert_called_with(
+            "KEY", "SECRET", "ACCOUNT", session=client.session
+        )
+        self.assertEqual(client.config["token"], "NEW")
+        self.assertEqual(client.user.get_token(), "NEW")
+
+    @mock.patch("zoomus.client.util.request_access_token")
+    def test_setting_client_id_refreshes_token_with_new_credentials(self, mock_request):
+        mock_request.return_value = {"access_token": "TOKEN", "expires_in": 3600}
+        client = ZoomClient("KEY", "SECRET", "ACCOUNT")
+        client.client_id = "NEW-KEY"
+        mock_request.assert_called_with(
+            "NEW-KEY", "SECRET", "ACCOUNT", session=client.session
+        )
+
+    @mock.patch("zoomus.client.util.request_access_token")
+    def test_lazy_token_is_fetched_on_first_api_call(self, mock_request):
+        mock_request.return_value = {"access_token": "TOKEN", "expires_in": 3600}
+        client = ZoomClient("KEY", "SECRET", "ACCOUNT", lazy_token=True)
+        mock_request.assert_not_called()
+        self.assertIsNone(client.config["token"])
+        with mock.patch.object(client.session, "request") as mock_send:
+            client.user.me()
+            client.user.me()
+        mock_request.assert_called_once_with(
+            "KEY", "SECRET", "ACCOUNT", session=client.session
+        )
+        self.assertEqual(
+            mock_send.call_args[1]["headers"], {"Authorization": "Bearer TOKEN"}
+        )
+        self.assertEqual(client.config["token"], "TOKEN")
+
+    @mock.patch("zoomus.client.util.request_access_token")
+    def test_components_share_the_rate_limit_tracker(self, mock_request):
+        client = ZoomClient("KEY", "SECRET", "ACCOUNT")
+        self.assertIsInstance(client.rate_limits, ratelimit.RateLimitTracker)
+        for key in client.components.keys():
+            self.assertIs(client.components[key].rate_limit_tracker, client.rate_limits)
+
+    @mock.patch("zoomus.client.util.request_access_token")
+    def test_components_share_the_client_session(self, mock_request):
+        client = ZoomClient("KEY", "SECRET", "ACCOUNT")
+        self.assertIsInstance(client.session, requests.Session)
+        for key in client.components.keys():
+            self.assertIs(client.components[key].session, client.session)
+
+    @mock.patch("zoomus.client.util.request_access_token")
+    def test_exiting_context_closes_owned_session(self, mock_request):
+        with ZoomClient("KEY", "SECRET", "ACCOUNT") as client:
+            session = client.session = mock.Mock(wraps=client.session)
+        session.close.assert_called_once_with()
+
+    @mock.patch("zoomus.client.util.request_access_token")
+    def test_exiting_context_keeps_given_session_open(self, mock_request):
+        session = mock.Mock()
+        with ZoomClient("KEY", "SECRET", "ACCOUNT", session=session) as client:
+            self.assertIs(client.user.session, session)
+        session.close.assert_not_called()
+
+
+class ValidateWebhookTestCase(unittest.TestCase):
+    def make_event(self, body, secret="secret"):
+        timestamp = str(int(time.time() * 1000))
+        message = "v0:{}:".format(timestamp).encode("utf-8") + body
+        digest = hmac.new(secret.encode("utf-8"), message, hashlib.sha256)
+        return {
+            "headers": {
+                "x-zm-signature": "v0=" + digest.hexdigest(),
+                "x-zm-request-timestamp": timestamp,
+            },
+            "body": body,
+        }
+
+    def test_raw_body_with_valid_signature(self):
+        event = self.make_event(b'{"event": "meeting.started", "payload": {}}')
+        self.assertEqual(validate_webhook(event, "secret"), (True, None, None))
+
+    def test_raw_body_with_invalid_signature(self):
+        event = self.make_event(b'{"event": "meeting.started"}', secret="other")
+        self.assertEqual(validate_webhook(event, "secret"), (False, None, None))
+
+    def test_raw_body_without_headers(self):
+        event = {"headers": {}, "body": b'{"event": "meeting.started"}'}
+        self.assertEqual(validate_webhook(event, "secret"), (False, None, None))
+
+    def test_parsed_body(self):
+        body = {"event": "meeting.started", "payload": {}}
+        event = self.make_event(json.dumps(body, separators=(",", ":")).encode())
+        event["body"] = body
+        self.assertEqual(validate_webhook(event, "secret"), (True, None, None))
+
+    def test_raw_url_validation(self):
+        body = {"event": "endpoint.url_validation", "payload": {"plainToken": "abc"}}
+        event = {"headers": {}, "body": json.dumps(body).encode("utf-8")}
+        valid, status, response = validate_webhook(event, "secret")
+        self.assertEqual(status, 200)
+        self.assertEqual(response["plainToken"], "abc")
+        self.assertEqual(
+            response["encryptedToken"], util.webhook_validation("abc", "secret")
+        )
 
 
 if __name__ == "__main__":
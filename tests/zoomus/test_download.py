@@ -0,0 +1,268 @@
+import asyncio
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+
+from zoomus import components, download, util
+import requests
+import responses
+
+try:
+    import httpx
+    from zoomus import aio
+except ImportError:
+    httpx = None
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock  # type: ignore
+
+URL = "http://foo.com/rec/download/abc"
+CONTENT = b"0123456789" * 100
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(DownloadTestCase))
+    suite.addTest(unittest.makeSuite(SegmentedDownloadTestCase))
+    suite.addTest(unittest.makeSuite(AsyncDownloadTestCase))
+    return suite
+
+
+def ranged(request):
+    """Serve CONTENT, honouring a range header"""
+    header = request.headers.get("Range")
+    if not header:
+        return 200, {}, CONTENT
+    start, end = header.split("=", 1)[1].split("-")
+    start, stop = int(start), int(end or len(CONTENT) - 1) + 1
+    if start >= len(CONTENT):
+        return 416, {}, b""
+    return 206, {}, CONTENT[start:stop]
+
+
+class DownloadTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "meeting.mp4")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_partial(self, data):
+        with open(download.partial_path(self.path), "wb") as fh:
+            fh.write(data)
+
+    def read(self):
+        with open(self.path, "rb") as fh:
+            return fh.read()
+
+    @responses.activate
+    def test_streams_file_in_chunks(self):
+        responses.add_callback(responses.GET, URL, callback=ranged)
+        path = download.download(
+            URL, self.path, token="token", file_size=len(CONTENT), chunk_size=64
+        )
+        self.assertEqual(path, self.path)
+        self.assertEqual(self.read(), CONTENT)
+        self.assertFalse(os.path.exists(download.partial_path(self.path)))
+        self.assertEqual(
+            responses.calls[0].request.headers["Authorization"], "Bearer token"
+        )
+
+    @responses.activate
+    def test_resumes_partial_file_with_range(self):
+        responses.add_callback(responses.GET, URL, callback=ranged)
+        self.write_partial(CONTENT[:300])
+        download.download(URL, self.path, file_size=len(CONTENT))
+        self.assertEqual(self.read(), CONTENT)
+        self.assertEqual(responses.calls[0].request.headers["Range"], "bytes=300-")
+
+    @responses.activate
+    def test_restarts_when_range_is_ignored(self):
+        responses.add(responses.GET, URL, body=CONTENT)
+        self.write_partial(b"garbage")
+        download.download(URL, self.path, file_size=len(CONTENT))
+        self.assertEqual(self.read(), CONTENT)
+
+    @responses.activate
+    def test_resumes_after_connection_error(self):
+        responses.add(responses.GET, URL, body=requests.ConnectionError("reset"))
+        responses.add_callback(responses.GET, URL, callback=ranged)
+        download.download(URL, self.path, file_size=len(CONTENT))
+        self.assertEqual(self.read(), CONTENT)
+
+    @responses.activate
+    def test_size_mismatch_raises_error(self):
+        responses.add(responses.GET, URL, body=CONTENT[:10])
+        with self.assertRaisesRegex(IOError, "Downloaded 10 bytes"):
+            download.download(URL, self.path, file_size=len(CONTENT))
+        self.assertFalse(os.path.exists(self.path))
+
+    @responses.activate
+    def test_renews_rejected_token(self):
+        responses.add(responses.GET, URL, status=401)
+        responses.add(responses.GET, URL, body=CONTENT)
+        renew = mock.Mock(return_value="new")
+        download.download(URL, self.path, token="old", renew_token=renew)
+        renew.assert_called_once_with("old")
+        self.assertEqual(
+            responses.calls[1].request.headers["Authorization"], "Bearer new"
+        )
+
+    @responses.activate
+    def test_recording_component_download_file(self):
+        responses.add(responses.GET, URL, body=CONTENT)
+        component = components.recording.RecordingComponentV2(
+            base_uri="http://foo.com",
+            config={"version": util.API_VERSION_2, "token": "token"},
+        )
+        recording_file = {
+            "id": "file",
+            "download_url": URL,
+            "file_size": len(CONTENT),
+            "file_type": "MP4",
+        }
+        component.download_file(path=self.path, **recording_file)
+        self.assertEqual(self.read(), CONTENT)
+
+
+class SegmentedDownloadTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "meeting.mp4")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read(self):
+        with open(self.path, "rb") as fh:
+            return fh.read()
+
+    def test_split_segments(self):
+        self.assertEqual(
+            download.split_segments(10, 3, min_segment_size=1),
+            [(0, 3), (4, 7), (8, 9)],
+        )
+        self.assertEqual(download.split_segments(10, 3, min_segment_size=6), [(0, 9)])
+
+    @responses.activate
+    def test_writes_ranges_at_their_offsets(self):
+        responses.add_callback(responses.GET, URL, callback=ranged)
+        download.download_segments(
+            URL, self.path, len(CONTENT), 4, chunk_size=64, min_segment_size=1
+        )
+        self.assertEqual(self.read(), CONTENT)
+        self.assertEqual(
+            sorted(call.request.headers["Range"] for call in responses.calls),
+            ["bytes=0-249", "bytes=250-499", "bytes=500-749", "bytes=750-999"],
+        )
+        self.assertFalse(os.path.exists(self.path + download.SEGMENTS_SUFFIX))
+
+    @responses.activate
+    def test_resumes_range_cut_off(self):
+        calls = []
+
+        def cut_off(request):
+            calls.append(request.headers["Range"])
+            status, headers, body = ranged(request)
+            if len(calls) == 1:
+                return status, headers, body[:100]
+            return status, headers, body
+
+        responses.add_callback(responses.GET, URL, callback=cut_off)
+        download.download_segments(URL, self.path, len(CONTENT), 1, min_segment_size=1)
+        self.assertEqual(self.read(), CONTENT)
+        self.assertEqual(calls, ["bytes=0-999", "bytes=100-999"])
+
+    def test_preallocate(self):
+        with open(self.path, "wb") as fh:
+            download.preallocate(fh.fileno(), 1000)
+        self.assertEqual(os.path.getsize(self.path), 1000)
+
+    @mock.patch("zoomus.download.os.ftruncate")
+    @mock.patch("zoomus.download.os.posix_fallocate", create=True)
+    def test_preallocate_falls_back_to_truncate(self, mock_fallocate, mock_truncate):
+        mock_fallocate.side_effect = OSError(errno.EOPNOTSUPP, "not supported")
+        download.preallocate(3, 1000)
+        mock_truncate.assert_called_once_with(3, 1000)
+
+    @responses.activate
+    @mock.patch("zoomus.download.os.posix_fallocate", create=True)
+    def test_full_disk_fails_before_downloading(self, mock_fallocate):
+        mock_fallocate.side_effect = OSError(errno.ENOSPC, "no space left")
+        responses.add_callback(responses.GET, URL, callback=ranged)
+        with self.assertRaises(OSError):
+            download.download_segments(URL, self.path, len(CONTENT), 4)
+        self.assertEqual(len(responses.calls), 0)
+        self.assertFalse(os.path.exists(self.path + download.SEGMENTS_SUFFIX))
+
+    @responses.activate
+    def test_falls_back_when_range_is_ignored(self):
+        responses.add(responses.GET, URL, body=CONTENT)
+        download.download(URL, self.path, file_size=len(CONTENT), segments=4)
+        self.assertEqual(self.read(), CONTENT)
+        self.assertFalse(os.path.exists(self.path + download.SEGMENTS_SUFFIX))
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class AsyncDownloadTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "meeting.mp4")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_resumes_partial_file(self):
+        ranges = []
+
+        def handler(request):
+            if request.url.host == "zoom.us":
+                return httpx.Response(200, json={"access_token": "token"})
+            ranges.append(request.headers.get("Range"))
+            status, _, body = ranged(request)
+            return httpx.Response(status, content=body)
+
+        async def run():
+            client = aio.AsyncZoomClient(
+                "KEY",
+                "SECRET",
+                "ACCOUNT",
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            )
+            return await client.recording.download_file(
+                download_url=URL, path=self.path, file_size=len(CONTENT)
+            )
+
+        with open(download.partial_path(self.path), "wb") as fh:
+            fh.write(CONTENT[:500])
+        self.assertEqual(asyncio.run(run()), self.path)
+        with open(self.path, "rb") as fh:
+            self.assertEqual(fh.read(), CONTENT)
+        self.assertEqual(ranges, ["bytes=500-"])
+
+    def test_segments(self):
+        def handler(request):
+            status, _, body = ranged(request)
+            return httpx.Response(status, content=body)
+
+        async def run():
+            async with httpx.AsyncClient(
+                transport=httpx.MockTransport(handler)
+            ) as http_client:
+                return await aio.download_segments(
+                    URL, self.path, http_client, len(CONTENT), 3, min_segment_size=1
+                )
+
+        asyncio.run(run())
+        with open(self.path, "rb") as fh:
+            self.assertEqual(fh.read(), CONTENT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+from tests.zoomus import make_response
+from zoomus import export
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock  # type: ignore
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(CheckpointStoreTestCase))
+    suite.addTest(unittest.makeSuite(BulkExportTestCase))
+    return suite
+
+
+class CheckpointStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def check_store(self, make_store):
+        store = make_store()
+        self.assertIsNone(store.get("users"))
+        self.assertEqual(store.get("users", "default"), "default")
+        store.set("users", "abc")
+        store.set("window", {"next_page_token": "def"})
+        store.delete("users")
+        store.delete("missing")
+        store = make_store()
+        self.assertIsNone(store.get("users"))
+        self.assertEqual(store.get("window"), {"next_page_token": "def"})
+
+    def test_file_store(self):
+        path = os.path.join(self.directory, "export.json")
+        self.check_store(lambda: export.FileCheckpointStore(path))
+
+    def test_sqlite_store(self):
+        path = os.path.join(self.directory, "export.db")
+        self.check_store(lambda: export.SQLiteCheckpointStore(path))
+
+    def test_sqlite_store_separates_jobs(self):
+        path = os.path.join(self.directory, "export.db")
+        export.SQLiteCheckpointStore(path, job="a").set("users", "abc")
+        self.assertIsNone(export.SQLiteCheckpointStore(path, job="b").get("users"))
+
+
+class BulkExportTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "export.json")
+        self.client = mock.Mock()
+        self.client.user.list.side_effect = self.list_users
+        self.client.recording.list.side_effect = self.list_recordings
+        self.client.report.get_user_report.side_effect = self.list_meetings
+        self.handled = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def list_users(self, next_page_token=None, **kwargs):
+        if next_page_token is None:
+            return make_response({"users": [{"id": "u1"}], "next_page_token": "u"})
+        return make_response({"users": [{"id": "u2"}]})
+
+    def list_recordings(self, user_id, start, end, next_page_token=None, **kwargs):
+        if next_page_token == "expired":
+            return make_response({"code": 300}, status_code=400)
+        if next_page_token is None:
+            return make_response(
+                {"meetings": [{"uuid": user_id + "-1"}], "next_page_token": "r"}
+            )
+        return make_response({"meetings": [{"uuid": user_id + "-2"}]})
+
+    def list_meetings(self, **kwargs):
+        return make_response({"meetings": []})
+
+    def make_export(self, **kwargs):
+        return export.BulkExport(
+            self.client,
+            export.FileCheckpointStore(self.path),
+            datetime.date(2020, 1, 1),
+            datetime.date(2020, 1, 31),
+            **kwargs,
+        )
+
+    def handler(self, kind, user_id, records):
+        self.handled.append((kind, user_id, [record["uuid"] for record in records]))
+
+    def test_exports_every_window_of_every_user(self):
+        count = self.make_export(kinds=[export.RECORDINGS]).run(self.handler)
+        self.assertEqual(count, 8)
+        self.assertEqual(self.client.recording.list.call_count, 8)
+        self.assertEqual(
+            self.handled[:2],
+            [
+                (export.RECORDINGS, "u1", ["u1-1"]),
+                (export.RECORDINGS, "u1", ["u1-2"]),
+            ],
+        )
+        first_window = self.client.recording.list.call_args_list[0][1]
+        self.assertEqual(first_window["start"], datetime.date(2020, 1, 1))
+        self.assertEqual(first_window["end"], datetime.date(2020, 1, 30))
+
+    def test_resumes_without_fetching_completed_pages(self):
+        def failing_handler(kind, user_id, records):
+            if user_id == "u2":
+                raise RuntimeError("crashed")
+            self.handler(kind, user_id, records)
+
+        with self.assertRaises(RuntimeError):
+            self.make_export().run(failing_handler)
+        self.client.reset_mock()
+
+        self.make_export().run(self.handler)
+        # The first page of users was finished, the second one is resumed
+        self.client.user.list.assert_called_once_with(
+            page_size=300, next_page_token="u"
+        )
+        self.assertEqual(
+            [entry for entry in self.handled if entry[1] == "u1"],
+            [
+                (export.RECORDINGS, "u1", ["u1-1"]),
+                (export.RECORDINGS, "u1", ["u1-2"]),
+                (export.RECORDINGS, "u1", ["u1-1"]),
+                (export.RECORDINGS, "u1", ["u1-2"]),
+                (export.MEETING_REPORTS, "u1", []),
+                (export.MEETING_REPORTS, "u1", []),
+            ],
+        )
+
+    def test_resumes_from_next_page_token_of_window(self):
+        store = export.FileCheckpointStore(self.path)
+        window = (datetime.date(2020, 1, 1), datetime.date(2020, 1, 30))
+        store.set(
+            export.BulkExport.window_key(export.RECORDINGS, "u1", window),
+            {"next_page_token": "r"},
+        )
+        self.make_export(kinds=[export.RECORDINGS]).run(self.handler)
+        self.assertEqual(self.handled[0], (export.RECORDINGS, "u1", ["u1-2"]))
+
+    def test_finished_users_are_skipped(self):
+        self.make_export().run(self.handler)
+        self.client.reset_mock()
+        self.assertEqual(self.make_export().run(self.handler), 0)
+        self.client.recording.list.assert_not_called()
+
+    def test_users_checkpoint_is_scoped_to_the_range(self):
+        def failing_handler(kind, user_id, records):
+            if user_id == "u2":
+                raise RuntimeError("crashed")
+
+        with self.assertRaises(RuntimeError):
+            self.make_export().run(failing_handler)
+        other = export.BulkExport(
+            self.client,
+            export.FileCheckpointStore(self.path),
+            datetime.date(2021, 1, 1),
+            datetime.date(2021, 1, 1),
+            kinds=[export.RECORDINGS],
+        )
+        other.run(self.handler)
+        self.assertEqual(
+            sorted(set(user_id for _, user_id, _ in self.handled)), ["u1", "u2"]
+        )
+
+    def test_expired_token_restarts_from_first_page(self):
+        store = export.FileCheckpointStore(self.path)
+        window = (datetime.date(2020, 1, 1), datetime.date(2020, 1, 30))
+        store.set(
+            export.BulkExport.window_key(export.RECORDINGS, "u1", window),
+            {"next_page_token": "expired"},
+        )
+        self.make_export(kinds=[export.RECORDINGS]).run(self.handler)
+        self.assertEqual(
+            self.handled[:2],
+            [
+                (export.RECORDINGS, "u1", ["u1-1"]),
+                (export.RECORDINGS, "u1", ["u1-2"]),
+            ],
+        )
+
+    def test_other_range_is_exported_again(self):
+        def make_export(day):
+            return export.BulkExport(
+                self.client,
+                export.FileCheckpointStore(self.path),
+                day,
+                day,
+                kinds=[export.RECORDINGS],
+            )
+
+        self.assertEqual(make_export(datetime.date(2020, 1, 1)).run(self.handler), 4)
+        self.assertEqual(make_export(datetime.date(2020, 1, 2)).run(self.handler), 4)
+        self.assertEqual(make_export(datetime.date(2020, 1, 2)).run(self.handler), 0)
+
+    def test_unknown_kind_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Unknown kinds: chats"):
+            self.make_export(kinds=["chats"])
+
+
+if __name__ == "__main__":
+    unittest.main()
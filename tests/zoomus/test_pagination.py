@@ -0,0 +1,384 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+from tests.zoomus import make_response
+from zoomus import components, pagination, util
+import requests
+import responses
+
+try:
+    import httpx
+    from zoomus import aio
+except ImportError:
+    httpx = None
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(IterPagesTestCase))
+    suite.addTest(unittest.makeSuite(PrefetchPagesTestCase))
+    suite.addTest(unittest.makeSuite(IterNumberedPagesTestCase))
+    suite.addTest(unittest.makeSuite(ComponentPaginationTestCase))
+    return suite
+
+
+def add_page(records, next_page_token="", status=200):
+    responses.add(
+        responses.GET,
+        "http://foo.com/users",
+        body=json.dumps({"users": records, "next_page_token": next_page_token}),
+        status=status,
+        content_type="application/json",
+    )
+
+
+class IterPagesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.component = components.user.UserComponentV2(
+            base_uri="http://foo.com",
+            config={"version": util.API_VERSION_2, "token": "token"},
+        )
+
+    def request_params(self, index):
+        return responses.calls[index].request.params
+
+    @responses.activate
+    def test_follows_next_page_token(self):
+        add_page([{"id": 1}, {"id": 2}], "abc")
+        add_page([{"id": 3}])
+        pages = list(pagination.iter_pages(self.component.list, "users"))
+        self.assertEqual(
+            [page.records for page in pages], [[{"id": 1}, {"id": 2}], [{"id": 3}]]
+        )
+        self.assertEqual(pages[0].next_page_token, "abc")
+        self.assertIsNone(pages[1].next_page_token)
+        self.assertNotIn("next_page_token", self.request_params(0))
+        self.assertEqual(self.request_params(1)["next_page_token"], "abc")
+
+    @responses.activate
+    def test_fetches_pages_lazily(self):
+        add_page([{"id": 1}], "abc")
+        records = pagination.iter_records(self.component.list, "users")
+        self.assertEqual(len(responses.calls), 0)
+        self.assertEqual(next(records), {"id": 1})
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_passes_page_size_and_arguments(self):
+        add_page([])
+        list(
+            pagination.iter_records(
+                self.component.list, "users", page_size=300, status="active"
+            )
+        )
+        self.assertEqual(
+            self.request_params(0), {"page_size": "300", "status": "active"}
+        )
+
+    def test_rejects_page_size_above_maximum(self):
+        records = pagination.iter_records(self.component.list, "users", page_size=301)
+        with self.assertRaisesRegex(ValueError, "at most 300"):
+            next(records)
+
+    @responses.activate
+    def test_resumes_from_token(self):
+        add_page([{"id": 3}])
+        records = list(
+            pagination.iter_records(self.component.list, "users", next_page_token="abc")
+        )
+        self.assertEqual(records, [{"id": 3}])
+        self.assertEqual(self.request_params(0)["next_page_token"], "abc")
+
+    @responses.activate
+    def test_raises_failed_request(self):
+        add_page([{"id": 1}], "abc")
+        add_page([], status=500)
+        records = pagination.iter_records(self.component.list, "users")
+        self.assertEqual(next(records), {"id": 1})
+        with self.assertRaises(requests.HTTPError):
+            next(records)
+
+
+class PrefetchPagesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tokens = []
+        self.second_requested = threading.Event()
+
+    def fetch(self, **kwargs):
+        token = kwargs.get("next_page_token")
+        self.tokens.append(token)
+        if token is None:
+            return make_response({"users": [1, 2], "next_page_token": "abc"})
+        self.second_requested.set()
+        return make_response({"users": [3], "next_page_token": ""})
+
+    def test_yields_pages_in_order(self):
+        records = list(pagination.prefetch_records(self.fetch, "users"))
+        self.assertEqual(records, [1, 2, 3])
+        self.assertEqual(self.tokens, [None, "abc"])
+
+    def test_fetches_next_page_before_current_is_consumed(self):
+        pages = pagination.prefetch_pages(self.fetch, "users")
+        self.assertEqual(next(pages).records, [1, 2])
+        self.assertTrue(self.second_requested.wait(5))
+        pages.close()
+
+    def test_async_prefetch(self):
+        async def fetch(**kwargs):
+            return self.fetch(**kwargs)
+
+        async def collect():
+            pages = pagination.aiter_pages(fetch, "users", prefetch=True)
+            first = await pages.__anext__()
+            await asyncio.sleep(0)
+            prefetched = self.second_requested.is_set()
+            return first.records, prefetched, [page async for page in pages]
+
+        first, prefetched, rest = asyncio.run(collect())
+        self.assertEqual(first, [1, 2])
+        self.assertTrue(prefetched)
+        self.assertEqual([page.records for page in rest], [[3]])
+
+
+class IterNumberedPagesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def fetch(self, page_number, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        # Later pages finish first, to check that the order is kept
+        time.sleep(0.01 * (6 - page_number))
+        with self.lock:
+            self.active -= 1
+        return make_response(
+            {"dates": [page_number], "page_count": 5, "page_number": page_number}
+        )
+
+    def test_yields_pages_in_order(self):
+        records = list(pagination.iter_numbered_records(self.fetch, "dates", workers=3))
+        self.assertEqual(records, [1, 2, 3, 4, 5])
+        self.assertGreater(self.max_active, 1)
+        self.assertLessEqual(self.max_active, 3)
+
+    def test_starts_from_page_number(self):
+        records = list(
+            pagination.iter_numbered_records(self.fetch, "dates", page_number=4)
+        )
+        self.assertEqual(records, [4, 5])
+
+    def test_page_count_from_total_records(self):
+        page = pagination.Page([1, 2], None, {"total_records": 5, "page_size": 2})
+        self.assertEqual(pagination.page_count(page), 3)
+        page = pagination.Page([1, 2], None, {})
+        self.assertEqual(pagination.page_count(page), 1)
+
+    def test_async_yields_pages_in_order(self):
+        async def fetch(page_number, **kwargs):
+            await asyncio.sleep(0.01 * (6 - page_number))
+            return make_response({"dates": [page_number], "page_count": 5})
+
+        async def collect():
+            records = pagination.aiter_numbered_records(fetch, "dates", workers=3)
+            return [record async for record in records]
+
+        self.assertEqual(asyncio.run(collect()), [1, 2, 3, 4, 5])
+
+
+class ComponentPaginationTestCase(unittest.TestCase):
+    @responses.activate
+    def test_iter_list(self):
+        responses.add(
+            responses.GET,
+            "http://foo.com/users/ID/meetings",
+            json={"meetings": [{"id": 1}], "next_page_token": "abc"},
+        )
+        responses.add(
+            responses.GET,
+            "http://foo.com/users/ID/meetings",
+            json={"meetings": [{"id": 2}], "next_page_token": ""},
+        )
+        component = components.meeting.MeetingComponentV2(
+            base_uri="http://foo.com",
+            config={"version": util.API_VERSION_2, "token": "token"},
+        )
+        self.assertEqual(
+            list(component.iter_list(user_id="ID", page_size=2)),
+            [{"id": 1}, {"id": 2}],
+        )
+
+    @responses.activate
+    def test_iter_list_with_prefetch(self):
+        responses.add(
+            responses.GET,
+            "http://foo.com/users",
+            json={"users": [{"id": 1}], "next_page_token": "abc"},
+        )
+        responses.add(
+            responses.GET, "http://foo.com/users", json={"users": [{"id": 2}]}
+        )
+        component = components.user.UserComponentV2(
+            base_uri="http://foo.com",
+            config={"version": util.API_VERSION_2, "token": "token"},
+        )
+        self.assertEqual(
+            list(component.iter_list(prefetch=True)), [{"id": 1}, {"id": 2}]
+        )
+
+    def check_wrapper(self, component_class, method, url, key, **kwargs):
+        responses.add(responses.GET, url, json={key: [{"id": 1}]})
+        component = component_class(
+            base_uri="http://foo.com",
+            config={"version": util.API_VERSION_2, "token": "token"},
+        )
+        records = list(getattr(component, method)(**kwargs))
+        self.assertEqual(records, [{"id": 1}])
+        return component
+
+    @responses.activate
+    def test_users_iter_list_accepts_large_pages(self):
+        self.check_wrapper(
+            components.user.UserComponentV2,
+            "iter_list",
+            "http://foo.com/users",
+            "users",
+            page_size=2000,
+        )
+        self.assertEqual(responses.calls[0].request.params["page_size"], "2000")
+
+    @responses.activate
+    def test_iter_list_events(self):
+        self.check_wrapper(
+            components.events.EventsComponentV2,
+            "iter_list_events",
+            "http://foo.com/zoom_events/events",
+            "events",
+        )
+
+    @responses.activate
+    def test_iter_list_session_attendees(self):
+        self.check_wrapper(
+            components.events.EventsComponentV2,
+            "iter_list_session_attendees",
+            "http://foo.com/zoom_events/events/E/sessions/S/attendees",
+            "attendees",
+            event_id="E",
+            session_id="S",
+        )
+
+    @responses.activate
+    def test_iter_list_event_registrants(self):
+        self.check_wrapper(
+            components.events.EventsComponentV2,
+            "iter_list_registrants",
+            "http://foo.com/zoom_events/events/E/registrants",
+            "registrants",
+            event_id="E",
+        )
+
+    @responses.activate
+    def test_iter_event_attendance(self):
+        self.check_wrapper(
+            components.events.EventsComponentV2,
+            "iter_event_attendance",
+            "http://foo.com/zoom_events/events/E/reports/event_attendance",
+            "attendees",
+            event_id="E",
+        )
+
+    @responses.activate
+    def test_iter_event_registrations(self):
+        self.check_wrapper(
+            components.events.EventsComponentV2,
+            "iter_event_registrations",
+            "http://foo.com/zoom_events/events/E/reports/ticket_registration",
+            "registrants",
+            event_id="E",
+        )
+
+    @responses.activate
+    def test_iter_call_logs(self):
+        self.check_wrapper(
+            components.phone.PhoneComponentV2,
+            "iter_call_logs",
+            "http://foo.com/phone/call_logs",
+            "call_logs",
+        )
+
+    @responses.activate
+    def test_iter_list_metric_meetings(self):
+        self.check_wrapper(
+            components.metric.MetricComponentV2,
+            "iter_list_meetings",
+            "http://foo.com/metrics/meetings",
+            "meetings",
+        )
+
+    @responses.activate
+    def test_iter_get_daily_report(self):
+        def callback(request):
+            number = int(request.params["page_number"])
+            body = {"dates": [{"page": number}], "page_count": 3}
+            return 200, {}, json.dumps(body)
+
+        responses.add_callback(
+            responses.GET, "http://foo.com/report/daily", callback=callback
+        )
+        component = components.report.ReportComponentV2(
+            base_uri="http://foo.com",
+            config={"version": util.API_VERSION_2, "token": "token"},
+        )
+        self.assertEqual(
+            list(component.iter_get_daily_report(month=1, year=2020)),
+            [{"page": 1}, {"page": 2}, {"page": 3}],
+        )
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_iter_list_by_page_number(self):
+        def callback(request):
+            number = int(request.params["page_number"])
+            body = {"users": [{"id": number}], "total_records": 2, "page_size": 1}
+            return 200, {}, json.dumps(body)
+
+        responses.add_callback(
+            responses.POST, "http://foo.com/user/list", callback=callback
+        )
+        component = components.user.UserComponent(
+            base_uri="http://foo.com",
+            config={"version": util.API_VERSION_1, "api_key": "KEY"},
+        )
+        self.assertEqual(list(component.iter_list(page_size=1)), [{"id": 1}, {"id": 2}])
+
+    @unittest.skipIf(httpx is None, "httpx is not installed")
+    def test_async_iter_list(self):
+        def handler(request):
+            if request.url.host == "zoom.us":
+                return httpx.Response(200, json={"access_token": "token"})
+            if request.url.params.get("next_page_token"):
+                return httpx.Response(200, json={"users": [{"id": 2}]})
+            return httpx.Response(
+                200, json={"users": [{"id": 1}], "next_page_token": "abc"}
+            )
+
+        async def collect():
+            client = aio.AsyncZoomClient(
+                "KEY",
+                "SECRET",
+                "ACCOUNT",
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            )
+            return [record async for record in client.user.iter_list()]
+
+        self.assertEqual(asyncio.run(collect()), [{"id": 1}, {"id": 2}])
+
+
+if __name__ == "__main__":
+    unittest.main()
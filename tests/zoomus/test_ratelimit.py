@@ -0,0 +1,227 @@
+import unittest
+
+from tests.zoomus import make_response
+from zoomus import components, ratelimit, util
+import responses
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock  # type: ignore
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(RouteTableTestCase))
+    suite.addTest(unittest.makeSuite(TokenBucketTestCase))
+    suite.addTest(unittest.makeSuite(RateLimiterTestCase))
+    suite.addTest(unittest.makeSuite(RateLimitTrackerTestCase))
+    return suite
+
+
+class RouteTableTestCase(unittest.TestCase):
+    def setUp(self):
+        self.routes = ratelimit.RouteTable()
+
+    def test_matches_literal_route(self):
+        self.assertEqual(
+            self.routes.match("GET", "/report/daily"),
+            ("/report/daily", ratelimit.HEAVY),
+        )
+
+    def test_matches_templated_route(self):
+        self.assertEqual(
+            self.routes.match("GET", "/users/abc"), ("/users/{}", ratelimit.LIGHT)
+        )
+        self.assertEqual(
+            self.routes.match("GET", "/users/abc/recordings"),
+            ("/users/{}/recordings", ratelimit.MEDIUM),
+        )
+
+    def test_prefers_literal_route_listed_first(self):
+        self.assertEqual(
+            self.routes.match("GET", "/users/email"),
+            ("/users/email", ratelimit.LIGHT),
+        )
+
+    def test_method_is_part_of_the_route(self):
+        self.assertEqual(
+            self.routes.match("GET", "/users"), ("/users", ratelimit.MEDIUM)
+        )
+        self.assertEqual(
+            self.routes.match("post", "/users"), ("/users", ratelimit.LIGHT)
+        )
+
+    def test_ignores_surrounding_slashes(self):
+        self.assertEqual(
+            self.routes.match("GET", "rooms/"), ("/rooms", ratelimit.MEDIUM)
+        )
+
+    def test_unknown_route_gets_default_category(self):
+        self.assertEqual(
+            self.routes.match("GET", "/unknown/abc"),
+            (None, ratelimit.DEFAULT_CATEGORY),
+        )
+
+
+class TokenBucketTestCase(unittest.TestCase):
+    def setUp(self):
+        self.now = 0
+        self.sleep = mock.Mock()
+        self.bucket = ratelimit.TokenBucket(
+            2, capacity=2, clock=lambda: self.now, sleep=self.sleep
+        )
+
+    def test_allows_burst_up_to_capacity(self):
+        self.assertEqual(self.bucket.acquire(), 0)
+        self.assertEqual(self.bucket.acquire(), 0)
+        self.sleep.assert_not_called()
+
+    def test_waits_when_empty(self):
+        self.bucket.acquire()
+        self.bucket.acquire()
+        self.assertEqual(self.bucket.acquire(), 0.5)
+        self.assertEqual(self.bucket.acquire(), 1.0)
+        self.assertEqual(self.sleep.call_args_list, [mock.call(0.5), mock.call(1.0)])
+
+    def test_refills_over_time(self):
+        self.bucket.acquire()
+        self.bucket.acquire()
+        self.now = 0.5
+        self.assertEqual(self.bucket.acquire(), 0)
+
+
+class RateLimiterTestCase(unittest.TestCase):
+    def test_paces_at_headroom_of_plan_limit(self):
+        limiter = ratelimit.RateLimiter(plan=ratelimit.PLAN_BUSINESS, headroom=0.5)
+        self.assertEqual(limiter.buckets[ratelimit.HEAVY].rate, 20)
+        self.assertEqual(limiter.buckets[ratelimit.LIGHT].rate, 40)
+
+    def test_can_override_limits(self):
+        limiter = ratelimit.RateLimiter(headroom=1, limits={ratelimit.MEDIUM: 5})
+        self.assertEqual(limiter.buckets[ratelimit.MEDIUM].rate, 5)
+
+    def test_unknown_plan_raises_error(self):
+        with self.assertRaisesRegex(ValueError, "Unknown plan: free"):
+            ratelimit.RateLimiter(plan="free")
+
+    def test_acquires_from_bucket_of_endpoint_category(self):
+        limiter = ratelimit.RateLimiter()
+        for category in limiter.buckets:
+            limiter.buckets[category] = mock.Mock()
+        limiter.acquire("GET", "/report/users")
+        limiter.buckets[ratelimit.HEAVY].acquire.assert_called_once_with()
+        limiter.buckets[ratelimit.LIGHT].acquire.assert_not_called()
+
+    @responses.activate
+    def test_component_requests_are_paced(self):
+        responses.add(responses.GET, "http://foo.com/report/daily")
+        limiter = mock.Mock()
+        component = components.report.ReportComponentV2(
+            base_uri="http://foo.com",
+            config={"version": util.API_VERSION_2, "token": "token"},
+            rate_limiter=limiter,
+        )
+        component.get_daily_report(month=1, year=2020)
+        limiter.acquire.assert_called_once_with("GET", "/report/daily")
+
+
+class RateLimitTrackerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tracker = ratelimit.RateLimitTracker(clock=lambda: 1000)
+
+    def test_records_headers_per_category_and_template(self):
+        status = self.tracker.record(
+            "GET",
+            "/users/abc",
+            make_response(
+                headers={
+                    "X-RateLimit-Category": "Light",
+                    "X-RateLimit-Type": "QPS",
+                    "X-RateLimit-Limit": "30",
+                    "X-RateLimit-Remaining": "29",
+                }
+            ),
+        )
+        self.assertEqual(
+            status, ratelimit.RateLimitStatus("Light", "QPS", 30, 29, 1000)
+        )
+        self.assertEqual(self.tracker.category(ratelimit.LIGHT), status)
+        self.assertEqual(self.tracker.endpoint("get", "/users/{}"), status)
+        self.assertEqual(self.tracker.remaining(ratelimit.LIGHT), 29)
+
+    def test_falls_back_to_route_category(self):
+        self.tracker.record(
+            "GET",
+            "/report/daily",
+            make_response(headers={"X-RateLimit-Remaining": "3"}),
+        )
+        self.assertEqual(self.tracker.remaining(ratelimit.HEAVY), 3)
+
+    def test_ignores_responses_without_headers(self):
+        self.assertIsNone(
+            self.tracker.record("GET", "/users", make_response(headers={}))
+        )
+        self.assertEqual(self.tracker.snapshot(), {"categories": {}, "endpoints": {}})
+
+    def test_unknown_quota_is_none(self):
+        self.assertIsNone(self.tracker.remaining(ratelimit.HEAVY))
+
+    def test_calls_listeners(self):
+        listener = mock.Mock()
+        self.tracker.add_listener(listener)
+        status = self.tracker.record(
+            "GET",
+            "/phone/call_logs",
+            make_response(headers={"X-RateLimit-Remaining": "0"}),
+        )
+        listener.assert_called_once_with("GET", "/phone/call_logs", status)
+        self.tracker.remove_listener(listener)
+        self.tracker.record(
+            "GET",
+            "/phone/call_logs",
+            make_response(headers={"X-RateLimit-Remaining": "0"}),
+        )
+        self.assertEqual(listener.call_count, 1)
+
+    def test_listener_errors_are_logged(self):
+        listener = mock.Mock(side_effect=RuntimeError("boom"))
+        self.tracker.add_listener(listener)
+        with self.assertLogs("zoomus.ratelimit", level="ERROR"):
+            status = self.tracker.record(
+                "GET",
+                "/users/abc",
+                make_response(headers={"X-RateLimit-Remaining": "1"}),
+            )
+        self.assertEqual(status.remaining, 1)
+
+    def test_unmatched_endpoints_only_update_the_category(self):
+        self.tracker.record(
+            "GET",
+            "/unknown/abc",
+            make_response(
+                headers={"X-RateLimit-Category": "Light", "X-RateLimit-Remaining": "5"}
+            ),
+        )
+        self.assertEqual(self.tracker.remaining(ratelimit.LIGHT), 5)
+        self.assertEqual(self.tracker.snapshot()["endpoints"], {})
+
+    @responses.activate
+    def test_component_responses_are_recorded(self):
+        responses.add(
+            responses.GET,
+            "http://foo.com/users/abc",
+            headers={"X-RateLimit-Limit": "30", "X-RateLimit-Remaining": "12"},
+        )
+        component = components.user.UserComponentV2(
+            base_uri="http://foo.com",
+            config={"version": util.API_VERSION_2, "token": "token"},
+            rate_limit_tracker=self.tracker,
+        )
+        component.get(id="abc")
+        self.assertEqual(self.tracker.endpoint("GET", "/users/{}").remaining, 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
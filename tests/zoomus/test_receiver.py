@@ -0,0 +1,234 @@
+import asyncio
+import io
+import json
+import queue
+import threading
+import time
+import unittest
+
+from zoomus import receiver, util, webhooks
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(WSGIReceiverTestCase))
+    suite.addTest(unittest.makeSuite(ASGIReceiverTestCase))
+    return suite
+
+
+BODY = b'{"event":"meeting.started","event_ts":1,"payload":{"object":{"id":1}}}'
+
+
+def signed_headers(body, secret="secret"):
+    timestamp = str(int(time.time() * 1000))
+    return {
+        "x-zm-signature": webhooks.WebhookVerifier(secret).signature(body, timestamp),
+        "x-zm-request-timestamp": timestamp,
+    }
+
+
+class WSGIReceiverTestCase(unittest.TestCase):
+    def call(self, app, body=BODY, headers=None, method="POST"):
+        headers = signed_headers(body) if headers is None else headers
+        environ = {
+            "REQUEST_METHOD": method,
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body),
+        }
+        for name, value in headers.items():
+            environ["HTTP_" + name.upper().replace("-", "_")] = value
+        started = {}
+
+        def start_response(status, response_headers):
+            started["status"] = status
+            started["headers"] = dict(response_headers)
+
+        content = b"".join(app(environ, start_response))
+        return int(started["status"].split()[0]), content
+
+    def test_queues_valid_events(self):
+        app = receiver.WSGIReceiver("secret")
+        self.assertEqual(self.call(app), (200, b""))
+        self.assertEqual(app.events.get_nowait(), json.loads(BODY))
+
+    def test_rejects_invalid_requests(self):
+        app = receiver.WSGIReceiver("secret")
+        headers = signed_headers(BODY, secret="other")
+        self.assertEqual(self.call(app, headers=headers)[0], 401)
+        self.assertEqual(self.call(app, method="GET")[0], 405)
+        app.max_body_size = 10
+        self.assertEqual(self.call(app)[0], 413)
+        self.assertTrue(app.events.empty())
+
+    def test_rejects_malformed_requests(self):
+        app = receiver.WSGIReceiver("secret")
+        for body in (
+            b'{"event":"endpoint.url_validation"',
+            b'{"event":"endpoint.url_validation"}',
+        ):
+            self.assertEqual(self.call(app, body=body, headers={}), (400, b""))
+        self.assertTrue(app.events.empty())
+
+    def test_answers_url_validation(self):
+        app = receiver.WSGIReceiver("secret")
+        body = json.dumps(
+            {"event": "endpoint.url_validation", "payload": {"plainToken": "abc"}}
+        ).encode("utf-8")
+        status, content = self.call(app, body=body, headers={})
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            json.loads(content),
+            {
+                "plainToken": "abc",
+                "encryptedToken": util.webhook_validation("abc", "secret"),
+            },
+        )
+        self.assertTrue(app.events.empty())
+
+    def test_full_queue_is_retried(self):
+        app = receiver.WSGIReceiver("secret", events=queue.Queue(1))
+        self.assertEqual(self.call(app)[0], 200)
+        self.assertEqual(self.call(app)[0], 503)
+
+    def test_full_queue_is_not_taken_for_a_replay(self):
+        verifier = webhooks.WebhookVerifier(
+            "secret", replays=webhooks.MemoryReplayIndex()
+        )
+        app = receiver.WSGIReceiver(verifier, max_pending=1)
+        other = BODY.replace(b'"id":1', b'"id":2')
+        self.assertEqual(self.call(app, body=other)[0], 200)
+        self.assertEqual(self.call(app)[0], 503)
+        app.events.get_nowait()
+        # Delivered again by Zoom, once there is room in the queue
+        self.assertEqual(self.call(app)[0], 200)
+        self.assertEqual(app.events.get_nowait(), json.loads(BODY))
+        self.assertEqual(self.call(app)[0], 200)
+        self.assertTrue(app.events.empty())
+
+    def test_handler_does_not_block_the_request(self):
+        release = threading.Event()
+        handled = []
+
+        def handler(event):
+            release.wait(5)
+            handled.append(event)
+
+        app = receiver.WSGIReceiver("secret", handler=handler, workers=2)
+        self.assertEqual(self.call(app)[0], 200)
+        self.assertEqual(handled, [])
+        release.set()
+        app.close()
+        self.assertEqual(handled, [json.loads(BODY)])
+
+    def test_handler_errors(self):
+        errors = []
+
+        def handler(event):
+            raise ValueError("boom")
+
+        app = receiver.WSGIReceiver(
+            "secret", handler=handler, on_error=lambda *args: errors.append(args)
+        )
+        self.call(app)
+        app.close()
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0][1], ValueError)
+
+
+class ASGIReceiverTestCase(unittest.TestCase):
+    async def call(self, app, body=BODY, headers=None, method="POST"):
+        headers = signed_headers(body) if headers is None else headers
+        scope = {
+            "type": "http",
+            "method": method,
+            "headers": [
+                (name.encode("latin-1"), value.encode("latin-1"))
+                for name, value in headers.items()
+            ],
+        }
+        # The body arrives in two messages
+        messages = [
+            {"type": "http.request", "body": body[:10], "more_body": True},
+            {"type": "http.request", "body": body[10:]},
+        ]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        await app(scope, receive, send)
+        return sent[0]["status"], sent[1]["body"]
+
+    def test_handles_events_in_the_background(self):
+        handled = []
+
+        async def handler(event):
+            await asyncio.sleep(0.01)
+            handled.append(event)
+
+        async def run():
+            app = receiver.ASGIReceiver("secret", handler=handler)
+            self.assertEqual(await self.call(app), (200, b""))
+            self.assertEqual(handled, [])
+            self.assertEqual(
+                (await self.call(app, headers={"x-zm-signature": "v0=bad"}))[0], 401
+            )
+            await app.close()
+
+        asyncio.run(run())
+        self.assertEqual(handled, [json.loads(BODY)])
+
+    def test_sync_handler_and_full_queue(self):
+        handled = []
+
+        async def run():
+            app = receiver.ASGIReceiver("secret", handler=handled.append, max_pending=1)
+            self.assertEqual((await self.call(app))[0], 200)
+            self.assertEqual((await self.call(app))[0], 503)
+            await app.close()
+
+        asyncio.run(run())
+        self.assertEqual(handled, [json.loads(BODY)])
+
+    def test_full_queue_is_not_taken_for_a_replay(self):
+        async def run():
+            verifier = webhooks.WebhookVerifier(
+                "secret", replays=webhooks.MemoryReplayIndex()
+            )
+            app = receiver.ASGIReceiver(verifier, max_pending=1)
+            other = BODY.replace(b'"id":1', b'"id":2')
+            self.assertEqual((await self.call(app, body=other))[0], 200)
+            self.assertEqual((await self.call(app))[0], 503)
+            app.events.get_nowait()
+            self.assertEqual((await self.call(app))[0], 200)
+            return app.events.qsize()
+
+        self.assertEqual(asyncio.run(run()), 1)
+
+    def test_lifespan(self):
+        async def run():
+            app = receiver.ASGIReceiver("secret")
+            messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+            sent = []
+
+            async def receive():
+                return messages.pop(0)
+
+            async def send(message):
+                sent.append(message["type"])
+
+            await app({"type": "lifespan"}, receive, send)
+            return sent
+
+        self.assertEqual(
+            asyncio.run(run()),
+            ["lifespan.startup.complete", "lifespan.shutdown.complete"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+
+from tests.zoomus import make_response
+from zoomus import retry, util
+import requests
+import responses
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock  # type: ignore
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(RetryPolicyTestCase))
+    suite.addTest(unittest.makeSuite(ParseRetryAfterTestCase))
+    suite.addTest(unittest.makeSuite(ApiClientRetryTestCase))
+    return suite
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.now = 0
+        self.sleep = mock.Mock(side_effect=self.advance)
+        self.policy = retry.RetryPolicy(
+            retries=3, clock=lambda: self.now, sleep=self.sleep
+        )
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def test_returns_successful_response(self):
+        send = mock.Mock(return_value=make_response(status_code=200))
+        self.assertEqual(self.policy.call("GET", send).status_code, 200)
+        self.assertEqual(send.call_count, 1)
+
+    @mock.patch("zoomus.retry.random.uniform", side_effect=lambda low, high: high)
+    def test_retries_with_exponential_backoff(self, mock_uniform):
+        send = mock.Mock(
+            side_effect=[
+                make_response(status_code=502),
+                make_response(status_code=503),
+                make_response(status_code=200),
+            ]
+        )
+        self.assertEqual(self.policy.call("GET", send).status_code, 200)
+        self.assertEqual(self.sleep.call_args_list, [mock.call(0.5), mock.call(1.0)])
+
+    def test_gives_up_after_retries(self):
+        send = mock.Mock(return_value=make_response(status_code=500))
+        self.assertEqual(self.policy.call("GET", send).status_code, 500)
+        self.assertEqual(send.call_count, 4)
+
+    def test_honors_retry_after(self):
+        send = mock.Mock(
+            side_effect=[
+                make_response(status_code=429, headers={"Retry-After": "7"}),
+                make_response(status_code=200),
+            ]
+        )
+        self.policy.call("GET", send)
+        self.sleep.assert_called_once_with(7.0)
+
+    def test_does_not_retry_exhausted_daily_limit(self):
+        response = make_response(
+            status_code=429,
+            headers={"X-RateLimit-Type": "Daily-limit", "X-RateLimit-Remaining": "0"},
+        )
+        send = mock.Mock(return_value=response)
+        self.assertIs(self.policy.call("GET", send), response)
+        self.assertEqual(send.call_count, 1)
+
+    def test_does_not_wait_past_total_timeout(self):
+        self.policy.total_timeout = 10
+        send = mock.Mock(
+            side_effect=[
+                make_response(status_code=429, headers={"Retry-After": "11"}),
+                make_response(status_code=200),
+            ]
+        )
+        self.assertEqual(self.policy.call("GET", send).status_code, 429)
+        self.sleep.assert_not_called()
+
+    def test_does_not_retry_writes_by_default(self):
+        send = mock.Mock(return_value=make_response(status_code=503))
+        self.assertEqual(self.policy.call("POST", send).status_code, 503)
+        self.assertEqual(send.call_count, 1)
+
+    def test_can_retry_writes(self):
+        policy = retry.RetryPolicy(retry_writes=True, sleep=mock.Mock())
+        send = mock.Mock(
+            side_effect=[make_response(status_code=503), make_response(status_code=201)]
+        )
+        self.assertEqual(policy.call("POST", send).status_code, 201)
+
+    def test_does_not_retry_client_errors(self):
+        send = mock.Mock(return_value=make_response(status_code=404))
+        self.policy.call("GET", send)
+        self.assertEqual(send.call_count, 1)
+
+    def test_retries_connection_errors(self):
+        send = mock.Mock(
+            side_effect=[requests.ConnectionError(), make_response(status_code=200)]
+        )
+        self.assertEqual(self.policy.call("GET", send).status_code, 200)
+
+    def test_raises_last_connection_error(self):
+        send = mock.Mock(side_effect=requests.ConnectionError())
+        with self.assertRaises(requests.ConnectionError):
+            self.policy.call("GET", send)
+        self.assertEqual(send.call_count, 4)
+
+
+class ParseRetryAfterTestCase(unittest.TestCase):
+    def test_parses_seconds(self):
+        self.assertEqual(retry.parse_retry_after("12"), 12.0)
+
+    @mock.patch("zoomus.retry.time.time", return_value=1445412480)
+    def test_parses_http_date(self, mock_time):
+        self.assertEqual(retry.parse_retry_after("Wed, 21 Oct 2015 07:28:30 GMT"), 30)
+
+    def test_invalid_value_returns_none(self):
+        self.assertIsNone(retry.parse_retry_after("soon"))
+        self.assertIsNone(retry.parse_retry_after(None))
+
+
+class ApiClientRetryTestCase(unittest.TestCase):
+    @responses.activate
+    def test_client_retries_requests(self):
+        responses.add(responses.GET, "http://www.foo.com/endpoint", status=502)
+        responses.add(responses.GET, "http://www.foo.com/endpoint", status=200)
+        client = util.ApiClient(
+            base_uri="http://www.foo.com",
+            config={"version": util.API_VERSION_2, "token": "token"},
+            retry_policy=retry.RetryPolicy(sleep=mock.Mock()),
+        )
+        self.assertEqual(client.get_request("endpoint").status_code, 200)
+        self.assertEqual(len(responses.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
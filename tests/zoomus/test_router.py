@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from zoomus import router
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(EventRouterTestCase))
+    return suite
+
+
+def event(name, **payload):
+    return {"event": name, "payload": payload}
+
+
+class EventRouterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.router = router.EventRouter()
+        self.calls = []
+
+    def handler(self, label):
+        def handle(event):
+            self.calls.append((label, event["event"]))
+            return label
+
+        return handle
+
+    def test_routes_names_and_patterns_in_order(self):
+        self.router.add_route("recording.*", self.handler("recordings"))
+        self.router.add_route("recording.completed", self.handler("completed"))
+        self.router.add_route("meeting.started", self.handler("started"))
+        self.router.compile()
+        self.assertEqual(
+            self.router.dispatch(event("recording.completed")),
+            ["recordings", "completed"],
+        )
+        self.assertEqual(
+            self.router.dispatch(event("recording.trashed")), ["recordings"]
+        )
+        self.assertEqual(self.router.dispatch(event("meeting.started")), ["started"])
+        self.assertEqual(self.router.dispatch(event("webinar.started")), [])
+        self.assertEqual(self.router.unhandled, 1)
+
+    def test_dispatch_table(self):
+        self.router.add_route("meeting.*", self.handler("meetings"))
+        self.router.compile(["meeting.ended"])
+        self.assertIn("meeting.ended", self.router._table)
+        routes = self.router.handlers("meeting.started")
+        self.assertIs(self.router._table["meeting.started"], routes)
+        self.router.add_route("meeting.started", self.handler("started"))
+        self.assertEqual(len(self.router.handlers("meeting.started")), 2)
+
+    def test_decorator_and_default(self):
+        unhandled = []
+        app = router.EventRouter(default=unhandled.append)
+
+        @app.route("user.created")
+        def created(event):
+            return event["payload"]["id"]
+
+        self.assertEqual(app.dispatch(event("user.created", id=1)), [1])
+        app.dispatch(event("user.deleted"))
+        self.assertEqual(unhandled, [event("user.deleted")])
+
+    def test_errors_do_not_stop_other_handlers(self):
+        def fail(event):
+            raise ValueError("boom")
+
+        self.router.add_route("meeting.*", fail)
+        self.router.add_route("meeting.started", self.handler("started"))
+        with self.assertRaises(ValueError):
+            self.router.dispatch(event("meeting.started"))
+        self.assertEqual(self.calls, [("started", "meeting.started")])
+        metrics = self.router.metrics()
+        self.assertEqual(metrics["meeting.*"]["errors"], 1)
+        self.assertEqual(metrics["meeting.started"]["count"], 1)
+
+    def test_latency_metrics(self):
+        self.router.add_route("meeting.started", lambda event: time.sleep(0.01))
+        for _ in range(2):
+            self.router.dispatch(event("meeting.started"))
+        metrics = self.router.metrics()["meeting.started"]
+        self.assertEqual(metrics["count"], 2)
+        self.assertGreaterEqual(metrics["max_time"], 0.01)
+        self.assertAlmostEqual(metrics["mean_time"], metrics["total_time"] / 2)
+
+    def test_submit_respects_concurrency(self):
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def handle(event):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.01)
+            with lock:
+                state["running"] -= 1
+
+        app = router.EventRouter(workers=4)
+        app.add_route("recording.completed", handle, concurrency=1)
+        pending = []
+        for _ in range(4):
+            pending.extend(app.submit(event("recording.completed")))
+        app.close()
+        self.assertTrue(all(future.done() for future in pending))
+        self.assertEqual(state["peak"], 1)
+
+    def test_dispatch_async(self):
+        state = {"running": 0, "peak": 0}
+        synced = []
+
+        async def handle(event):
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(0.01)
+            state["running"] -= 1
+            return "async"
+
+        self.router.add_route("meeting.*", handle, concurrency=2)
+        self.router.add_route("meeting.started", synced.append)
+
+        async def run():
+            return await asyncio.gather(
+                *[
+                    self.router.dispatch_async(event("meeting.started"))
+                    for _ in range(5)
+                ]
+            )
+
+        results = asyncio.run(run())
+        self.assertEqual(results, [["async", None]] * 5)
+        self.assertEqual(state["peak"], 2)
+        self.assertEqual(len(synced), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
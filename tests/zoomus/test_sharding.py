@@ -0,0 +1,187 @@
+import asyncio
+import datetime
+import threading
+import time
+import unittest
+
+from tests.zoomus import make_response
+from zoomus import components, sharding, util
+import responses
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(SplitRangeTestCase))
+    suite.addTest(unittest.makeSuite(IterShardedTestCase))
+    suite.addTest(unittest.makeSuite(ComponentShardingTestCase))
+    return suite
+
+
+class SplitRangeTestCase(unittest.TestCase):
+    def test_splits_into_contiguous_windows(self):
+        self.assertEqual(
+            sharding.split_range(
+                datetime.date(2020, 1, 1), datetime.date(2020, 3, 5), days=30
+            ),
+            [
+                (datetime.date(2020, 1, 1), datetime.date(2020, 1, 30)),
+                (datetime.date(2020, 1, 31), datetime.date(2020, 2, 29)),
+                (datetime.date(2020, 3, 1), datetime.date(2020, 3, 5)),
+            ],
+        )
+
+    def test_accepts_datetimes(self):
+        self.assertEqual(
+            sharding.split_range(
+                datetime.datetime(2020, 1, 1, 12), datetime.datetime(2020, 1, 1, 13)
+            ),
+            [(datetime.date(2020, 1, 1), datetime.date(2020, 1, 1))],
+        )
+
+    def test_rejects_reversed_range(self):
+        with self.assertRaisesRegex(ValueError, "before its start"):
+            sharding.split_range(datetime.date(2020, 2, 1), datetime.date(2020, 1, 1))
+
+
+class IterShardedTestCase(unittest.TestCase):
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def fetch(self, start_time, end_time, **kwargs):
+        with self.lock:
+            self.calls.append((start_time, end_time, kwargs.get("next_page_token")))
+        if end_time.month == 1 and not kwargs.get("next_page_token"):
+            return make_response(
+                {"meetings": [{"uuid": "a"}, {"uuid": "b"}], "next_page_token": "x"}
+            )
+        if end_time.month == 1:
+            return make_response({"meetings": [{"uuid": "c"}]})
+        # A meeting spanning the boundary is reported for both windows
+        return make_response({"meetings": [{"uuid": "c"}, {"uuid": "d"}]})
+
+    def test_merges_windows_in_order_without_duplicates(self):
+        records = sharding.iter_sharded(
+            self.fetch,
+            "meetings",
+            datetime.date(2020, 1, 1),
+            datetime.date(2020, 2, 15),
+            user_id="me",
+        )
+        self.assertEqual([record["uuid"] for record in records], ["a", "b", "c", "d"])
+        self.assertEqual(len(self.calls), 3)
+        self.assertIn(
+            (datetime.date(2020, 1, 31), datetime.date(2020, 2, 15), None), self.calls
+        )
+
+    def test_can_keep_duplicates(self):
+        records = sharding.iter_sharded(
+            self.fetch,
+            "meetings",
+            datetime.date(2020, 1, 1),
+            datetime.date(2020, 2, 15),
+            record_key=None,
+        )
+        self.assertEqual(len(list(records)), 5)
+
+    def test_holds_a_bounded_number_of_pages(self):
+        def fetch(start_time, end_time, next_page_token=None, **kwargs):
+            with self.lock:
+                self.calls.append((start_time, next_page_token))
+            number = int(next_page_token or 0) + 1
+            return make_response(
+                {"meetings": [number], "next_page_token": str(number % 3 or "")}
+            )
+
+        windows = sharding.iter_windows(
+            fetch,
+            "meetings",
+            datetime.date(2020, 1, 1),
+            datetime.date(2020, 4, 30),
+            workers=2,
+        )
+        window, page = next(windows)
+        self.assertEqual(window[0], datetime.date(2020, 1, 1))
+        self.assertEqual(page.records, [1])
+        time.sleep(0.05)
+        self.assertLessEqual(len(self.calls), 3)
+        pages = [(window[0], page.records[0])] + [
+            (window[0], page.records[0]) for window, page in windows
+        ]
+        self.assertEqual(len(pages), 15)
+        self.assertEqual([number for _, number in pages[:4]], [1, 2, 3, 1])
+        self.assertEqual(pages, sorted(pages))
+
+    def test_async(self):
+        async def fetch(**kwargs):
+            return self.fetch(**kwargs)
+
+        async def collect():
+            return [
+                record["uuid"]
+                async for record in sharding.aiter_sharded(
+                    fetch,
+                    "meetings",
+                    datetime.date(2020, 1, 1),
+                    datetime.date(2020, 2, 15),
+                )
+            ]
+
+        self.assertEqual(asyncio.run(collect()), ["a", "b", "c", "d"])
+
+
+class ComponentShardingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.component = components.report.ReportComponentV2(
+            base_uri="http://foo.com",
+            config={"version": util.API_VERSION_2, "token": "token"},
+        )
+
+    @responses.activate
+    def test_iter_get_user_report_splits_long_range(self):
+        responses.add(
+            responses.GET,
+            "http://foo.com/report/users/ID/meetings",
+            json={"meetings": [{"uuid": "a"}]},
+        )
+        records = list(
+            self.component.iter_get_user_report(
+                user_id="ID",
+                start_time=datetime.date(2020, 1, 1),
+                end_time=datetime.date(2020, 12, 31),
+                workers=2,
+            )
+        )
+        self.assertEqual(records, [{"uuid": "a"}])
+        self.assertEqual(len(responses.calls), 13)
+        params = sorted(call.request.params["from"] for call in responses.calls)
+        self.assertEqual(params[0], "2020-01-01T00:00:00Z")
+        self.assertEqual(params[1], "2020-01-31T00:00:00Z")
+
+    @responses.activate
+    def test_iter_get_account_report_yields_windows(self):
+        responses.add(
+            responses.GET,
+            "http://foo.com/report/users",
+            json={"users": [{"id": "u"}], "total_meetings": 3},
+        )
+        windows = list(
+            self.component.iter_get_account_report(
+                start_time=datetime.date(2020, 1, 1),
+                end_time=datetime.date(2020, 2, 15),
+            )
+        )
+        self.assertEqual(
+            [window for window, _ in windows],
+            [
+                (datetime.date(2020, 1, 1), datetime.date(2020, 1, 30)),
+                (datetime.date(2020, 1, 31), datetime.date(2020, 2, 15)),
+            ],
+        )
+        self.assertEqual([page.records for _, page in windows], [[{"id": "u"}]] * 2)
+        self.assertEqual(windows[0][1].data["total_meetings"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
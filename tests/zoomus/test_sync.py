@@ -0,0 +1,110 @@
+import datetime
+import shutil
+import tempfile
+import os
+import unittest
+
+from zoomus import components, export, sync, util
+import responses
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock  # type: ignore
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(IncrementalSyncTestCase))
+    return suite
+
+
+class IncrementalSyncTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = export.FileCheckpointStore(
+            os.path.join(self.directory, "sync.json")
+        )
+        options = {
+            "base_uri": "http://foo.com",
+            "config": {"version": util.API_VERSION_2, "token": "token"},
+        }
+        self.client = mock.Mock()
+        self.client.user = components.user.UserComponentV2(**options)
+        self.client.recording = components.recording.RecordingComponentV2(**options)
+        self.client.report = components.report.ReportComponentV2(**options)
+        self.today = datetime.date(2020, 3, 10)
+        self.sync = sync.IncrementalSync(
+            self.client, self.store, today=lambda: self.today
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def add_users(self, users):
+        responses.add(responses.GET, "http://foo.com/users", json={"users": users})
+
+    @responses.activate
+    def test_users_changes(self):
+        self.add_users([{"id": "a", "email": "a@x"}, {"id": "b", "email": "b@x"}])
+        changes = self.sync.users()
+        self.assertEqual([user["id"] for user in changes.upserts], ["a", "b"])
+        self.assertEqual(changes.deletes, [])
+        self.sync.commit(changes)
+
+        responses.reset()
+        self.add_users([{"id": "a", "email": "new@x"}, {"id": "c", "email": "c@x"}])
+        changes = self.sync.users()
+        self.assertEqual([user["id"] for user in changes.upserts], ["a", "c"])
+        self.assertEqual(changes.deletes, ["b"])
+
+    @responses.activate
+    def test_uncommitted_changes_are_fetched_again(self):
+        self.add_users([{"id": "a"}])
+        self.sync.users()
+        self.assertEqual(len(self.sync.users().upserts), 1)
+
+    @responses.activate
+    def test_recordings_from_watermark(self):
+        url = "http://foo.com/users/ID/recordings"
+        responses.add(responses.GET, url, json={"meetings": [{"uuid": "m1"}]})
+        responses.add(responses.GET, url, json={"meetings": [{"uuid": "m0"}]})
+        changes = self.sync.recordings("ID")
+        self.assertEqual(changes.upserts, [{"uuid": "m1"}])
+        self.assertEqual(changes.deletes, ["m0"])
+        self.assertEqual(
+            responses.calls[0].request.params["from"], "2020-02-10T00:00:00Z"
+        )
+        self.assertEqual(responses.calls[1].request.params["trash"], "true")
+        self.sync.commit(changes)
+
+        responses.reset()
+        responses.add(responses.GET, url, json={"meetings": []})
+        self.today = datetime.date(2020, 3, 12)
+        self.sync.recordings("ID")
+        self.assertEqual(
+            responses.calls[0].request.params["from"], "2020-03-09T00:00:00Z"
+        )
+        self.assertEqual(
+            responses.calls[0].request.params["to"], "2020-03-12T00:00:00Z"
+        )
+
+    @responses.activate
+    def test_meetings_from_watermark(self):
+        self.store.set("sync:meetings:ID", {"until": "2020-03-01"})
+        responses.add(
+            responses.GET,
+            "http://foo.com/report/users/ID/meetings",
+            json={"meetings": [{"uuid": "m1"}]},
+        )
+        changes = self.sync.meetings("ID")
+        self.assertEqual(changes.upserts, [{"uuid": "m1"}])
+        self.assertEqual(changes.state, {"until": "2020-03-10"})
+        self.assertEqual(
+            responses.calls[0].request.params["from"], "2020-02-29T00:00:00Z"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,30 @@
 import datetime
+import hashlib
+import hmac
 import json
 import unittest
 
 from zoomus import util
+import requests
 import responses
 
+try:
+    from unittest import mock
+except ImportError:
+    import mock  # type: ignore
+
 
 def suite():
     """Define all the tests of the module."""
     suite = unittest.TestSuite()
     suite.addTest(unittest.makeSuite(ApiClientTestCase))
+    suite.addTest(unittest.makeSuite(CreateSessionTestCase))
     suite.addTest(unittest.makeSuite(RequireKeysTestCase))
     suite.addTest(unittest.makeSuite(DateToStrTestCase))
     suite.addTest(unittest.makeSuite(IsStrTypeTestCase))
     suite.addTest(unittest.makeSuite(EncodeUuidTestCase))
+    suite.addTest(unittest.makeSuite(WebhookSignatureTestCase))
+    suite.addTest(unittest.makeSuite(TimestampIsValidTestCase))
     return suite
 
 
@@ -658,6 +669,71 @@ class ApiClientTestCase(unittest.TestCase):
             set(expected_headers.items()).issubset(set(actual_headers.items()))
         )
 
+    @responses.activate
+    def test_requests_are_sent_with_session(self):
+        responses.add(responses.GET, "http://www.foo.com/endpoint")
+        session = requests.Session()
+        client = util.ApiClient(
+            base_uri="http://www.foo.com",
+            config={"version": util.API_VERSION_2, "token": "token"},
+            session=session,
+        )
+        with mock.patch.object(session, "request", wraps=session.request) as request:
+            client.get_request("endpoint")
+        request.assert_called_once_with(
+            "GET",
+            "http://www.foo.com/endpoint",
+            timeout=15,
+            params=None,
+            headers={"Authorization": "Bearer token"},
+        )
+
+    @responses.activate
+    def test_unauthorized_request_is_replayed_with_renewed_token(self):
+        responses.add(responses.GET, "http://www.foo.com/endpoint", status=401)
+        responses.add(responses.GET, "http://www.foo.com/endpoint", status=200)
+        token_manager = mock.Mock(token="OLD")
+        token_manager.renew.return_value = "NEW"
+        client = util.ApiClient(
+            base_uri="http://www.foo.com",
+            config={"version": util.API_VERSION_2},
+            token_manager=token_manager,
+        )
+        response = client.get_request("endpoint")
+        self.assertEqual(response.status_code, 200)
+        token_manager.renew.assert_called_once_with("OLD")
+        self.assertEqual(
+            responses.calls[1].request.headers["Authorization"], "Bearer NEW"
+        )
+
+    @responses.activate
+    def test_unauthorized_request_is_not_replayed_without_renewed_token(self):
+        responses.add(responses.GET, "http://www.foo.com/endpoint", status=401)
+        token_manager = mock.Mock(token="OLD")
+        token_manager.renew.return_value = None
+        client = util.ApiClient(
+            base_uri="http://www.foo.com",
+            config={"version": util.API_VERSION_2},
+            token_manager=token_manager,
+        )
+        response = client.get_request("endpoint")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(len(responses.calls), 1)
+
+
+class CreateSessionTestCase(unittest.TestCase):
+    def test_mounts_pooled_adapter(self):
+        session = util.create_session(pool_connections=3, pool_maxsize=7)
+        for prefix in ("http://", "https://"):
+            adapter = session.get_adapter(prefix + "api.zoom.us")
+            self.assertEqual(adapter._pool_connections, 3)
+            self.assertEqual(adapter._pool_maxsize, 7)
+            self.assertFalse(adapter._pool_block)
+
+    def test_can_block_when_pool_is_full(self):
+        session = util.create_session(pool_block=True)
+        self.assertTrue(session.get_adapter("https://api.zoom.us")._pool_block)
+
 
 class RequireKeysTestCase(unittest.TestCase):
     def test_can_require_keys_with_single_string_key(self):
@@ -743,5 +819,69 @@ class EncodeUuidTestCase(unittest.TestCase):
         )
 
 
+def sign(body, timestamp, secret):
+    message = b"v0:" + str(timestamp).encode("utf-8") + b":" + body
+    digest = hmac.new(secret.encode("utf-8"), message, hashlib.sha256).hexdigest()
+    return "v0=" + digest
+
+
+class TimestampIsValidTestCase(unittest.TestCase):
+    def test_window_is_symmetric(self):
+        now = 1600000000000
+        minute = 60 * 1000
+        for timestamp, valid in [
+            (now, True),
+            (now - 5 * minute + 1, True),
+            (now - 5 * minute, False),
+            (now + 5 * minute - 1, True),
+            (now + 5 * minute, False),
+        ]:
+            self.assertEqual(
+                util.timestamp_is_valid(str(timestamp), now=now), valid, timestamp
+            )
+        self.assertTrue(util.timestamp_is_valid(b"1600000000000", now=now))
+
+    def test_reads_the_clock(self):
+        self.assertEqual(util.now_ms(lambda: 1600000000.0015), 1600000000001)
+        with mock.patch("zoomus.util.now_ms", return_value=1600000000000):
+            self.assertTrue(util.timestamp_is_valid("1600000000000"))
+            self.assertFalse(util.timestamp_is_valid("1500000000000"))
+
+
+class WebhookSignatureTestCase(unittest.TestCase):
+    def setUp(self):
+        # Not how json.dumps would serialize it
+        self.body = b'{"payload": {"name": "Caf\\u00e9"}, "event": "meeting.started"}'
+        self.signature = sign(self.body, 1600000000000, "secret")
+
+    def test_valid_raw_signature(self):
+        self.assertTrue(
+            util.contains_valid_raw_signature(
+                self.body, "1600000000000", self.signature, "secret"
+            )
+        )
+
+    def test_accepts_buffers_and_bytes_headers(self):
+        self.assertTrue(
+            util.contains_valid_raw_signature(
+                memoryview(bytearray(self.body)),
+                b"1600000000000",
+                self.signature.encode("utf-8"),
+                "secret",
+            )
+        )
+
+    def test_invalid_raw_signature(self):
+        for body, timestamp, signature, secret in [
+            (self.body + b" ", "1600000000000", self.signature, "secret"),
+            (self.body, "1600000000001", self.signature, "secret"),
+            (self.body, "1600000000000", self.signature, "other"),
+            (self.body, "1600000000000", "v0=\u00e9", "secret"),
+        ]:
+            self.assertFalse(
+                util.contains_valid_raw_signature(body, timestamp, signature, secret)
+            )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,302 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock  # type: ignore
+
+from zoomus import util, webhooks
+from zoomus.client import validate_webhook, validate_webhooks
+
+
+def suite():
+    """Define all the tests of the module."""
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(WebhookVerifierTestCase))
+    suite.addTest(unittest.makeSuite(ValidateBatchTestCase))
+    suite.addTest(unittest.makeSuite(ReplayKeyTestCase))
+    suite.addTest(unittest.makeSuite(MemoryReplayIndexTestCase))
+    suite.addTest(unittest.makeSuite(SQLiteReplayIndexTestCase))
+    suite.addTest(unittest.makeSuite(ReplayProtectionTestCase))
+    return suite
+
+
+class WebhookVerifierTestCase(unittest.TestCase):
+    def setUp(self):
+        self.body = b'{"event":"meeting.participant_joined","payload":{}}'
+        self.timestamp = "1600000000000"
+        self.verifier = webhooks.WebhookVerifier("secret")
+        self.signature = self.verifier.signature(self.body, self.timestamp)
+
+    def test_signature_matches_util(self):
+        self.assertTrue(
+            util.contains_valid_raw_signature(
+                self.body, self.timestamp, self.signature, "secret"
+            )
+        )
+
+    def test_verifies_repeatedly(self):
+        for _ in range(3):
+            self.assertTrue(
+                self.verifier.verify(self.body, self.timestamp, self.signature)
+            )
+        self.assertFalse(
+            self.verifier.verify(self.body + b" ", self.timestamp, self.signature)
+        )
+
+    def test_accepts_bytes_headers(self):
+        self.assertTrue(
+            self.verifier.verify(
+                bytearray(self.body),
+                self.timestamp.encode("utf-8"),
+                self.signature.encode("utf-8"),
+            )
+        )
+
+    def test_accepts_any_active_secret(self):
+        rotating = webhooks.WebhookVerifier(["new", "secret"])
+        self.assertTrue(rotating.verify(self.body, self.timestamp, self.signature))
+        self.assertFalse(
+            webhooks.WebhookVerifier(["new", "other"]).verify(
+                self.body, self.timestamp, self.signature
+            )
+        )
+        self.assertEqual(
+            rotating.encrypt_token("abc"), util.webhook_validation("abc", "new")
+        )
+
+    def test_verify_payload(self):
+        payload = json.loads(self.body)
+        self.assertTrue(
+            self.verifier.verify_payload(payload, self.timestamp, self.signature)
+        )
+        self.assertTrue(
+            util.contains_valid_signature(
+                payload, self.timestamp, self.signature, "secret"
+            )
+        )
+
+    def test_requires_a_secret(self):
+        with self.assertRaises(ValueError):
+            webhooks.WebhookVerifier([])
+
+    def test_validate_webhook_with_verifier(self):
+        timestamp = str(int(time.time() * 1000))
+        event = {
+            "headers": {
+                "x-zm-signature": self.verifier.signature(self.body, timestamp),
+                "x-zm-request-timestamp": timestamp,
+            },
+            "body": self.body,
+        }
+        rotating = webhooks.WebhookVerifier(["new", "secret"])
+        self.assertEqual(validate_webhook(event, rotating), (True, None, None))
+        self.assertEqual(validate_webhook(event, "secret"), (True, None, None))
+        self.assertEqual(validate_webhook(event, "new"), (False, None, None))
+
+    def test_verifier_for_is_shared(self):
+        self.assertIs(webhooks.verifier_for("secret"), webhooks.verifier_for("secret"))
+
+
+class ValidateBatchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.verifier = webhooks.WebhookVerifier("secret")
+        self.now = 1600000000000
+        self.body = b'{"event":"meeting.started","payload":{}}'
+
+    def event(self, timestamp, signature=None, body=None):
+        body = self.body if body is None else body
+        if signature is None:
+            signature = self.verifier.signature(body, timestamp)
+        return {
+            "headers": {
+                "x-zm-signature": signature,
+                "x-zm-request-timestamp": str(timestamp),
+            },
+            "body": body,
+        }
+
+    def test_validates_in_order(self):
+        validation = json.dumps(
+            {"event": "endpoint.url_validation", "payload": {"plainToken": "abc"}}
+        ).encode("utf-8")
+        events = [
+            self.event(self.now - 1000),
+            self.event(self.now - 1000, signature="v0=bad"),
+            self.event(self.now - 21 * 60 * 1000),
+            self.event("not a timestamp", signature="v0=bad"),
+            self.event(self.now, body=validation),
+        ]
+        results = self.verifier.validate_batch(events, now=self.now)
+        self.assertEqual(results[:4], [(True, None, None)] + [(False, None, None)] * 3)
+        self.assertEqual(results[4][1], 200)
+        self.assertEqual(
+            results[4][2]["encryptedToken"], util.webhook_validation("abc", "secret")
+        )
+
+    def test_rejects_malformed_requests(self):
+        events = [
+            {"headers": {}, "body": b'{"event":"endpoint.url_validation"'},
+            {"headers": {}, "body": b'{"event":"endpoint.url_validation"}'},
+            {"headers": {}, "body": {"event": "endpoint.url_validation"}},
+            self.event(self.now),
+        ]
+        self.assertEqual(
+            self.verifier.validate_batch(events, now=self.now),
+            [(False, None, None)] * 3 + [(True, None, None)],
+        )
+        self.assertEqual(validate_webhook(events[0], "secret"), (False, None, None))
+        with self.assertRaises(ValueError):
+            self.verifier.check(events[1])
+
+    def test_skips_stale_signatures(self):
+        stale = self.event(self.now - 60 * 60 * 1000)
+        with mock.patch.object(self.verifier, "verify") as verify:
+            results = self.verifier.validate_batch([stale], now=self.now)
+        self.assertEqual(results, [(False, None, None)])
+        verify.assert_not_called()
+
+    def test_reads_the_clock_once(self):
+        clock = mock.Mock(return_value=self.now / 1000.0)
+        verifier = webhooks.WebhookVerifier("secret", clock=clock)
+        events = [self.event(self.now) for _ in range(3)]
+        results = validate_webhooks(events, verifier)
+        self.assertEqual(results, [(True, None, None)] * 3)
+        self.assertEqual(clock.call_count, 1)
+
+    def test_accepts_clock_skew(self):
+        events = [
+            self.event(self.now + 19 * 60 * 1000),
+            self.event(self.now + 21 * 60 * 1000),
+        ]
+        self.assertEqual(
+            self.verifier.validate_batch(events, now=self.now),
+            [(True, None, None), (False, None, None)],
+        )
+
+
+class ReplayKeyTestCase(unittest.TestCase):
+    def test_event_key(self):
+        payload = {
+            "event": "meeting.started",
+            "event_ts": 1600000000000,
+            "payload": {"object": {"uuid": "abc==", "id": 123}},
+        }
+        self.assertEqual(
+            webhooks.replay_key(payload, "v0=sig"),
+            "meeting.started:1600000000000:abc==",
+        )
+
+    def test_falls_back_to_signature(self):
+        self.assertEqual(webhooks.replay_key({"event": "x"}, "v0=sig"), "v0=sig")
+        self.assertEqual(webhooks.replay_key(b"not json", "v0=sig"), "v0=sig")
+
+
+class MemoryReplayIndexTestCase(unittest.TestCase):
+    def test_rejects_replays_until_expired(self):
+        index = webhooks.MemoryReplayIndex(ttl_mins=1)
+        self.assertTrue(index.add("a", now=0))
+        self.assertFalse(index.add("a", now=59999))
+        self.assertTrue(index.add("b", now=30000))
+        self.assertTrue(index.add("a", now=60000))
+        self.assertEqual(len(index), 2)
+
+    def test_bounded(self):
+        index = webhooks.MemoryReplayIndex(max_entries=2)
+        for key in "abc":
+            self.assertTrue(index.add(key, now=0))
+        self.assertEqual(len(index), 2)
+        self.assertTrue(index.add("a", now=0))
+        self.assertFalse(index.add("c", now=0))
+
+    def test_discard(self):
+        index = webhooks.MemoryReplayIndex()
+        self.assertTrue(index.add("a", now=0))
+        index.discard("a")
+        index.discard("b")
+        self.assertTrue(index.add("a", now=0))
+
+
+class SQLiteReplayIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "replays.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_shared_between_indexes(self):
+        first = webhooks.SQLiteReplayIndex(self.path, ttl_mins=1)
+        second = webhooks.SQLiteReplayIndex(self.path, ttl_mins=1)
+        self.assertTrue(first.add("a", now=0))
+        self.assertFalse(second.add("a", now=1000))
+        self.assertTrue(second.add("a", now=60000))
+        self.assertFalse(first.add("a", now=60001))
+
+    def test_discard(self):
+        index = webhooks.SQLiteReplayIndex(self.path)
+        self.assertTrue(index.add("a", now=0))
+        index.discard("a")
+        self.assertTrue(index.add("a", now=0))
+
+    def test_purges_expired_events(self):
+        index = webhooks.SQLiteReplayIndex(self.path, ttl_mins=1, purge_every=2)
+        index.add("a", now=0)
+        index.add("b", now=60000)
+        count = (
+            index._connection()
+            .execute("SELECT COUNT(*) FROM zoomus_webhook_replays")
+            .fetchone()[0]
+        )
+        self.assertEqual(count, 1)
+
+
+class ReplayProtectionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.verifier = webhooks.WebhookVerifier(
+            "secret", replays=webhooks.MemoryReplayIndex()
+        )
+        self.body = (
+            b'{"event":"meeting.started","event_ts":1600000000000,'
+            b'"payload":{"object":{"id":123}}}'
+        )
+
+    def event(self, timestamp, body=None):
+        body = self.body if body is None else body
+        return {
+            "headers": {
+                "x-zm-signature": self.verifier.signature(body, timestamp),
+                "x-zm-request-timestamp": str(timestamp),
+            },
+            "body": body,
+        }
+
+    def test_redelivery_is_acknowledged(self):
+        now = int(time.time() * 1000)
+        self.assertEqual(
+            validate_webhook(self.event(now), self.verifier), (True, None, None)
+        )
+        # Redelivered later, signed with a new timestamp
+        self.assertEqual(
+            validate_webhook(self.event(now + 5000), self.verifier), (None, 200, None)
+        )
+        parsed = dict(self.event(now + 6000), body=json.loads(self.body))
+        self.assertEqual(validate_webhook(parsed, self.verifier), (None, 200, None))
+
+    def test_invalid_requests_are_not_remembered(self):
+        now = int(time.time() * 1000)
+        forged = self.event(now)
+        forged["headers"]["x-zm-signature"] = "v0=bad"
+        self.assertEqual(validate_webhook(forged, self.verifier), (False, None, None))
+        self.assertEqual(
+            validate_webhook(self.event(now), self.verifier), (True, None, None)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,618 @@
+"""Zoom.us REST API Python Client -- asyncio client
+
+Requires the optional ``httpx`` dependency (``pip install zoomus[async]``).
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+import os
+import time
+
+from zoomus import auth, download, pagination, ratelimit, sharding, util
+from zoomus.client import API_BASE_URIS, COMPONENT_CLASSES, ComponentsMixin
+from zoomus.util import API_VERSION_2
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+# Stands in for the access token while the synchronous component code builds
+# the request headers; it is replaced once the token has been awaited.
+TOKEN_PLACEHOLDER = "<zoomus-pending-token>"
+PENDING_AUTHORIZATION = "Bearer {}".format(TOKEN_PLACEHOLDER)
+
+
+async def request_access_token(client_id, client_secret, account, http_client):
+    """Request a Server-to-Server OAuth access token
+
+    :param client_id: The Server-to-Server OAuth client id
+    :param client_secret: The Server-to-Server OAuth client secret
+    :param account: The Zoom.us account id
+    :param http_client: The :class:`httpx.AsyncClient` to use
+    :return: The decoded token response, which includes the ``access_token``
+             and the number of seconds it ``expires_in``
+    """
+    url, payload, headers = util.access_token_request(client_id, client_secret, account)
+    response = await http_client.post(url, data=payload, headers=headers)
+    return response.json()
+
+
+async def download_file(
+    url,
+    path,
+    http_client,
+    token=None,
+    file_size=None,
+    renew_token=None,
+    chunk_size=download.DEFAULT_CHUNK_SIZE,
+    retries=3,
+    timeout=15,
+    segments=1,
+):
+    """Like :func:`zoomus.download.download`, with an
+    :class:`httpx.AsyncClient`
+
+    :param renew_token: A callable returning an awaitable of the token to
+                        retry with, when the server rejected a token
+    """
+    if segments > 1 and file_size and hasattr(os, "pwrite"):
+        try:
+            return await download_segments(
+                url,
+                path,
+                http_client,
+                file_size,
+                segments,
+                token=token,
+                renew_token=renew_token,
+                chunk_size=chunk_size,
+                retries=retries,
+                timeout=timeout,
+            )
+        except download.RangeIgnored:
+            pass
+    attempt = 0
+    while True:
+        offset = download.partial_size(path)
+        if file_size is not None and offset >= int(file_size):
+            break
+        try:
+            async with http_client.stream(
+                "GET",
+                url,
+                headers=download.range_headers(token, offset),
+                follow_redirects=True,
+                timeout=timeout,
+            ) as response:
+                if response.status_code == 401 and renew_token is not None:
+                    renewed = await renew_token(token)
+                    if renewed and renewed != token:
+                        token, renew_token = renewed, None
+                        continue
+                if response.status_code == 416:
+                    break
+                response.raise_for_status()
+                mode = "ab" if response.status_code == 206 else "wb"
+                with open(download.partial_path(path), mode) as fh:
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        fh.write(chunk)
+            break
+        except httpx.TransportError:
+            attempt += 1
+            if attempt > retries:
+                raise
+    return download.finish(path, url, file_size)
+
+
+async def download_segments(
+    url,
+    path,
+    http_client,
+    file_size,
+    segments,
+    token=None,
+    renew_token=None,
+    chunk_size=download.DEFAULT_CHUNK_SIZE,
+    retries=3,
+    timeout=15,
+    min_segment_size=download.MIN_SEGMENT_SIZE,
+):
+    """Like :func:`zoomus.download.download_segments`, with an
+    :class:`httpx.AsyncClient`"""
+    file_size = int(file_size)
+    state = {"token": token}
+    segments_path = path + download.SEGMENTS_SUFFIX
+    fd = os.open(segments_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+
+    async def fetch(segment):
+        offset, end = segment
+        attempt = 0
+        renewed = False
+        while offset <= end:
+            headers = download.range_headers(state["token"], None)
+            headers["Range"] = "bytes={}-{}".format(offset, end)
+            try:
+                async with http_client.stream(
+                    "GET", url, headers=headers, follow_redirects=True, timeout=timeout
+                ) as response:
+                    can_renew = renew_token is not None and not renewed
+                    if response.status_code == 401 and can_renew:
+                        rejected = state["token"]
+                        state["token"] = await renew_token(rejected) or rejected
+                        renewed = True
+                        continue
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise download.RangeIgnored(url)
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        data = memoryview(chunk)[: end + 1 - offset]
+                        offset += download.write_at(fd, data, offset)
+                if offset <= end:
+                    raise httpx.ReadError(
+                        "Range {}-{} of {} ended early".format(segment[0], end, url)
+                    )
+            except httpx.TransportError:
+                attempt += 1
+                if attempt > retries:
+                    raise
+
+    try:
+        download.preallocate(fd, file_size)
+        ranges = download.split_segments(file_size, segments, min_segment_size)
+        tasks = [asyncio.ensure_future(fetch(segment)) for segment in ranges]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # Stop the other ranges before the file is closed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    except BaseException:
+        os.close(fd)
+        os.remove(segments_path)
+        raise
+    os.close(fd)
+    os.replace(segments_path, path)
+    return path
+
+
+class AsyncTokenManager(object):
+    """Keeps a Server-to-Server OAuth access token valid, for asyncio
+
+    Like :class:`zoomus.auth.TokenManager`, but tokens are fetched without
+    blocking the event loop, and concurrent tasks share a single fetch.
+    """
+
+    def __init__(
+        self,
+        client_id,
+        client_secret,
+        account_id,
+        http_client,
+        refresh_margin=auth.DEFAULT_REFRESH_MARGIN,
+        on_refresh=None,
+    ):
+        """Setup a new token manager
+
+        :param client_id: The Server-to-Server OAuth client id
+        :param client_secret: The Server-to-Server OAuth client secret
+        :param account_id: The Zoom.us account id
+        :param http_client: The :class:`httpx.AsyncClient` to request tokens
+                            with
+        :param refresh_margin: The number of seconds before the token expires
+                               at which it is refreshed
+        :param on_refresh: An optional callable that is called with every new
+                           token
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.account_id = account_id
+        self.http_client = http_client
+        self.refresh_margin = refresh_margin
+        self.on_refresh = on_refresh
+        self._token = None
+        self._previous_token = None
+        self._expires_at = 0
+        self._lock = None
+
+    @property
+    def token(self):
+        """The current token, without fetching a new one"""
+        return self._token
+
+    @property
+    def expires_at(self):
+        """The UNIX time the current token expires at"""
+        return self._expires_at
+
+    def needs_refresh(self):
+        """Whether the current token is missing or about to expire"""
+        return self._token is None or time.time() >= (
+            self._expires_at - self.refresh_margin
+        )
+
+    def invalidate(self):
+        """Forget the current token, e.g. after the credentials changed"""
+        self._token = None
+        self._expires_at = 0
+
+    async def get_token(self):
+        """A valid access token, fetching a new one if needed"""
+        if self.needs_refresh():
+            async with self._get_lock():
+                if self.needs_refresh():
+                    await self._fetch()
+        return self._token
+
+    async def refresh(self):
+        """Fetch a new access token
+
+        :return: The new token
+        """
+        async with self._get_lock():
+            return await self._fetch()
+
+    async def renew(self, rejected_token):
+        """Replace a token that the API rejected
+
+        :param rejected_token: The token the API rejected
+        :return: The token to retry with, or ``None`` if the rejected token
+                 was not issued by this manager
+        """
+        async with self._get_lock():
+            if rejected_token == self._token:
+                await self._fetch()
+            elif rejected_token != self._previous_token:
+                return None
+            return self._token
+
+    def _get_lock(self):
+        # Created on first use so that it belongs to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _fetch(self):
+        data = await request_access_token(
+            self.client_id, self.client_secret, self.account_id, self.http_client
+        )
+        token = data.get("access_token")
+        if token:
+            expires_in = int(data.get("expires_in") or auth.DEFAULT_EXPIRES_IN)
+        else:
+            expires_in = 0
+        if token != self._token:
+            self._previous_token = self._token
+        self._token = token
+        self._expires_at = time.time() + expires_in
+        if self.on_refresh is not None:
+            self.on_refresh(token)
+        return token
+
+
+class AsyncClientMixin(object):
+    """Sends the requests of an :class:`zoomus.util.ApiClient` with httpx
+
+    The request methods return awaitables of :class:`httpx.Response`
+    objects. The ``session`` is the :class:`httpx.AsyncClient` and the
+    ``token_manager`` an :class:`AsyncTokenManager`.
+    """
+
+    def get_token(self):
+        if self.token_manager is not None:
+            return TOKEN_PLACEHOLDER
+        return self.config.get("token")
+
+    def paginate(self, fetch, key, numbered=False, **kwargs):
+        """Like :meth:`zoomus.components.base.BaseComponent.paginate`
+
+        :return: An async generator of records
+        """
+        if numbered:
+            kwargs.pop("prefetch", None)
+            return pagination.aiter_numbered_records(fetch, key, **kwargs)
+        return pagination.aiter_records(fetch, key, **kwargs)
+
+    async def download(self, url, path, **kwargs):
+        """Like :meth:`zoomus.components.base.BaseComponent.download`"""
+        token, renew_token = self.config.get("token"), None
+        if self.token_manager is not None:
+            token = await self.token_manager.get_token()
+            renew_token = self.token_manager.renew
+        return await download_file(
+            url,
+            path,
+            self.session,
+            token=token,
+            renew_token=renew_token,
+            timeout=self.timeout,
+            **kwargs,
+        )
+
+    def paginate_range(self, fetch, key, start_arg, end_arg, **kwargs):
+        """Like :meth:`zoomus.components.base.BaseComponent.paginate_range`
+
+        :return: An async generator of records
+        """
+        if kwargs.get(start_arg) is None or kwargs.get(end_arg) is None:
+            return self.paginate(fetch, key, **kwargs)
+        kwargs.pop("prefetch", None)
+        start, end = kwargs.pop(start_arg), kwargs.pop(end_arg)
+        return sharding.aiter_sharded(
+            fetch, key, start, end, start_arg, end_arg, **kwargs
+        )
+
+    def paginate_windows(self, fetch, key, start_arg, end_arg, **kwargs):
+        """Like :meth:`zoomus.components.base.BaseComponent.paginate_windows`
+
+        :return: An async generator of ``((kwargs.pop("prefetch", None)
+        start, end), page)`` tuples
+        """
+        kwargs.pop("prefetch", None)
+        start, end = kwargs.pop(start_arg), kwargs.pop(end_arg)
+        return sharding.aiter_windows(
+            fetch, key, start, end, start_arg, end_arg, **kwargs
+        )
+
+    async def send_request(self, method, endpoint, **kwargs):
+        """Send a request, renewing the token and retrying it like
+        :meth:`zoomus.util.ApiClient.send_request`
+
+        :param method: The HTTP method
+        :param endpoint: The endpoint
+        :param kwargs: Any other arguments, as for :meth:`requests.request`
+        :return: The :class:`httpx.Response` for this request
+        """
+        if self.retry_policy is None:
+            return await self._send_authorized(method, endpoint, **kwargs)
+        return await self.retry_policy.acall(
+            method,
+            lambda: self._send_authorized(method, endpoint, **kwargs),
+            exceptions=(httpx.TransportError,),
+        )
+
+    async def _send_authorized(self, method, endpoint, **kwargs):
+        headers = kwargs.get("headers") or {}
+        if headers.get("Authorization") == PENDING_AUTHORIZATION:
+            token = await self.token_manager.get_token()
+            headers = dict(headers, Authorization="Bearer {}".format(token))
+            kwargs["headers"] = headers
+        response = await self._send(method, endpoint, **kwargs)
+        if response.status_code == 401 and self.token_manager is not None:
+            authorization = headers.get("Authorization") or ""
+            if authorization.startswith("Bearer "):
+                token = await self.token_manager.renew(authorization.split(" ", 1)[1])
+                if token:
+                    headers = dict(headers, Authorization="Bearer {}".format(token))
+                    kwargs["headers"] = headers
+                    response = await self._send(method, endpoint, **kwargs)
+        return response
+
+    async def _send(
+        self, method, endpoint, params=None, data=None, headers=None, cookies=None
+    ):
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve(method, endpoint)
+            if wait:
+                await asyncio.sleep(wait)
+        headers = dict(headers or {})
+        if cookies:
+            headers["Cookie"] = "; ".join(
+                "{}={}".format(name, value) for name, value in cookies.items()
+            )
+        if params:
+            params = {k: v for k, v in params.items() if v is not None}
+        response = await self.session.request(
+            method,
+            self.url_for(endpoint),
+            params=params,
+            content=data if is_content(data) else None,
+            data=None if is_content(data) else data,
+            headers=headers,
+            timeout=self.timeout,
+        )
+        if self.rate_limit_tracker is not None:
+            self.rate_limit_tracker.record(method, endpoint, response)
+        return response
+
+
+def is_content(data):
+    """Whether request data is a raw body rather than form fields"""
+    return util.is_str_type(data) or isinstance(data, bytes)
+
+
+_ASYNC_COMPONENT_CLASSES = {}
+
+
+def async_component_class(component_class):
+    """Get the asyncio variant of a component class
+
+    :param component_class: A component class, e.g.
+                            :class:`zoomus.components.user.UserComponentV2`
+    :return: A subclass whose request methods return awaitables
+    """
+    if component_class not in _ASYNC_COMPONENT_CLASSES:
+        _ASYNC_COMPONENT_CLASSES[component_class] = type(
+            "Async{}".format(component_class.__name__),
+            (AsyncClientMixin, component_class),
+            {"__doc__": component_class.__doc__},
+        )
+    return _ASYNC_COMPONENT_CLASSES[component_class]
+
+
+class AsyncZoomClient(ComponentsMixin, AsyncClientMixin, util.ApiClient):
+    """Zoom.us REST API Python Client for asyncio
+
+    Exposes the same components as :class:`zoomus.client.ZoomClient`, whose
+    methods return awaitables::
+
+        async with AsyncZoomClient(client_id, client_secret, account_id) as client:
+            response = await client.meeting.get(id=meeting_id)
+
+    The access token is fetched on the first API call.
+    """
+
+    def __init__(
+        self,
+        client_id,
+        client_secret,
+        account_id,
+        data_type="json",
+        timeout=15,
+        version=API_VERSION_2,
+        base_uri=None,
+        http_client=None,
+        max_connections=100,
+        max_keepalive_connections=20,
+        token_refresh_margin=auth.DEFAULT_REFRESH_MARGIN,
+        rate_limiter=None,
+        retry_policy=None,
+        rate_limit_tracker=None,
+    ):
+        """Create a new asyncio Zoom client
+
+        :param client_id: The Zooom.us API Server-to-Server OAuth client id
+        :param client_secret: The Zoom.us API Server-to-Server OAuth client secret
+        :param account_id: The Zoom.us account id
+        :param data_type: The expected return data type. Either 'json' or 'xml'
+        :param timeout: The time out to use for API requests
+        :param version: The API version to use (Default is V2)
+        :param base_uri: Set the base URI to use. By default this is chosen
+                         based on the API version chosen.
+        :param http_client: The :class:`httpx.AsyncClient` to share between
+                            all components. By default one is created and
+                            closed when the client is closed.
+        :param max_connections: The maximum number of connections, when no
+                                http_client is given
+        :param max_keepalive_connections: The maximum number of idle
+                                          connections to keep alive, when no
+                                          http_client is given
+        :param token_refresh_margin: The number of seconds before the access
+                                     token expires at which it is refreshed
+        :param rate_limiter: An optional
+                             :class:`zoomus.ratelimit.RateLimiter` to pace
+                             the requests of all components with
+        :param retry_policy: An optional :class:`zoomus.retry.RetryPolicy` to
+                             retry failed requests of all components with
+        :param rate_limit_tracker: The
+                                   :class:`zoomus.ratelimit.RateLimitTracker`
+                                   to record the rate limit headers of all
+                                   responses with. By default a new one is
+                                   created, available as ``rate_limits``.
+        """
+        if httpx is None:
+            raise RuntimeError("AsyncZoomClient requires httpx to be installed")
+        try:
+            base_uri = base_uri or API_BASE_URIS[version]
+            self.components = COMPONENT_CLASSES[version].copy()
+        except KeyError:
+            raise RuntimeError("API version not supported: %s" % version)
+
+        self._owns_http_client = http_client is None
+        if http_client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                )
+            )
+
+        token_manager = AsyncTokenManager(
+            client_id,
+            client_secret,
+            account_id,
+            http_client,
+            refresh_margin=token_refresh_margin,
+            on_refresh=self._set_token,
+        )
+
+        super(AsyncZoomClient, self).__init__(
+            base_uri=base_uri,
+            timeout=timeout,
+            session=http_client,
+            token_manager=token_manager,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            rate_limit_tracker=rate_limit_tracker or ratelimit.RateLimitTracker(),
+        )
+
+        # Setup the config details
+        self.config = {
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "account_id": account_id,
+            "data_type": data_type,
+            "version": version,
+            "base_uri": base_uri,
+            "token": None,
+        }
+
+        # Instantiate the components
+        for key in self.components.keys():
+            self.components[key] = async_component_class(self.components[key])(
+                base_uri=base_uri,
+                config=self.config,
+                session=self.session,
+                token_manager=self.token_manager,
+                rate_limiter=self.rate_limiter,
+                retry_policy=self.retry_policy,
+                rate_limit_tracker=self.rate_limit_tracker,
+            )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """Close the pooled connections, if the client created them"""
+        if self._owns_http_client:
+            await self.session.aclose()
+
+    async def refresh_token(self):
+        """Fetch a new access token for the current credentials"""
+        self.token_manager.client_id = self.config["client_id"]
+        self.token_manager.client_secret = self.config["client_secret"]
+        self.token_manager.account_id = self.config["account_id"]
+        await self.token_manager.refresh()
+
+    def _set_token(self, token):
+        self.config["token"] = token
+
+    def _set_credential(self, name, value):
+        self.config[name] = value
+        setattr(self.token_manager, name, value)
+        self.token_manager.invalidate()
+
+    @property
+    def client_id(self):
+        """The Zoom.us client_id"""
+        return self.config.get("client_id")
+
+    @client_id.setter
+    def client_id(self, value):
+        """Set the client_id; a new token is fetched on the next API call"""
+        self._set_credential("client_id", value)
+
+    @property
+    def client_secret(self):
+        """The Zoom.us client_secret"""
+        return self.config.get("client_secret")
+
+    @client_secret.setter
+    def client_secret(self, value):
+        """Set the client_secret; a new token is fetched on the next API call"""
+        self._set_credential("client_secret", value)
+
+    @property
+    def account_id(self):
+        """The Zoom.us account_id"""
+        return self.config.get("account_id")
+
+    @account_id.setter
+    def account_id(self, value):
+        """Set the account_id; a new token is fetched on the next API call"""
+        self._set_credential("account_id", value)
@@ -0,0 +1,287 @@
+"""Zoom.us REST API Python Client -- Recording archival
+
+Archives every cloud recording of an account to disk in a pipeline of
+stages: listing the recordings, downloading, verifying and, optionally,
+deleting them. Every stage has its own workers and a bounded queue, so each
+stage works at its own pace while memory use stays bounded.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import collections
+import os
+import queue
+import threading
+
+from zoomus import util
+
+LIST = "list"
+DOWNLOAD = "download"
+VERIFY = "verify"
+DELETE = "delete"
+
+# A recording file to archive: the user and meeting it belongs to, the file
+# from the meeting's ``recording_files`` and the path to archive it to.
+ArchiveItem = collections.namedtuple(
+    "ArchiveItem", ["user_id", "meeting", "recording_file", "path"]
+)
+
+# Tells the workers of a stage that no more items will come
+_DONE = object()
+
+
+def default_path(directory, meeting, recording_file):
+    """The path of a recording file in the archive:
+    ``<directory>/<meeting uuid>/<file id>.<extension>``"""
+    extension = recording_file.get("file_extension") or recording_file.get(
+        "file_type", "bin"
+    )
+    name = "{}.{}".format(recording_file["id"], extension.lower())
+    return os.path.join(directory, safe_name(meeting["uuid"]), safe_name(name))
+
+
+def safe_name(name):
+    """A file name without path separators, as UUIDs may contain slashes"""
+    return name.replace("/", "_").replace("\\", "_")
+
+
+class ArchiveProgress(object):
+    """Counts the recording files that went through every stage"""
+
+    def __init__(self, on_progress=None):
+        """Setup new progress counters
+
+        :param on_progress: An optional callable that is called with the
+                            progress after every change
+        """
+        self.on_progress = on_progress
+        self.counts = dict.fromkeys([LIST, DOWNLOAD, VERIFY, DELETE], 0)
+        self.skipped = 0
+        self.bytes = 0
+        self.failures = []
+        self._lock = threading.Lock()
+
+    def add(self, stage, size=0):
+        """Count an item that went through a stage
+
+        :param stage: The stage
+        :param size: The number of bytes the stage downloaded
+        """
+        with self._lock:
+            self.counts[stage] += 1
+            self.bytes += size
+        self._notify()
+
+    def skip(self, item):
+        """Count an item that was already archived"""
+        with self._lock:
+            self.skipped += 1
+        self._notify()
+
+    def fail(self, stage, item, error):
+        """Record an item that failed in a stage"""
+        with self._lock:
+            self.failures.append((stage, item, error))
+        self._notify()
+
+    def snapshot(self):
+        """The current counts, as a dict"""
+        with self._lock:
+            return dict(
+                self.counts,
+                skipped=self.skipped,
+                bytes=self.bytes,
+                failed=len(self.failures),
+            )
+
+    def _notify(self):
+        if self.on_progress is not None:
+            self.on_progress(self)
+
+
+class RecordingArchiver(object):
+    """Archives the cloud recordings of every user of an account
+
+    The recordings are listed in the calling thread and queued for the
+    download workers, which queue the downloaded files for the verify
+    workers, which queue them for the delete workers. A full queue blocks the
+    stage before it, so a slow stage holds back the others instead of
+    letting files pile up.
+
+    Files that are already in the archive with the expected size are not
+    downloaded again, so an interrupted archival can simply be run again. A
+    file that fails a stage is recorded in the progress and skips the
+    following stages; it is never deleted.
+    """
+
+    def __init__(
+        self,
+        client,
+        directory,
+        start,
+        end,
+        delete=False,
+        download_workers=4,
+        verify_workers=2,
+        delete_workers=1,
+        queue_size=100,
+        segments=1,
+        path_for=None,
+        verify=None,
+        on_progress=None,
+        user_params=None,
+    ):
+        """Setup a new archiver
+
+        :param client: The :class:`zoomus.ZoomClient` to archive with
+        :param directory: The directory to archive the files to
+        :param start: The first day of the recordings to archive
+        :param end: The last day of the recordings to archive
+        :param delete: Whether to move the archived recordings to the trash
+        :param download_workers: The number of files downloaded concurrently
+        :param verify_workers: The number of files verified concurrently
+        :param delete_workers: The number of delete requests sent
+                               concurrently
+        :param queue_size: The maximum number of files waiting for each stage
+        :param segments: The number of byte ranges to download each file in
+        :param path_for: A callable returning the path for a meeting and a
+                         recording file. :func:`default_path` when ``None``.
+        :param verify: An optional callable that is called with the path and
+                       the recording file, and returns whether the file is
+                       valid. The size of the file is always verified.
+        :param on_progress: An optional callable that is called with the
+                            :class:`ArchiveProgress` after every change
+        :param user_params: Any arguments to list the users with
+        """
+        self.client = client
+        self.directory = directory
+        self.start = start
+        self.end = end
+        self.delete = delete
+        self.workers = {
+            DOWNLOAD: download_workers,
+            VERIFY: verify_workers,
+            DELETE: delete_workers,
+        }
+        self.queue_size = queue_size
+        self.segments = segments
+        self.path_for = path_for or (
+            lambda meeting, recording_file: default_path(
+                directory, meeting, recording_file
+            )
+        )
+        self.verify = verify
+        self.user_params = dict(user_params or {})
+        self.progress = ArchiveProgress(on_progress)
+
+    def run(self):
+        """Archive the recordings
+
+        :return: The :class:`ArchiveProgress`
+        """
+        stages = [(DOWNLOAD, self.download_item), (VERIFY, self.verify_item)]
+        if self.delete:
+            stages.append((DELETE, self.delete_item))
+        queues = [queue.Queue(self.queue_size) for _ in stages]
+        threads = []
+        for index, (stage, work) in enumerate(stages):
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            threads.append(
+                [
+                    self._start_worker(stage, work, queues[index], outbox)
+                    for _ in range(self.workers[stage])
+                ]
+            )
+        try:
+            for item in self.iter_items():
+                self.progress.add(LIST)
+                queues[0].put(item)
+        finally:
+            # Let every stage finish its queue before stopping the next one
+            for inbox, workers in zip(queues, threads):
+                for _ in workers:
+                    inbox.put(_DONE)
+                for worker in workers:
+                    worker.join()
+        return self.progress
+
+    def iter_items(self):
+        """The recording files of every user to archive"""
+        for user in self.client.user.iter_list(**self.user_params):
+            meetings = self.client.recording.iter_list(
+                user_id=user["id"], start=self.start, end=self.end
+            )
+            for meeting in meetings:
+                for recording_file in meeting.get("recording_files") or []:
+                    if not recording_file.get("download_url"):
+                        continue
+                    yield ArchiveItem(
+                        user["id"],
+                        meeting,
+                        recording_file,
+                        self.path_for(meeting, recording_file),
+                    )
+
+    def download_item(self, item):
+        """Download a recording file, unless it is already archived"""
+        file_size = item.recording_file.get("file_size")
+        if file_size is not None and os.path.exists(item.path):
+            if os.path.getsize(item.path) == int(file_size):
+                self.progress.skip(item)
+                return
+        directory = os.path.dirname(item.path)
+        if directory and not os.path.isdir(directory):
+            with util.ignored(OSError):
+                os.makedirs(directory)
+        self.client.recording.download(
+            item.recording_file["download_url"],
+            item.path,
+            file_size=file_size,
+            segments=self.segments,
+        )
+        self.progress.add(DOWNLOAD, os.path.getsize(item.path))
+
+    def verify_item(self, item):
+        """Verify an archived recording file
+
+        :raises: :class:`IOError` if the file is missing, does not have the
+                 expected size or is rejected by ``verify``
+        """
+        size = os.path.getsize(item.path)
+        file_size = item.recording_file.get("file_size")
+        if file_size is not None and size != int(file_size):
+            raise IOError(
+                "{} has {} bytes, expected {}".format(item.path, size, file_size)
+            )
+        if self.verify is not None and not self.verify(item.path, item.recording_file):
+            raise IOError("{} failed verification".format(item.path))
+        self.progress.add(VERIFY)
+
+    def delete_item(self, item):
+        """Move an archived recording file to the trash"""
+        response = self.client.recording.delete_single_recording(
+            meeting_id=util.encode_uuid(item.meeting["uuid"]),
+            recording_id=item.recording_file["id"],
+            action="trash",
+        )
+        response.raise_for_status()
+        self.progress.add(DELETE)
+
+    def _start_worker(self, stage, work, inbox, outbox):
+        def run():
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    return
+                try:
+                    work(item)
+                except Exception as error:
+                    self.progress.fail(stage, item, error)
+                    continue
+                if outbox is not None:
+                    outbox.put(item)
+
+        worker = threading.Thread(target=run, name="zoomus-archive-" + stage)
+        worker.daemon = True
+        worker.start()
+        return worker
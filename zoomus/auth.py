@@ -0,0 +1,331 @@
+"""Zoom.us REST API Python Client -- OAuth access tokens"""
+
+from __future__ import absolute_import, unicode_literals
+
+import contextlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from zoomus import util
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+DEFAULT_EXPIRES_IN = 3600
+DEFAULT_REFRESH_MARGIN = 300
+
+
+class TokenManager(object):
+    """Keeps a Server-to-Server OAuth access token valid
+
+    The token is stored together with the time it expires at, and is shared
+    by every request until it is about to expire. Only one thread fetches a
+    new token at a time; the others wait for it and then reuse it.
+
+    When a :class:`TokenStore` is given, the token is also shared with every
+    other process using the same store, so that only one of them fetches a
+    new token for each expiry window.
+    """
+
+    def __init__(
+        self,
+        client_id,
+        client_secret,
+        account_id,
+        session=None,
+        refresh_margin=DEFAULT_REFRESH_MARGIN,
+        background_refresh=False,
+        on_refresh=None,
+        store=None,
+    ):
+        """Setup a new token manager
+
+        :param client_id: The Server-to-Server OAuth client id
+        :param client_secret: The Server-to-Server OAuth client secret
+        :param account_id: The Zoom.us account id
+        :param session: An optional :class:`requests.Session` to request
+                        tokens with
+        :param refresh_margin: The number of seconds before the token expires
+                               at which it is refreshed
+        :param background_refresh: Whether to refresh the token from a
+                                   background thread ``refresh_margin``
+                                   seconds before it expires, rather than on
+                                   the first use after that
+        :param on_refresh: An optional callable that is called with every new
+                           token
+        :param store: An optional :class:`TokenStore` to share the token
+                      with other processes
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.account_id = account_id
+        self.session = session
+        self.refresh_margin = refresh_margin
+        self.background_refresh = background_refresh
+        self.on_refresh = on_refresh
+        self.store = store
+        self._token = None
+        self._previous_token = None
+        self._expires_at = 0
+        self._lock = threading.RLock()
+        self._timer = None
+
+    @property
+    def token(self):
+        """A valid access token, fetching a new one if needed"""
+        if self.needs_refresh():
+            with self._lock:
+                if self.needs_refresh():
+                    self._acquire()
+        return self._token
+
+    @property
+    def expires_at(self):
+        """The UNIX time the current token expires at"""
+        return self._expires_at
+
+    @property
+    def store_key(self):
+        """The key the token is shared under in the store"""
+        return "{}:{}".format(self.account_id, self.client_id)
+
+    def needs_refresh(self):
+        """Whether the current token is missing or about to expire"""
+        return self._token is None or self._is_expiring(self._expires_at)
+
+    def refresh(self):
+        """Fetch a new access token
+
+        :return: The new token
+        """
+        with self._lock:
+            with self._store_lock():
+                return self._fetch()
+
+    def renew(self, rejected_token):
+        """Replace a token that the API rejected
+
+        Only the first caller that reports a rejected token fetches a new
+        one. Callers that were rejected with the same token afterwards get
+        the token that was already fetched.
+
+        :param rejected_token: The token the API rejected
+        :return: The token to retry with, or ``None`` if the rejected token
+                 was not issued by this manager
+        """
+        with self._lock:
+            if rejected_token == self._token:
+                self._acquire(rejected_token=rejected_token)
+            elif rejected_token != self._previous_token:
+                return None
+            return self._token
+
+    def close(self):
+        """Stop refreshing the token in the background"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _is_expiring(self, expires_at):
+        return time.time() >= expires_at - self.refresh_margin
+
+    def _store_lock(self):
+        if self.store is None:
+            return _null_lock()
+        return self.store.lock(self.store_key)
+
+    def _acquire(self, rejected_token=None):
+        """Take the token from the store if another process already fetched
+        a valid one, otherwise fetch it"""
+        with self._store_lock():
+            if self.store is not None:
+                stored = self.store.get(self.store_key)
+                if stored is not None and stored[0] != rejected_token:
+                    if not self._is_expiring(stored[1]):
+                        self._set(*stored)
+                        return self._token
+            return self._fetch()
+
+    def _fetch(self):
+        data = util.request_access_token(
+            self.client_id,
+            self.client_secret,
+            self.account_id,
+            session=self.session,
+        )
+        token = data.get("access_token")
+        if token:
+            expires_in = int(data.get("expires_in") or DEFAULT_EXPIRES_IN)
+        else:
+            expires_in = 0
+        expires_at = time.time() + expires_in
+        if token and self.store is not None:
+            self.store.set(self.store_key, token, expires_at)
+        self._set(token, expires_at)
+        return token
+
+    def _set(self, token, expires_at):
+        if token != self._token:
+            self._previous_token = self._token
+        self._token = token
+        self._expires_at = expires_at
+        if self.on_refresh is not None:
+            self.on_refresh(token)
+        if self.background_refresh and token:
+            self._schedule()
+
+    def _schedule(self):
+        self.close()
+        delay = max(self._expires_at - self.refresh_margin - time.time(), 0)
+        self._timer = threading.Timer(delay, self._refresh_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self):
+        with util.ignored(Exception):
+            with self._lock:
+                self._acquire()
+
+
+@contextlib.contextmanager
+def _null_lock():
+    yield
+
+
+class TokenStore(object):
+    """Stores access tokens so that they can be shared between processes
+
+    Subclasses must implement :meth:`get`, :meth:`set` and :meth:`lock`.
+    """
+
+    def get(self, key):
+        """Get a stored token
+
+        :param key: The key the token is stored under
+        :return: A ``(token, expires_at)`` tuple, or ``None``
+        """
+        raise NotImplementedError
+
+    def set(self, key, token, expires_at):
+        """Store a token
+
+        :param key: The key to store the token under
+        :param token: The access token
+        :param expires_at: The UNIX time the token expires at
+        """
+        raise NotImplementedError
+
+    def lock(self, key):
+        """A context manager that holds a lock on the key across processes
+
+        :param key: The key to lock
+        """
+        raise NotImplementedError
+
+
+class FileTokenStore(TokenStore):
+    """Stores tokens in a local JSON file, guarded by a lock file"""
+
+    def __init__(self, path):
+        """Setup a new file token store
+
+        :param path: The path of the JSON file. The lock file is created next
+                     to it, with a ``.lock`` suffix.
+        """
+        if fcntl is None:
+            raise RuntimeError("FileTokenStore requires fcntl file locking")
+        self.path = path
+        self.lock_path = "{}.lock".format(path)
+
+    def get(self, key):
+        with util.ignored(IOError, OSError, ValueError):
+            with open(self.path) as fh:
+                entry = json.load(fh).get(key)
+            if entry:
+                return entry["token"], entry["expires_at"]
+        return None
+
+    def set(self, key, token, expires_at):
+        tokens = {}
+        with util.ignored(IOError, OSError, ValueError):
+            with open(self.path) as fh:
+                tokens = json.load(fh)
+        tokens[key] = {"token": token, "expires_at": expires_at}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, "w") as fh:
+            json.dump(tokens, fh)
+        os.replace(tmp_path, self.path)
+
+    @contextlib.contextmanager
+    def lock(self, key):
+        with open(self.lock_path, "a") as fh:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+class SQLiteTokenStore(TokenStore):
+    """Stores tokens in a SQLite database"""
+
+    def __init__(self, path, timeout=30):
+        """Setup a new SQLite token store
+
+        :param path: The path of the database file
+        :param timeout: The number of seconds to wait for another process
+                        holding the lock
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS zoomus_tokens "
+            "(key TEXT PRIMARY KEY, token TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            self._local.connection = connection
+        return connection
+
+    def get(self, key):
+        row = (
+            self._connection()
+            .execute(
+                "SELECT token, expires_at FROM zoomus_tokens WHERE key = ?", (key,)
+            )
+            .fetchone()
+        )
+        return tuple(row) if row else None
+
+    def set(self, key, token, expires_at):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO zoomus_tokens (key, token, expires_at) "
+            "VALUES (?, ?, ?)",
+            (key, token, expires_at),
+        )
+
+    @contextlib.contextmanager
+    def lock(self, key):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
@@ -0,0 +1,203 @@
+"""Zoom.us REST API Python Client -- Response caching
+
+Caches the responses of GET requests to endpoints whose data rarely changes,
+such as user settings, for a time to live per endpoint, within a maximum
+memory size.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import collections
+import json
+import threading
+import time
+
+from zoomus import ratelimit
+
+# The number of seconds responses are cached for, by route template. ``{}``
+# matches any single path segment. Other endpoints are not cached, unless a
+# default TTL is given.
+DEFAULT_TTLS = {
+    "/users/{}": 300,
+    "/users/{}/settings": 300,
+    "/groups/{}": 300,
+    "/rooms/{}/settings": 300,
+    "/phone/calling_plans": 3600,
+}
+
+# The default maximum number of bytes of response bodies to cache
+DEFAULT_MAX_SIZE = 32 * 1024 * 1024
+
+# A cached response, and the clock time it expires at
+CacheEntry = collections.namedtuple("CacheEntry", ["response", "expires", "size"])
+
+
+def normalize(endpoint):
+    """An endpoint with a leading and no trailing slash"""
+    return "/" + endpoint.strip("/")
+
+
+class ResponseCache(object):
+    """A thread safe TTL and LRU cache of responses
+
+    Responses are keyed on a scope, the method, the endpoint and the
+    parameters, in a canonical order. The scope keeps apart the responses of
+    clients with other base URIs or accounts sharing the cache. Only
+    successful responses are cached. When the bodies of the cached responses
+    would exceed ``max_size`` bytes, the least recently used ones are
+    evicted.
+
+    A request that changes an endpoint, e.g. a PATCH of the settings of a
+    user, invalidates the cached responses of that endpoint, of the endpoints
+    below it and of the endpoints above it, as changing the email of a user
+    changes the user.
+    """
+
+    def __init__(
+        self,
+        ttls=None,
+        default_ttl=None,
+        max_size=DEFAULT_MAX_SIZE,
+        clock=time.monotonic,
+    ):
+        """Setup a new response cache
+
+        :param ttls: A dict of the number of seconds to cache the responses of
+                     route templates for. :data:`DEFAULT_TTLS` when ``None``.
+        :param default_ttl: The number of seconds to cache the responses of
+                            other endpoints for. They are not cached when
+                            ``None``.
+        :param max_size: The maximum number of bytes of response bodies to
+                         cache
+        :param clock: The monotonic clock to use
+        """
+        ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.routes = ratelimit.RouteTable(
+            ("GET", template, ttl) for template, ttl in ttls.items()
+        )
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, method, endpoint):
+        """The number of seconds to cache the responses of an endpoint for
+
+        :return: The TTL, or ``None`` if the responses are not cached
+        """
+        template, ttl = self.routes.match(method, endpoint)
+        return ttl if template is not None else self.default_ttl
+
+    @staticmethod
+    def key(method, endpoint, params=None, scope=None):
+        """The cache key of a request
+
+        Parameters that are ``None`` are left out, as they are not sent.
+
+        :param scope: What the response is shared by, e.g. the base URI and
+                      the account of the client
+        """
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        return (
+            scope,
+            method.upper(),
+            normalize(endpoint),
+            json.dumps(params, sort_keys=True, default=str),
+        )
+
+    def fetch(self, method, endpoint, params, send, scope=None):
+        """Get a cached response, or send the request and cache its response
+
+        :param method: The HTTP method
+        :param endpoint: The endpoint
+        :param params: The URL parameters
+        :param send: A callable sending the request, and returning the
+                     :class:`requests.Response`
+        :param scope: What the response is shared by, see :meth:`key`
+        :return: The :class:`requests.Response`
+        """
+        ttl = self.ttl_for(method, endpoint)
+        if not ttl:
+            return send()
+        key = self.key(method, endpoint, params, scope)
+        response = self.get(key)
+        if response is None:
+            response = send()
+            self.set(key, response, ttl)
+        return response
+
+    def get(self, key):
+        """Get a cached response
+
+        :param key: The :meth:`key` of the request
+        :return: The response, or ``None`` if it is not cached or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= self.clock():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.response
+
+    def set(self, key, response, ttl):
+        """Cache a response, if it was successful and fits in the cache
+
+        :param key: The :meth:`key` of the request
+        :param response: The :class:`requests.Response`
+        :param ttl: The number of seconds to cache it for
+        """
+        if response.status_code != 200:
+            return
+        size = len(response.content)
+        if size > self.max_size:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and self.size + size > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = CacheEntry(response, self.clock() + ttl, size)
+            self.size += size
+
+    def invalidate(self, endpoint=None):
+        """Remove the cached responses of an endpoint, of the endpoints below
+        it and of the endpoints above it, in every scope, or all of them
+
+        :param endpoint: The endpoint, or ``None`` to clear the cache
+        """
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+                self.size = 0
+                return
+            path = normalize(endpoint) + "/"
+            for key in list(self._entries):
+                # The same endpoint, one below it or one above it
+                cached = key[2] + "/"
+                if cached.startswith(path) or path.startswith(cached):
+                    self._remove(key)
+
+    def stats(self):
+        """The hit and miss counters and the size of the cache, as a dict"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size": self.size,
+            }
+
+    def _remove(self, key):
+        self.size -= self._entries.pop(key).size
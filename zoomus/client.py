@@ -2,8 +2,17 @@
 
 from __future__ import absolute_import, unicode_literals
 
-from zoomus import components, util
-from zoomus.util import API_VERSION_1, API_VERSION_2, API_GDPR, timestamp_is_valid, contains_valid_signature, webhook_validation
+from zoomus import auth, components, ratelimit, util, webhooks
+
+# The webhook helpers are kept importable from here, where they used to be used
+from zoomus.util import (  # noqa: F401
+    API_VERSION_1,
+    API_VERSION_2,
+    API_GDPR,
+    timestamp_is_valid,
+    contains_valid_signature,
+    webhook_validation,
+)
 
 API_BASE_URIS = {
     API_VERSION_1: "https://api.zoom.us/v1",
@@ -37,7 +46,81 @@ COMPONENT_CLASSES = {
 }
 
 
-class ZoomClient(util.ApiClient):
+class ComponentsMixin(object):
+    """Accessors for the components of a client"""
+
+    @property
+    def rate_limits(self):
+        """The remaining rate limit quota seen in the responses"""
+        return self.rate_limit_tracker
+
+    @property
+    def contacts(self):
+        """Get the contacts component"""
+        return self.components.get("contacts")
+
+    @property
+    def meeting(self):
+        """Get the meeting component"""
+        return self.components.get("meeting")
+
+    @property
+    def metric(self):
+        """Get the metric component"""
+        return self.components.get("metric")
+
+    @property
+    def report(self):
+        """Get the report component"""
+        return self.components.get("report")
+
+    @property
+    def user(self):
+        """Get the user component"""
+        return self.components.get("user")
+
+    @property
+    def webinar(self):
+        """Get the webinar component"""
+        return self.components.get("webinar")
+
+    @property
+    def events(self):
+        """Get the events component"""
+        return self.components.get("events")
+
+    @property
+    def recording(self):
+        """Get the recording component"""
+        return self.components.get("recording")
+
+    @property
+    def live_stream(self):
+        """Get the live stream component"""
+        return self.components.get("live_stream")
+
+    @property
+    def phone(self):
+        """Get the phone component"""
+        return self.components.get("phone")
+
+    @property
+    def past_meeting(self):
+        """Get the past meeting component"""
+        return self.components.get("past_meeting")
+
+    @property
+    def group(self):
+        """Get the group component"""
+        return self.components.get("group")
+
+    @property
+    def room(self):
+        """Get the room component"""
+        return self.components.get("room")
+
+
+class ZoomClient(ComponentsMixin, util.ApiClient):
     """Zoom.us REST API Python Client"""
 
     """Base URL for Zoom API"""
@@ -51,6 +134,18 @@ class ZoomClient(util.ApiClient):
         timeout=15,
         version=API_VERSION_2,
         base_uri=None,
+        session=None,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        token_refresh_margin=auth.DEFAULT_REFRESH_MARGIN,
+        background_token_refresh=False,
+        lazy_token=False,
+        token_store=None,
+        rate_limiter=None,
+        retry_policy=None,
+        rate_limit_tracker=None,
+        response_cache=None,
     ):
         """Create a new Zoom client
 
@@ -66,6 +161,42 @@ class ZoomClient(util.ApiClient):
                          based on the API version chosen, but it can be
                          overriden so that the GDPR compliant base URI can
                          be used in the EU.
+        :param session: The :class:`requests.Session` to share between all
+                        components. By default a pooled session is created
+                        and closed when the client is closed.
+        :param pool_connections: The number of hosts to keep connection pools
+                                 for, when no session is given
+        :param pool_maxsize: The maximum number of connections to keep alive
+                             per host, when no session is given
+        :param pool_block: Whether to block rather than exceed
+                           ``pool_maxsize`` connections per host, when no
+                           session is given
+        :param token_refresh_margin: The number of seconds before the access
+                                     token expires at which it is refreshed
+        :param background_token_refresh: Whether to refresh the access token
+                                         from a background thread before it
+                                         expires
+        :param lazy_token: Whether to wait for the first API call to fetch
+                           the access token, so that creating the client
+                           does no network I/O
+        :param token_store: An optional :class:`zoomus.auth.TokenStore`, such
+                            as :class:`zoomus.auth.FileTokenStore` or
+                            :class:`zoomus.auth.SQLiteTokenStore`, to share
+                            the access token with other processes
+        :param rate_limiter: An optional
+                             :class:`zoomus.ratelimit.RateLimiter` to pace
+                             the requests of all components with
+        :param retry_policy: An optional :class:`zoomus.retry.RetryPolicy` to
+                             retry failed requests of all components with
+        :param rate_limit_tracker: The
+                                   :class:`zoomus.ratelimit.RateLimitTracker`
+                                   to record the rate limit headers of all
+                                   responses with. By default a new one is
+                                   created, available as ``rate_limits``.
+        :param response_cache: An optional
+                               :class:`zoomus.cache.ResponseCache` to cache
+                               the responses of GET requests of all
+                               components in
         """
         try:
             base_uri = base_uri or API_BASE_URIS[version]
@@ -73,7 +204,35 @@ class ZoomClient(util.ApiClient):
         except KeyError:
             raise RuntimeError("API version not supported: %s" % version)
 
-        super(ZoomClient, self).__init__(base_uri=base_uri, timeout=timeout)
+        self._owns_session = session is None
+        if session is None:
+            session = util.create_session(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+
+        token_manager = auth.TokenManager(
+            client_id,
+            client_secret,
+            account_id,
+            session=session,
+            refresh_margin=token_refresh_margin,
+            background_refresh=background_token_refresh,
+            on_refresh=self._set_token,
+            store=token_store,
+        )
+
+        super(ZoomClient, self).__init__(
+            base_uri=base_uri,
+            timeout=timeout,
+            session=session,
+            token_manager=token_manager,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            rate_limit_tracker=rate_limit_tracker or ratelimit.RateLimitTracker(),
+            response_cache=response_cache,
+        )
 
         # Setup the config details
         self.config = {
@@ -83,25 +242,47 @@ class ZoomClient(util.ApiClient):
             "data_type": data_type,
             "version": version,
             "base_uri": base_uri,
-            "token": util.generate_jwt(client_id, client_secret, account_id),
+            "token": None,
         }
+        if not lazy_token:
+            # Fetch a token now, or take a valid one from the token store
+            self.token_manager.token
 
         # Instantiate the components
         for key in self.components.keys():
             self.components[key] = self.components[key](
-                base_uri=base_uri, config=self.config
+                base_uri=base_uri,
+                config=self.config,
+                session=self.session,
+                token_manager=self.token_manager,
+                rate_limiter=self.rate_limiter,
+                retry_policy=self.retry_policy,
+                rate_limit_tracker=self.rate_limit_tracker,
+                response_cache=self.response_cache,
             )
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        return
+        self.close()
+
+    def close(self):
+        """Stop refreshing the token and close the pooled connections, if the
+        client created them"""
+        self.token_manager.close()
+        if self._owns_session:
+            self.session.close()
 
     def refresh_token(self):
-        self.config["token"] = (
-            util.generate_jwt(self.config["client_id"], self.config["client_secret"], self.config["account_id"]),
-        )
+        """Fetch a new access token for the current credentials"""
+        self.token_manager.client_id = self.config["client_id"]
+        self.token_manager.client_secret = self.config["client_secret"]
+        self.token_manager.account_id = self.config["account_id"]
+        self.token_manager.refresh()
+
+    def _set_token(self, token):
+        self.config["token"] = token
 
     @property
     def client_id(self):
@@ -136,71 +317,6 @@ class ZoomClient(util.ApiClient):
         self.config["account_id"] = value
         self.refresh_token()
 
-    @property
-    def contacts(self):
-        """Get the contacts component"""
-        return self.components.get("contacts")
-
-    @property
-    def meeting(self):
-        """Get the meeting component"""
-        return self.components.get("meeting")
-
-    @property
-    def metric(self):
-        """Get the metric component"""
-        return self.components.get("metric")
-
-    @property
-    def report(self):
-        """Get the report component"""
-        return self.components.get("report")
-
-    @property
-    def user(self):
-        """Get the user component"""
-        return self.components.get("user")
-
-    @property
-    def webinar(self):
-        """Get the webinar component"""
-        return self.components.get("webinar")
-
-    @property
-    def events(self):
-        """Get the events component"""
-        return self.components.get("events")
-
-    @property
-    def recording(self):
-        """Get the recording component"""
-        return self.components.get("recording")
-
-    @property
-    def live_stream(self):
-        """Get the live stream component"""
-        return self.components.get("live_stream")
-
-    @property
-    def phone(self):
-        """Get the phone component"""
-        return self.components.get("phone")
-
-    @property
-    def past_meeting(self):
-        """Get the past meeting component"""
-        return self.components.get("past_meeting")
-
-    @property
-    def group(self):
-        """Get the group component"""
-        return self.components.get("group")
-
-    @property
-    def room(self):
-        """Get the room component"""
-        return self.components.get("room")
-
 
 def validate_webhook(event: dict, secret: str, delta_mins: int = 20):
     """
@@ -217,30 +333,33 @@ def validate_webhook(event: dict, secret: str, delta_mins: int = 20):
             "event_ts": int
         }
     }
-    """
-    headers = event.get("headers", {})
 
-    signature = headers.get("x-zm-signature")
-    timestamp = headers.get("x-zm-request-timestamp")
-    payload = event.get("body")
+    The body can also be the raw request body, as bytes, in which case the
+    signature is checked over the bytes as they were received, without
+    parsing them.
 
-    if payload and payload["event"] == "endpoint.url_validation":
-        hash_for_validate = webhook_validation(payload["payload"]["plainToken"], secret)
+    The secret can also be a :class:`zoomus.webhooks.WebhookVerifier`, e.g.
+    one with several secrets while the secret token is rotated, or with a
+    replay index to recognize redelivered events.
+    """
+    if isinstance(secret, webhooks.WebhookVerifier):
+        verifier = secret
+    else:
+        verifier = webhooks.verifier_for(secret)
+    return verifier.validate(event, delta_mins=delta_mins)
 
-        response = {
-            "plainToken": payload["payload"]["plainToken"],
-            "encryptedToken": hash_for_validate
-        }
-        return None, 200, response
 
-    if not signature or not timestamp or not timestamp_is_valid(timestamp, delta_mins=delta_mins):
-        return False, None, None
+def validate_webhooks(events: list, secret: str, delta_mins: int = 20):
+    """Validate a batch of webhook requests, see :func:`validate_webhook`
 
-    valid = contains_valid_signature(
-        payload=payload,
-        timestamp=timestamp,
-        signature=signature,
-        secret=secret
-    )
+    The current time is read once for the whole batch, and requests that are
+    too old are rejected without computing their signature.
 
-    return valid, None, None
+    :return: A list of ``(valid, status, response)`` tuples, in the order of
+             the events
+    """
+    if isinstance(secret, webhooks.WebhookVerifier):
+        verifier = secret
+    else:
+        verifier = webhooks.verifier_for(secret)
+    return verifier.validate_batch(events, delta_mins=delta_mins)
@@ -2,7 +2,7 @@
 
 from __future__ import absolute_import, unicode_literals
 
-from zoomus import util
+from zoomus import download, pagination, sharding, util
 
 
 class BaseComponent(util.ApiClient):
@@ -44,9 +44,97 @@ class BaseComponent(util.ApiClient):
             del params["version"]
         if headers is None and self.config.get("version") == util.API_VERSION_2:
             headers = {
-                "Authorization": "Bearer {}".format(self.config.get("token")),
+                "Authorization": "Bearer {}".format(self.get_token()),
                 "Content-Type": "application/json",
             }
         return super(BaseComponent, self).post_request(
             endpoint, params=params, data=data, headers=headers, cookies=cookies
         )
+
+    def paginate(self, fetch, key, prefetch=False, numbered=False, **kwargs):
+        """Lazily iterate over the records of a paginated list method
+
+        :param fetch: The list method, e.g. ``self.list``
+        :param key: The key of the records in the response, e.g. ``users``
+        :param prefetch: Whether to fetch the next page in the background
+                         while the current one is being consumed
+        :param numbered: Whether the list method is paginated with a
+                         ``page_number`` rather than a ``next_page_token``.
+                         Its pages are then fetched concurrently, see
+                         :func:`zoomus.pagination.iter_numbered_pages`.
+        :param kwargs: The paging arguments of
+                       :func:`zoomus.pagination.iter_pages` (or
+                       :func:`zoomus.pagination.iter_numbered_pages`) and
+                       any other arguments for the list method
+        :return: A generator of records
+        """
+        if numbered:
+            return pagination.iter_numbered_records(fetch, key, **kwargs)
+        if prefetch:
+            return pagination.prefetch_records(fetch, key, **kwargs)
+        return pagination.iter_records(fetch, key, **kwargs)
+
+    def paginate_range(self, fetch, key, start_arg, end_arg, **kwargs):
+        """Lazily iterate over the records of a paginated list method that
+        takes a range of days
+
+        Ranges longer than the API accepts are split into windows, which are
+        fetched concurrently, see :func:`zoomus.sharding.iter_sharded`.
+        Without both ends of the range, this is the same as :meth:`paginate`.
+
+        :param fetch: The list method, e.g. ``self.get_user_report``
+        :param key: The key of the records in the response, e.g. ``meetings``
+        :param start_arg: The name of the argument for the start of the range
+        :param end_arg: The name of the argument for the end of the range
+        :param kwargs: The arguments of :func:`zoomus.sharding.iter_sharded`
+                       and any other arguments for the list method
+        :return: A generator of records
+        """
+        if kwargs.get(start_arg) is None or kwargs.get(end_arg) is None:
+            return self.paginate(fetch, key, **kwargs)
+        kwargs.pop("prefetch", None)
+        start, end = kwargs.pop(start_arg), kwargs.pop(end_arg)
+        return sharding.iter_sharded(
+            fetch, key, start, end, start_arg, end_arg, **kwargs
+        )
+
+    def paginate_windows(self, fetch, key, start_arg, end_arg, **kwargs):
+        """Lazily iterate over the pages of a paginated list method that
+        takes a range of days, window by window
+
+        Unlike :meth:`paginate_range`, the records are not merged, so that
+        the window each page covers and its totals are kept.
+
+        :param fetch: The list method, e.g. ``self.get_account_report``
+        :param key: The key of the records in the response, e.g. ``users``
+        :param start_arg: The name of the argument for the start of the range
+        :param end_arg: The name of the argument for the end of the range
+        :param kwargs: The arguments of :func:`zoomus.sharding.iter_windows`
+                       and any other arguments for the list method
+        :return: A generator of ``((kwargs.pop("prefetch", None)
+        start, end), page)`` tuples
+        """
+        kwargs.pop("prefetch", None)
+        start, end = kwargs.pop(start_arg), kwargs.pop(end_arg)
+        return sharding.iter_windows(
+            fetch, key, start, end, start_arg, end_arg, **kwargs
+        )
+
+    def download(self, url, path, **kwargs):
+        """Stream a file to disk, authenticated with the access token
+
+        :param url: The URL of the file
+        :param path: The path to save the file to
+        :param kwargs: Any other arguments of :func:`zoomus.download.download`
+        :return: The path of the downloaded file
+        """
+        renew_token = self.token_manager.renew if self.token_manager else None
+        return download.download(
+            url,
+            path,
+            token=self.get_token(),
+            session=self.session,
+            renew_token=renew_token,
+            timeout=self.timeout,
+            **kwargs,
+        )
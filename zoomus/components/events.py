@@ -24,6 +24,9 @@ class EventsComponentV2(base.BaseComponent):
             params=kwargs
         )
 
+    def iter_list_events(self, **kwargs):
+        return self.paginate(self.list_events, "events", **kwargs)
+
     def create_event(self, **kwargs):
         """
         Create an event
@@ -115,6 +118,9 @@ class EventsComponentV2(base.BaseComponent):
             params=kwargs
         )
 
+    def iter_list_session_attendees(self, **kwargs):
+        return self.paginate(self.list_session_attendees, "attendees", **kwargs)
+
     def list_registrants(self, **kwargs):
         """
         List registrants
@@ -129,6 +135,9 @@ class EventsComponentV2(base.BaseComponent):
             params=kwargs
         )
 
+    def iter_list_registrants(self, **kwargs):
+        return self.paginate(self.list_registrants, "registrants", **kwargs)
+
     #
     # Sessions
     #
@@ -522,6 +531,9 @@ class EventsComponentV2(base.BaseComponent):
             params=kwargs
         )
 
+    def iter_event_attendance(self, **kwargs):
+        return self.paginate(self.event_attendance, "attendees", **kwargs)
+
     def event_registrations(self, **kwargs):
         """
         Get event registrations report
@@ -534,3 +546,6 @@ class EventsComponentV2(base.BaseComponent):
             f"/zoom_events/events/{event_id}/reports/ticket_registration",
             params=kwargs
         )
+
+    def iter_event_registrations(self, **kwargs):
+        return self.paginate(self.event_registrations, "registrants", **kwargs)
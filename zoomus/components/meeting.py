@@ -15,6 +15,9 @@ class MeetingComponent(base.BaseComponent):
             kwargs["start_time"] = util.date_to_str(kwargs["start_time"])
         return self.post_request("/meeting/list", params=kwargs)
 
+    def iter_list(self, **kwargs):
+        return self.paginate(self.list, "meetings", numbered=True, **kwargs)
+
     def create(self, **kwargs):
         util.require_keys(kwargs, ["host_id", "topic", "type"])
         if kwargs.get("start_time"):
@@ -47,6 +50,9 @@ class MeetingComponentV2(base.BaseComponent):
             "/users/{}/meetings".format(kwargs.get("user_id")), params=kwargs
         )
 
+    def iter_list(self, **kwargs):
+        return self.paginate(self.list, "meetings", **kwargs)
+
     def create(self, **kwargs):
         util.require_keys(kwargs, "user_id")
         if kwargs.get("start_time"):
@@ -89,6 +95,9 @@ class MeetingComponentV2(base.BaseComponent):
             "/meetings/{}/registrants".format(kwargs.get("id")), params=kwargs
         )
 
+    def iter_list_registrants(self, **kwargs):
+        return self.paginate(self.list_registrants, "registrants", **kwargs)
+
     def update_registrant_status(self, **kwargs):
         util.require_keys(kwargs, "id")
         util.require_keys(kwargs, "action")
@@ -13,6 +13,9 @@ class MetricComponentV2(base.BaseComponent):
             params=kwargs,
         )
 
+    def iter_list_meetings(self, **kwargs):
+        return self.paginate(self.list_meetings, "meetings", **kwargs)
+
     def get_meeting(self, **kwargs):
         util.require_keys(kwargs, "meeting_id")
         kwargs["meeting_id"] = util.encode_uuid(kwargs.get("meeting_id"))
@@ -38,6 +38,9 @@ class PhoneComponentV2(base.BaseComponent):
         """
         return self.get_request("/phone/call_logs", params=kwargs)
 
+    def iter_call_logs(self, **kwargs):
+        return self.paginate(self.call_logs, "call_logs", **kwargs)
+
     def calling_plans(self, **kwargs):
         return self.get_request("/phone/calling_plans", params=kwargs)
 
@@ -1,5 +1,6 @@
 """Zoom.us REST API Python Client -- Recording component"""
-from zoomus import util
+
+from zoomus import download, util
 from zoomus.components import base
 
 
@@ -16,6 +17,9 @@ class RecordingComponent(base.BaseComponent):
             kwargs["to"] = util.date_to_str(end)
         return self.post_request("/recording/list", params=kwargs)
 
+    def iter_list(self, **kwargs):
+        return self.paginate(self.list, "meetings", numbered=True, **kwargs)
+
     def delete(self, **kwargs):
         util.require_keys(kwargs, ["meeting_id"])
         return self.post_request("/recording/delete", params=kwargs)
@@ -40,12 +44,41 @@ class RecordingComponentV2(base.BaseComponent):
             "/users/{}/recordings".format(kwargs.get("user_id")), params=kwargs
         )
 
+    def iter_list(self, **kwargs):
+        return self.paginate_range(self.list, "meetings", "start", "end", **kwargs)
+
     def get(self, **kwargs):
         util.require_keys(kwargs, "meeting_id")
         return self.get_request(
             "/meetings/{}/recordings".format(kwargs.get("meeting_id")), params=kwargs
         )
 
+    def download_file(self, **kwargs):
+        """Stream a recording file to disk, resuming an interrupted download
+
+        Takes the keys of a file in ``recording_files``, e.g.
+        ``download_file(path="meeting.mp4", **recording_file)``.
+
+        :param download_url: The URL of the recording file
+        :param path: The path to save the file to
+        :param file_size: The expected size of the file, which is verified
+        :param chunk_size: The number of bytes to read and write at a time
+        :param retries: The number of times to resume after a connection
+                        error
+        :param segments: The number of byte ranges of the file to download
+                         concurrently, for large files
+        :return: The path of the downloaded file
+        """
+        util.require_keys(kwargs, ["download_url", "path"])
+        return self.download(
+            kwargs["download_url"],
+            kwargs["path"],
+            file_size=kwargs.get("file_size"),
+            chunk_size=kwargs.get("chunk_size", download.DEFAULT_CHUNK_SIZE),
+            retries=kwargs.get("retries", 3),
+            segments=kwargs.get("segments", 1),
+        )
+
     def delete(self, **kwargs):
         util.require_keys(kwargs, "meeting_id")
         return self.delete_request(
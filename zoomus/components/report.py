@@ -41,6 +41,11 @@ class ReportComponentV2(base.BaseComponent):
             "/report/users/{}/meetings".format(kwargs.get("user_id")), params=kwargs
         )
 
+    def iter_get_user_report(self, **kwargs):
+        return self.paginate_range(
+            self.get_user_report, "meetings", "start_time", "end_time", **kwargs
+        )
+
     def get_account_report(self, **kwargs):
         util.require_keys(kwargs, ["start_time", "end_time"])
         kwargs["from"] = util.date_to_str(kwargs["start_time"])
@@ -49,10 +54,20 @@ class ReportComponentV2(base.BaseComponent):
         del kwargs["end_time"]
         return self.get_request("/report/users", params=kwargs)
 
+    def iter_get_account_report(self, **kwargs):
+        # Every window reports its own usage per user and its own totals
+        util.require_keys(kwargs, ["start_time", "end_time"])
+        return self.paginate_windows(
+            self.get_account_report, "users", "start_time", "end_time", **kwargs
+        )
+
     def get_daily_report(self, **kwargs):
         util.require_keys(kwargs, ["month", "year"])
         return self.get_request("/report/daily", params=kwargs)
 
+    def iter_get_daily_report(self, **kwargs):
+        return self.paginate(self.get_daily_report, "dates", numbered=True, **kwargs)
+
     def get_meeting_participants_report(self, **kwargs):
         util.require_keys(kwargs, "id")
         return self.get_request(
@@ -2,7 +2,7 @@
 
 from __future__ import absolute_import
 
-from zoomus import util
+from zoomus import pagination, util
 from zoomus.components import base
 
 
@@ -15,6 +15,9 @@ class UserComponent(base.BaseComponent):
     def list(self, **kwargs):
         return self.post_request("/user/list", params=kwargs)
 
+    def iter_list(self, **kwargs):
+        return self.paginate(self.list, "users", numbered=True, **kwargs)
+
     def pending(self, **kwargs):
         return self.post_request("/user/pending", params=kwargs)
 
@@ -49,6 +52,10 @@ class UserComponentV2(base.BaseComponent):
     def list(self, **kwargs):
         return self.get_request("/users", params=kwargs)
 
+    def iter_list(self, **kwargs):
+        kwargs.setdefault("max_page_size", pagination.MAX_USERS_PAGE_SIZE)
+        return self.paginate(self.list, "users", **kwargs)
+
     def create(self, **kwargs):
         return self.post_request("/users", data=kwargs)
 
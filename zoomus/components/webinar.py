@@ -15,6 +15,9 @@ class WebinarComponent(base.BaseComponent):
             kwargs["start_time"] = util.date_to_str(kwargs["start_time"])
         return self.post_request("/webinar/list", params=kwargs)
 
+    def iter_list(self, **kwargs):
+        return self.paginate(self.list, "webinars", numbered=True, **kwargs)
+
     def upcoming(self, **kwargs):
         util.require_keys(kwargs, "host_id")
         if kwargs.get("start_time"):
@@ -61,6 +64,9 @@ class WebinarComponentV2(base.BaseComponent):
             "/users/{}/webinars".format(kwargs.get("user_id")), params=kwargs
         )
 
+    def iter_list(self, **kwargs):
+        return self.paginate(self.list, "webinars", **kwargs)
+
     def create(self, **kwargs):
         util.require_keys(kwargs, "user_id")
         return self.post_request(
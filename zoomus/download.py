@@ -0,0 +1,290 @@
+"""Zoom.us REST API Python Client -- Recording downloads
+
+Streams recording files to disk in chunks, so that memory use does not grow
+with the file size, and resumes interrupted downloads with range requests.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import errno
+import math
+import os
+from concurrent import futures
+
+import requests
+
+# The number of bytes read and written at a time
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# The suffix of a file while it is being downloaded
+PARTIAL_SUFFIX = ".part"
+
+# The suffix of a file while its segments are being downloaded. It has its
+# full size from the start, so unlike a partial file its size says nothing of
+# the progress.
+SEGMENTS_SUFFIX = ".segments"
+
+# The smallest segment worth a request of its own
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+
+RESUME_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def partial_path(path):
+    """The path a file is downloaded to before it is complete"""
+    return path + PARTIAL_SUFFIX
+
+
+def partial_size(path):
+    """The number of bytes of a file that were already downloaded"""
+    try:
+        return os.path.getsize(partial_path(path))
+    except OSError:
+        return 0
+
+
+def range_headers(token, offset):
+    """The headers to request a file from an offset with"""
+    headers = {}
+    if token:
+        headers["Authorization"] = "Bearer {}".format(token)
+    if offset:
+        headers["Range"] = "bytes={}-".format(offset)
+    return headers
+
+
+def split_segments(size, segments, min_segment_size=MIN_SEGMENT_SIZE):
+    """Split a file into contiguous byte ranges
+
+    :param size: The size of the file
+    :param segments: The maximum number of ranges
+    :param min_segment_size: The minimum size of a range
+    :return: A list of inclusive ``(start, end)`` offsets
+    """
+    count = max(1, min(segments, size // max(min_segment_size, 1)))
+    step = int(math.ceil(float(size) / count))
+    return [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+
+class RangeIgnored(Exception):
+    """The server answered a range request with the whole file"""
+
+
+def finish(path, url, file_size=None):
+    """Verify the size of a downloaded file and move it into place
+
+    :raises: :class:`IOError` if the file does not have the expected size
+    """
+    size = partial_size(path)
+    if file_size is not None and size != int(file_size):
+        raise IOError(
+            "Downloaded {} bytes of {}, expected {}".format(size, url, file_size)
+        )
+    os.replace(partial_path(path), path)
+    return path
+
+
+def download(
+    url,
+    path,
+    token=None,
+    file_size=None,
+    session=None,
+    renew_token=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    retries=3,
+    timeout=15,
+    segments=1,
+):
+    """Download a file to disk, resuming an interrupted download
+
+    The file is written to ``path`` with a ``.part`` suffix, and renamed once
+    it is complete. An existing partial file, e.g. of a download that was
+    interrupted in an earlier run, is resumed with a range request.
+
+    With more than one segment, and a known ``file_size``, the file is
+    downloaded with :func:`download_segments` instead.
+
+    :param url: The URL of the file, e.g. the ``download_url`` of a recording
+                file
+    :param path: The path to save the file to
+    :param token: The access token to authenticate with
+    :param file_size: The expected size of the file, in bytes
+    :param session: The :class:`requests.Session` to download with
+    :param renew_token: A callable that is called with a token the server
+                        rejected, and returns the token to retry with
+    :param chunk_size: The number of bytes to read and write at a time
+    :param retries: The number of times to resume after a connection error
+    :param timeout: The connect and read timeout, in seconds
+    :param segments: The number of byte ranges to download concurrently
+    :return: The path of the downloaded file
+    :raises: :class:`requests.HTTPError` if the server refused the download,
+             :class:`IOError` if the file does not have the expected size
+    """
+    if segments > 1 and file_size and hasattr(os, "pwrite"):
+        try:
+            return download_segments(
+                url,
+                path,
+                file_size,
+                segments,
+                token=token,
+                session=session,
+                renew_token=renew_token,
+                chunk_size=chunk_size,
+                retries=retries,
+                timeout=timeout,
+            )
+        except RangeIgnored:
+            pass
+    attempt = 0
+    while True:
+        offset = partial_size(path)
+        if file_size is not None and offset >= int(file_size):
+            break
+        try:
+            response = (session or requests).get(
+                url,
+                headers=range_headers(token, offset),
+                stream=True,
+                timeout=timeout,
+            )
+            with response:
+                if response.status_code == 401 and renew_token is not None:
+                    renewed = renew_token(token)
+                    if renewed and renewed != token:
+                        token, renew_token = renewed, None
+                        continue
+                if response.status_code == 416:
+                    # Nothing is left to download past the offset
+                    break
+                response.raise_for_status()
+                # The server ignored the range and sent the whole file
+                mode = "ab" if response.status_code == 206 else "wb"
+                with open(partial_path(path), mode) as fh:
+                    for chunk in response.iter_content(chunk_size):
+                        fh.write(chunk)
+            break
+        except RESUME_EXCEPTIONS:
+            attempt += 1
+            if attempt > retries:
+                raise
+    return finish(path, url, file_size)
+
+
+def download_segments(
+    url,
+    path,
+    file_size,
+    segments,
+    token=None,
+    session=None,
+    renew_token=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    retries=3,
+    timeout=15,
+    min_segment_size=MIN_SEGMENT_SIZE,
+):
+    """Download the byte ranges of a file concurrently
+
+    The file is preallocated with a ``.segments`` suffix (see
+    :func:`preallocate`), so a full disk fails the download before it starts.
+    Every range is written at its offset as it arrives, so the ranges never
+    need to be reassembled. A range that is cut off by a connection error is resumed
+    from where it stopped. A download that is interrupted is started over.
+
+    Takes the same arguments as :func:`download`, and:
+
+    :param segments: The maximum number of ranges to download concurrently
+    :param min_segment_size: The minimum size of a range
+    :return: The path of the downloaded file
+    :raises: :class:`RangeIgnored` if the server does not support range
+             requests
+    """
+    file_size = int(file_size)
+    state = {"token": token}
+    segments_path = path + SEGMENTS_SUFFIX
+    fd = os.open(segments_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+
+    def fetch(segment):
+        offset, end = segment
+        attempt = 0
+        renewed = False
+        while offset <= end:
+            headers = range_headers(state["token"], None)
+            headers["Range"] = "bytes={}-{}".format(offset, end)
+            try:
+                response = (session or requests).get(
+                    url, headers=headers, stream=True, timeout=timeout
+                )
+                with response:
+                    can_renew = renew_token is not None and not renewed
+                    if response.status_code == 401 and can_renew:
+                        rejected = state["token"]
+                        state["token"] = renew_token(rejected) or rejected
+                        renewed = True
+                        continue
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise RangeIgnored(url)
+                    for chunk in response.iter_content(chunk_size):
+                        data = memoryview(chunk)[: end + 1 - offset]
+                        offset += write_at(fd, data, offset)
+                if offset <= end:
+                    raise requests.exceptions.ChunkedEncodingError(
+                        "Range {}-{} of {} ended early".format(segment[0], end, url)
+                    )
+            except RESUME_EXCEPTIONS:
+                attempt += 1
+                if attempt > retries:
+                    raise
+
+    try:
+        preallocate(fd, file_size)
+        ranges = split_segments(file_size, segments, min_segment_size)
+        with futures.ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            list(executor.map(fetch, ranges))
+    except BaseException:
+        os.close(fd)
+        os.remove(segments_path)
+        raise
+    os.close(fd)
+    os.replace(segments_path, path)
+    return path
+
+
+def preallocate(fd, size):
+    """Reserve the disk space of a file
+
+    Where ``posix_fallocate`` is not available, or not supported by the file
+    system, the size of the file is only set, and it may be sparse.
+
+    :param fd: The file descriptor
+    :param size: The size of the file, in bytes
+    :raises: :class:`OSError` if there is not enough disk space
+    """
+    if size and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError as error:
+            if error.errno not in (errno.EINVAL, errno.EOPNOTSUPP):
+                raise
+    os.ftruncate(fd, size)
+
+
+def write_at(fd, data, offset):
+    """Write all of the data to a file descriptor at an offset
+
+    :return: The number of bytes written
+    """
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+    return len(data)
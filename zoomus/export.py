@@ -0,0 +1,346 @@
+"""Zoom.us REST API Python Client -- Resumable bulk exports
+
+Exports the recordings and meeting reports of every user of an account,
+saving its progress to a checkpoint store so that a restarted export resumes
+where the last one stopped.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+
+import requests
+
+from zoomus import pagination, sharding, util
+
+RECORDINGS = "recordings"
+MEETING_REPORTS = "meeting_reports"
+
+# What to export for every kind: the component and its list method, the key
+# of the records in the response and the names of the range arguments.
+EXPORTS = {
+    RECORDINGS: ("recording", "list", "meetings", "start", "end"),
+    MEETING_REPORTS: (
+        "report",
+        "get_user_report",
+        "meetings",
+        "start_time",
+        "end_time",
+    ),
+}
+
+
+class CheckpointStore(object):
+    """Stores the progress of an export
+
+    Subclasses must implement :meth:`get`, :meth:`set` and :meth:`delete`.
+    Values are JSON serializable.
+    """
+
+    def get(self, key, default=None):
+        """Get a stored value
+
+        :param key: The key the value is stored under
+        :param default: The value to return if nothing is stored
+        """
+        raise NotImplementedError
+
+    def set(self, key, value):
+        """Store a value
+
+        :param key: The key to store the value under
+        :param value: The value
+        """
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Delete a stored value, if any
+
+        :param key: The key the value is stored under
+        """
+        raise NotImplementedError
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Stores checkpoints in a local JSON file
+
+    The file is rewritten atomically on every change, so it is always
+    consistent, but it should only be used by one export at a time.
+    """
+
+    def __init__(self, path):
+        """Setup a new file checkpoint store
+
+        :param path: The path of the JSON file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._values = {}
+        with util.ignored(IOError, OSError, ValueError):
+            with open(self.path) as fh:
+                self._values = json.load(fh)
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def set(self, key, value):
+        with self._lock:
+            self._values[key] = value
+            self._write()
+
+    def delete(self, key):
+        with self._lock:
+            if self._values.pop(key, None) is not None:
+                self._write()
+
+    def _write(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, "w") as fh:
+            json.dump(self._values, fh)
+        os.replace(tmp_path, self.path)
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Stores checkpoints in a SQLite database, which can hold the
+    checkpoints of several exports"""
+
+    def __init__(self, path, job="export", timeout=30):
+        """Setup a new SQLite checkpoint store
+
+        :param path: The path of the database file
+        :param job: The name of the export the checkpoints belong to
+        :param timeout: The number of seconds to wait for another process
+                        writing to the database
+        """
+        self.path = path
+        self.job = job
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS zoomus_checkpoints "
+            "(job TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (job, key))"
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            self._local.connection = connection
+        return connection
+
+    def get(self, key, default=None):
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM zoomus_checkpoints WHERE job = ? AND key = ?",
+                (self.job, key),
+            )
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else default
+
+    def set(self, key, value):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO zoomus_checkpoints (job, key, value) "
+            "VALUES (?, ?, ?)",
+            (self.job, key, json.dumps(value)),
+        )
+
+    def delete(self, key):
+        self._connection().execute(
+            "DELETE FROM zoomus_checkpoints WHERE job = ? AND key = ?",
+            (self.job, key),
+        )
+
+
+class BulkExport(object):
+    """Exports the records of every user of an account, resumably
+
+    The users are listed page by page. For every user, each kind of record is
+    fetched in windows of :data:`zoomus.sharding.DEFAULT_WINDOW_DAYS` days,
+    and each window page by page. After every page, the ``next_page_token``
+    is saved, and finished windows and users are recorded, so a restarted
+    export never fetches a completed page again.
+
+    A page that was handled but not yet checkpointed when the export stopped
+    is handled again on restart, so the handler should be idempotent.
+    """
+
+    def __init__(
+        self,
+        client,
+        store,
+        start,
+        end,
+        kinds=(RECORDINGS, MEETING_REPORTS),
+        days=sharding.DEFAULT_WINDOW_DAYS,
+        page_size=pagination.MAX_PAGE_SIZE,
+        user_params=None,
+    ):
+        """Setup a new export
+
+        :param client: The :class:`zoomus.ZoomClient` to export with
+        :param store: The :class:`CheckpointStore` to save the progress to
+        :param start: The first day to export
+        :param end: The last day to export
+        :param kinds: The kinds of records to export, any of
+                      :data:`RECORDINGS` and :data:`MEETING_REPORTS`
+        :param days: The maximum number of days per request
+        :param page_size: The number of records per page
+        :param user_params: Any arguments to list the users with, e.g.
+                            ``{"status": "active"}``
+        """
+        unknown = set(kinds) - set(EXPORTS)
+        if unknown:
+            raise ValueError("Unknown kinds: {}".format(", ".join(sorted(unknown))))
+        self.client = client
+        self.store = store
+        self.kinds = tuple(kinds)
+        self.start = start
+        self.end = end
+        self.windows = sharding.split_range(start, end, days)
+        self.page_size = page_size
+        self.user_params = dict(user_params or {})
+
+    def run(self, handler):
+        """Run the export, or resume it
+
+        :param handler: A callable that is called with the kind, the user id
+                        and the list of records of every page
+        :return: The number of records handled by this run
+        """
+        count = 0
+        for user_id in self.iter_users():
+            count += self.export_user(user_id, handler)
+        return count
+
+    def iter_users(self):
+        """The ids of the users to export, resuming from the last page of
+        users that was not finished"""
+        key = self.users_key()
+        pages = self.iter_pages(
+            self.client.user.list,
+            "users",
+            self.store.get(key),
+            **self.user_params,
+        )
+        for page in pages:
+            for user in page.records:
+                yield user["id"]
+            # Every user of the page was exported
+            if page.next_page_token:
+                self.store.set(key, page.next_page_token)
+        self.store.delete(key)
+
+    def export_user(self, user_id, handler):
+        """Export the records of a user, unless that was already done
+
+        :param user_id: The user id
+        :param handler: The page handler, see :meth:`run`
+        :return: The number of records handled
+        """
+        user_key = self.user_key(user_id)
+        if self.store.get(user_key):
+            return 0
+        count = 0
+        for kind in self.kinds:
+            for window in self.windows:
+                count += self.export_window(kind, user_id, window, handler)
+        self.store.set(user_key, True)
+        for kind in self.kinds:
+            for window in self.windows:
+                self.store.delete(self.window_key(kind, user_id, window))
+        return count
+
+    def export_window(self, kind, user_id, window, handler):
+        """Export the records of a user for a window, resuming from the last
+        checkpointed page
+
+        :return: The number of records handled
+        """
+        key = self.window_key(kind, user_id, window)
+        checkpoint = self.store.get(key) or {}
+        if checkpoint.get("done"):
+            return 0
+        component, method, records_key, start_arg, end_arg = EXPORTS[kind]
+        params = {"user_id": user_id, start_arg: window[0], end_arg: window[1]}
+        pages = self.iter_pages(
+            getattr(getattr(self.client, component), method),
+            records_key,
+            checkpoint.get("next_page_token"),
+            **params,
+        )
+        count = 0
+        for page in pages:
+            handler(kind, user_id, page.records)
+            count += len(page.records)
+            if page.next_page_token:
+                self.store.set(key, {"next_page_token": page.next_page_token})
+        self.store.set(key, {"done": True})
+        return count
+
+    def iter_pages(self, fetch, key, next_page_token, **kwargs):
+        """The pages of a list method, resuming from a checkpointed token
+
+        Page tokens expire after about 15 minutes, so when the API rejects
+        the checkpointed token, the listing starts over from the first page.
+
+        :param fetch: The list method
+        :param key: The key of the records in the response
+        :param next_page_token: The checkpointed token, or ``None``
+        :param kwargs: Any other arguments for the list method
+        :return: A generator of :data:`zoomus.pagination.Page` objects
+        """
+        pages = pagination.iter_pages(
+            fetch,
+            key,
+            page_size=self.page_size,
+            next_page_token=next_page_token,
+            **kwargs,
+        )
+        try:
+            first = next(pages)
+        except requests.HTTPError as error:
+            if not next_page_token or not _token_rejected(error):
+                raise
+            pages = pagination.iter_pages(
+                fetch, key, page_size=self.page_size, **kwargs
+            )
+            first = next(pages)
+        yield first
+        for page in pages:
+            yield page
+
+    def users_key(self):
+        """The key of the checkpointed page of users, for the range and the
+        kinds of this export"""
+        return "users:{}".format(self._scope())
+
+    def user_key(self, user_id):
+        """The key recording that a user was exported, for the range and the
+        kinds of this export, so that another range is exported again"""
+        return "user:{}:{}".format(user_id, self._scope())
+
+    def _scope(self):
+        return "{}:{}:{}".format(
+            self.start.isoformat(), self.end.isoformat(), ",".join(self.kinds)
+        )
+
+    @staticmethod
+    def window_key(kind, user_id, window):
+        return "{}:{}:{}:{}".format(
+            kind, user_id, window[0].isoformat(), window[1].isoformat()
+        )
+
+
+def _token_rejected(error):
+    """Whether a request failed because of an invalid or expired page token"""
+    return error.response is not None and error.response.status_code == 400
@@ -0,0 +1,366 @@
+"""Zoom.us REST API Python Client -- Pagination
+
+Helpers to walk through the pages of list endpoints paginated with a
+``next_page_token`` or a ``page_number``, fetching a bounded number of pages
+at a time so that memory use stays bounded by the page size.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+import collections
+import itertools
+import math
+from concurrent import futures
+
+# The largest page size most list endpoints accept
+MAX_PAGE_SIZE = 300
+
+# The largest page size of the list users endpoint
+MAX_USERS_PAGE_SIZE = 2000
+
+# The number of pages fetched concurrently from page-number endpoints
+DEFAULT_WORKERS = 4
+
+# One page of records. ``next_page_token`` is the token to resume after this
+# page from, or ``None`` for the last page. ``data`` is the whole decoded
+# response.
+Page = collections.namedtuple("Page", ["records", "next_page_token", "data"])
+
+
+def page_params(
+    kwargs, page_size=None, next_page_token=None, max_page_size=MAX_PAGE_SIZE
+):
+    """Build the arguments to fetch a page with
+
+    :param kwargs: The other arguments of the list method
+    :param page_size: The number of records per page, at most
+                      ``max_page_size``. The API default is used when
+                      ``None``.
+    :param next_page_token: The token of the page to fetch
+    :param max_page_size: The largest page size the endpoint accepts
+    :return: A new dict of arguments
+    :raises: :class:`ValueError` if the page size is too large
+    """
+    params = dict(kwargs)
+    if page_size:
+        page_size = int(page_size)
+        if page_size > max_page_size:
+            raise ValueError(
+                "page_size must be at most {}, got {}".format(max_page_size, page_size)
+            )
+        params["page_size"] = page_size
+    if next_page_token:
+        params["next_page_token"] = next_page_token
+    return params
+
+
+def parse_page(response, key):
+    """Decode a page of records
+
+    :param response: The response of the list method
+    :param key: The key of the records in the response, e.g. ``users``
+    :return: The :data:`Page`
+    :raises: :class:`requests.HTTPError` (or the equivalent error of the
+             transport) if the request failed
+    """
+    response.raise_for_status()
+    data = response.json()
+    return Page(
+        records=data.get(key) or [],
+        next_page_token=data.get("next_page_token") or None,
+        data=data,
+    )
+
+
+def iter_pages(
+    fetch,
+    key,
+    page_size=None,
+    next_page_token=None,
+    max_page_size=MAX_PAGE_SIZE,
+    **kwargs,
+):
+    """Lazily fetch the pages of a list endpoint
+
+    :param fetch: The component method to fetch a page with, e.g.
+                  ``client.user.list``
+    :param key: The key of the records in the response, e.g. ``users``
+    :param page_size: The number of records per page, at most
+                      ``max_page_size``
+    :param next_page_token: The token to resume from, e.g. the
+                            ``next_page_token`` of the last page that was
+                            processed
+    :param max_page_size: The largest page size the endpoint accepts
+    :param kwargs: Any other arguments for the list method
+    :return: A generator of :data:`Page` objects
+    """
+    while True:
+        page = parse_page(
+            fetch(**page_params(kwargs, page_size, next_page_token, max_page_size)),
+            key,
+        )
+        yield page
+        next_page_token = page.next_page_token
+        if not next_page_token:
+            return
+
+
+def iter_records(fetch, key, **kwargs):
+    """Lazily fetch the records of a list endpoint, page by page
+
+    Takes the same arguments as :func:`iter_pages`.
+
+    :return: A generator of records
+    """
+    for page in iter_pages(fetch, key, **kwargs):
+        for record in page.records:
+            yield record
+
+
+def prefetch_pages(
+    fetch,
+    key,
+    page_size=None,
+    next_page_token=None,
+    max_page_size=MAX_PAGE_SIZE,
+    executor=None,
+    **kwargs,
+):
+    """Like :func:`iter_pages`, but fetch the next page in the background
+    while the current one is being consumed
+
+    At most one page is fetched ahead, so memory use stays bounded by twice
+    the page size.
+
+    :param executor: The :class:`concurrent.futures.Executor` to fetch the
+                     pages with. A single worker thread is used when
+                     ``None``.
+    :return: A generator of :data:`Page` objects
+    """
+    owned = executor is None
+    if owned:
+        executor = futures.ThreadPoolExecutor(max_workers=1)
+
+    def submit(token):
+        params = page_params(kwargs, page_size, token, max_page_size)
+        return executor.submit(lambda: parse_page(fetch(**params), key))
+
+    future = submit(next_page_token)
+    try:
+        while future is not None:
+            page = future.result()
+            future = submit(page.next_page_token) if page.next_page_token else None
+            yield page
+    finally:
+        if future is not None:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=False)
+
+
+def prefetch_records(fetch, key, **kwargs):
+    """Like :func:`iter_records`, but fetch the next page in the background
+
+    Takes the same arguments as :func:`prefetch_pages`.
+
+    :return: A generator of records
+    """
+    for page in prefetch_pages(fetch, key, **kwargs):
+        for record in page.records:
+            yield record
+
+
+def page_count(page, page_size=None):
+    """The number of pages of a page-number endpoint
+
+    :param page: The first :data:`Page`
+    :param page_size: The requested page size
+    :return: The ``page_count`` the API reports, or one derived from the
+             ``total_records``. ``1`` if neither is known.
+    """
+    count = page.data.get("page_count")
+    if count:
+        return int(count)
+    total = page.data.get("total_records")
+    size = page.data.get("page_size") or page_size or len(page.records)
+    if not total or not size:
+        return 1
+    return int(math.ceil(float(total) / int(size)))
+
+
+def iter_numbered_pages(
+    fetch,
+    key,
+    page_size=None,
+    page_number=1,
+    workers=DEFAULT_WORKERS,
+    max_page_size=MAX_PAGE_SIZE,
+    executor=None,
+    **kwargs,
+):
+    """Fetch the pages of a list endpoint paginated with a ``page_number``,
+    several at a time
+
+    The first page is fetched on its own to learn the number of pages. The
+    others are then fetched concurrently, at most ``workers`` at a time, and
+    yielded in order.
+
+    :param fetch: The component method to fetch a page with, e.g.
+                  ``client.report.get_daily_report``
+    :param key: The key of the records in the response, e.g. ``dates``
+    :param page_size: The number of records per page, at most
+                      ``max_page_size``
+    :param page_number: The page to start from
+    :param workers: The maximum number of pages to fetch concurrently
+    :param max_page_size: The largest page size the endpoint accepts
+    :param executor: The :class:`concurrent.futures.Executor` to fetch the
+                     pages with. A pool of ``workers`` threads is used when
+                     ``None``.
+    :param kwargs: Any other arguments for the list method
+    :return: A generator of :data:`Page` objects
+    """
+
+    def get(number):
+        params = page_params(kwargs, page_size, max_page_size=max_page_size)
+        params["page_number"] = number
+        return parse_page(fetch(**params), key)
+
+    first = get(page_number)
+    yield first
+    numbers = iter(range(page_number + 1, page_count(first, page_size) + 1))
+    owned = executor is None
+    if owned:
+        executor = futures.ThreadPoolExecutor(max_workers=workers)
+    pending = collections.deque()
+    try:
+        for number in numbers:
+            pending.append(executor.submit(get, number))
+            if len(pending) >= workers:
+                break
+        while pending:
+            page = pending.popleft().result()
+            for number in numbers:
+                pending.append(executor.submit(get, number))
+                break
+            yield page
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=False)
+
+
+def iter_numbered_records(fetch, key, **kwargs):
+    """Like :func:`iter_records`, for endpoints paginated with a
+    ``page_number``
+
+    Takes the same arguments as :func:`iter_numbered_pages`.
+
+    :return: A generator of records
+    """
+    for page in iter_numbered_pages(fetch, key, **kwargs):
+        for record in page.records:
+            yield record
+
+
+async def aiter_pages(
+    fetch,
+    key,
+    page_size=None,
+    next_page_token=None,
+    max_page_size=MAX_PAGE_SIZE,
+    prefetch=False,
+    **kwargs,
+):
+    """Like :func:`iter_pages`, for list methods that return awaitables
+
+    :param prefetch: Whether to fetch the next page in a task while the
+                     current one is being consumed, like
+                     :func:`prefetch_pages`
+    :return: An async generator of :data:`Page` objects
+    """
+
+    async def get(token):
+        params = page_params(kwargs, page_size, token, max_page_size)
+        return parse_page(await fetch(**params), key)
+
+    if not prefetch:
+        while True:
+            page = await get(next_page_token)
+            yield page
+            next_page_token = page.next_page_token
+            if not next_page_token:
+                return
+
+    task = asyncio.ensure_future(get(next_page_token))
+    try:
+        while task is not None:
+            page = await task
+            task = None
+            if page.next_page_token:
+                task = asyncio.ensure_future(get(page.next_page_token))
+            yield page
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+async def aiter_records(fetch, key, **kwargs):
+    """Like :func:`iter_records`, for list methods that return awaitables
+
+    :return: An async generator of records
+    """
+    async for page in aiter_pages(fetch, key, **kwargs):
+        for record in page.records:
+            yield record
+
+
+async def aiter_numbered_pages(
+    fetch,
+    key,
+    page_size=None,
+    page_number=1,
+    workers=DEFAULT_WORKERS,
+    max_page_size=MAX_PAGE_SIZE,
+    **kwargs,
+):
+    """Like :func:`iter_numbered_pages`, for list methods that return
+    awaitables, with at most ``workers`` pages fetched in tasks at a time
+
+    :return: An async generator of :data:`Page` objects
+    """
+
+    async def get(number):
+        params = page_params(kwargs, page_size, max_page_size=max_page_size)
+        params["page_number"] = number
+        return parse_page(await fetch(**params), key)
+
+    first = await get(page_number)
+    yield first
+    numbers = iter(range(page_number + 1, page_count(first, page_size) + 1))
+    pending = collections.deque(
+        asyncio.ensure_future(get(number))
+        for number in itertools.islice(numbers, workers)
+    )
+    try:
+        while pending:
+            page = await pending.popleft()
+            for number in numbers:
+                pending.append(asyncio.ensure_future(get(number)))
+                break
+            yield page
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def aiter_numbered_records(fetch, key, **kwargs):
+    """Like :func:`iter_numbered_records`, for list methods that return
+    awaitables
+
+    :return: An async generator of records
+    """
+    async for page in aiter_numbered_pages(fetch, key, **kwargs):
+        for record in page.records:
+            yield record
@@ -0,0 +1,417 @@
+"""Zoom.us REST API Python Client -- Rate limiting
+
+Zoom groups its endpoints into rate limit categories, with limits depending
+on the account plan. See
+https://developers.zoom.us/docs/api/rest/rate-limits/
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import collections
+import logging
+import threading
+import time
+
+from zoomus import util
+
+logger = logging.getLogger(__name__)
+
+LIGHT = "Light"
+MEDIUM = "Medium"
+HEAVY = "Heavy"
+RESOURCE_INTENSIVE = "Resource-intensive"
+
+PLAN_PRO = "pro"
+PLAN_BUSINESS = "business"
+
+# Requests per second allowed per category, by account plan
+PLAN_LIMITS = {
+    PLAN_PRO: {
+        LIGHT: 30,
+        MEDIUM: 20,
+        HEAVY: 10,
+        RESOURCE_INTENSIVE: 10 / 60.0,
+    },
+    PLAN_BUSINESS: {
+        LIGHT: 80,
+        MEDIUM: 60,
+        HEAVY: 40,
+        RESOURCE_INTENSIVE: 20 / 60.0,
+    },
+}
+
+# The category of endpoints that are not in ROUTES
+DEFAULT_CATEGORY = MEDIUM
+
+# The rate limit category of each route template the components use. The
+# first matching route wins, so literal routes are listed before the templated
+# routes they would also match.
+ROUTES = (
+    # Users
+    ("GET", "/users", MEDIUM),
+    ("POST", "/users", LIGHT),
+    ("GET", "/users/email", LIGHT),
+    ("GET", "/users/{}", LIGHT),
+    ("PATCH", "/users/{}", LIGHT),
+    ("DELETE", "/users/{}", LIGHT),
+    ("PUT", "/users/{}/email", LIGHT),
+    ("PUT", "/users/{}/status", LIGHT),
+    ("GET", "/users/{}/settings", MEDIUM),
+    ("PATCH", "/users/{}/settings", MEDIUM),
+    ("GET", "/users/{}/meetings", MEDIUM),
+    ("POST", "/users/{}/meetings", MEDIUM),
+    ("GET", "/users/{}/webinars", MEDIUM),
+    ("POST", "/users/{}/webinars", LIGHT),
+    ("GET", "/users/{}/recordings", MEDIUM),
+    # Meetings
+    ("GET", "/meetings/{}", LIGHT),
+    ("PATCH", "/meetings/{}", LIGHT),
+    ("DELETE", "/meetings/{}", LIGHT),
+    ("PUT", "/meetings/{}/status", LIGHT),
+    ("PATCH", "/meetings/{}/livestream", LIGHT),
+    ("PATCH", "/meetings/{}/livestream/status", LIGHT),
+    ("GET", "/meetings/{}/registrants", MEDIUM),
+    ("POST", "/meetings/{}/registrants", LIGHT),
+    ("PUT", "/meetings/{}/registrants/status", MEDIUM),
+    ("GET", "/meetings/{}/recordings", LIGHT),
+    ("DELETE", "/meetings/{}/recordings", LIGHT),
+    ("DELETE", "/meetings/{}/recordings/{}", LIGHT),
+    ("GET", "/past_meetings/{}", LIGHT),
+    ("GET", "/past_meetings/{}/instances", MEDIUM),
+    ("GET", "/past_meetings/{}/participants", MEDIUM),
+    # Webinars
+    ("GET", "/webinars/{}", LIGHT),
+    ("PATCH", "/webinars/{}", LIGHT),
+    ("DELETE", "/webinars/{}", LIGHT),
+    ("PUT", "/webinars/{}/status", LIGHT),
+    ("GET", "/webinars/{}/panelists", MEDIUM),
+    ("POST", "/webinars/{}/panelists", MEDIUM),
+    ("DELETE", "/webinars/{}/panelists", LIGHT),
+    ("GET", "/webinars/{}/registrants", MEDIUM),
+    ("POST", "/webinars/{}/registrants", LIGHT),
+    ("GET", "/past_webinars/{}/absentees", MEDIUM),
+    # Dashboards
+    ("GET", "/metrics/meetings", RESOURCE_INTENSIVE),
+    ("GET", "/metrics/meetings/{}", HEAVY),
+    ("GET", "/metrics/meetings/{}/participants", HEAVY),
+    ("GET", "/metrics/meetings/{}/participants/qos", HEAVY),
+    ("GET", "/metrics/meetings/{}/participants/{}/qos", LIGHT),
+    # Reports
+    ("GET", "/report/daily", HEAVY),
+    ("GET", "/report/users", HEAVY),
+    ("GET", "/report/users/{}/meetings", HEAVY),
+    ("GET", "/report/meetings/{}/participants", HEAVY),
+    ("GET", "/report/webinars/{}/participants", HEAVY),
+    # Phone
+    ("GET", "/phone/call_logs", HEAVY),
+    ("GET", "/phone/calling_plans", LIGHT),
+    ("GET", "/phone/numbers", MEDIUM),
+    ("GET", "/phone/numbers/{}", LIGHT),
+    ("GET", "/phone/users", MEDIUM),
+    # Groups
+    ("GET", "/groups", MEDIUM),
+    ("POST", "/groups", MEDIUM),
+    ("GET", "/groups/{}", LIGHT),
+    ("DELETE", "/groups/{}", LIGHT),
+    ("GET", "/groups/{}/members", MEDIUM),
+    ("POST", "/groups/{}/members", MEDIUM),
+    ("DELETE", "/groups/{}/members/{}", LIGHT),
+    # Rooms
+    ("GET", "/rooms", MEDIUM),
+    ("POST", "/rooms", LIGHT),
+    ("GET", "/rooms/{}", LIGHT),
+    ("PATCH", "/rooms/{}", LIGHT),
+    ("DELETE", "/rooms/{}", LIGHT),
+    ("GET", "/rooms/{}/devices", MEDIUM),
+    ("GET", "/rooms/{}/settings", MEDIUM),
+    ("PATCH", "/rooms/{}/events", MEDIUM),
+    # Contacts
+    ("GET", "/contacts", MEDIUM),
+    ("GET", "/chat/users/me/contacts", MEDIUM),
+    ("GET", "/chat/users/me/contacts/{}", LIGHT),
+    # Zoom Events
+    ("GET", "/zoom_events/events", MEDIUM),
+    ("POST", "/zoom_events/events", LIGHT),
+    ("GET", "/zoom_events/hubs", MEDIUM),
+    ("GET", "/zoom_events/events/{}", LIGHT),
+    ("PATCH", "/zoom_events/events/{}", LIGHT),
+    ("DELETE", "/zoom_events/events/{}", LIGHT),
+    ("GET", "/zoom_events/events/{}/reports/event_attendance", HEAVY),
+    ("GET", "/zoom_events/events/{}/reports/ticket_registration", HEAVY),
+    ("GET", "/zoom_events/events/{}/registrants", MEDIUM),
+    ("GET", "/zoom_events/events/{}/sessions", MEDIUM),
+    ("POST", "/zoom_events/events/{}/sessions", LIGHT),
+    ("GET", "/zoom_events/events/{}/sessions/{}", LIGHT),
+    ("PATCH", "/zoom_events/events/{}/sessions/{}", LIGHT),
+    ("DELETE", "/zoom_events/events/{}/sessions/{}", LIGHT),
+    ("GET", "/zoom_events/events/{}/sessions/{}/attendees", MEDIUM),
+    ("GET", "/zoom_events/events/{}/sessions/{}/join_token", LIGHT),
+    ("GET", "/zoom_events/events/{}/speakers", MEDIUM),
+    ("POST", "/zoom_events/events/{}/speakers", LIGHT),
+    ("GET", "/zoom_events/events/{}/speakers/{}", LIGHT),
+    ("PATCH", "/zoom_events/events/{}/speakers/{}", LIGHT),
+    ("DELETE", "/zoom_events/events/{}/speakers/{}", LIGHT),
+    ("GET", "/zoom_events/events/{}/ticket_types", MEDIUM),
+    ("POST", "/zoom_events/events/{}/ticket_types", LIGHT),
+    ("PATCH", "/zoom_events/events/{}/ticket_types/{}", LIGHT),
+    ("DELETE", "/zoom_events/events/{}/ticket_types/{}", LIGHT),
+    ("GET", "/zoom_events/events/{}/tickets", MEDIUM),
+    ("POST", "/zoom_events/events/{}/tickets", LIGHT),
+    ("GET", "/zoom_events/events/{}/tickets/{}", LIGHT),
+    ("DELETE", "/zoom_events/events/{}/tickets/{}", LIGHT),
+)
+
+
+def _split(endpoint):
+    return tuple(endpoint.strip("/").split("/"))
+
+
+class RouteTable(object):
+    """Finds the route template and rate limit category of an endpoint"""
+
+    def __init__(self, routes=ROUTES):
+        """Setup a new route table
+
+        :param routes: An iterable of ``(method, template, category)`` tuples,
+                       where ``{}`` in a template matches any single path
+                       segment
+        """
+        self._routes = {}
+        for method, template, category in routes:
+            segments = _split(template)
+            self._routes.setdefault((method, len(segments)), []).append(
+                (segments, template, category)
+            )
+
+    def match(self, method, endpoint):
+        """Match an endpoint to its route
+
+        :param method: The HTTP method
+        :param endpoint: The endpoint, e.g. ``/users/abc/recordings``
+        :return: A ``(template, category)`` tuple. The template is ``None``
+                 for unknown endpoints, which get the
+                 :data:`DEFAULT_CATEGORY`.
+        """
+        segments = _split(endpoint)
+        for route, template, category in self._routes.get(
+            (method.upper(), len(segments)), ()
+        ):
+            for expected, actual in zip(route, segments):
+                if expected != "{}" and expected != actual:
+                    break
+            else:
+                return template, category
+        return None, DEFAULT_CATEGORY
+
+
+class TokenBucket(object):
+    """A thread safe token bucket
+
+    Callers that find the bucket empty reserve the next token and sleep until
+    it is due, so that waiting callers are spaced out evenly.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        """Setup a new token bucket
+
+        :param rate: The number of tokens added per second
+        :param capacity: The maximum number of tokens, i.e. the largest burst.
+                         Defaults to one second worth of tokens.
+        :param clock: The monotonic clock to use
+        :param sleep: The function to sleep with
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(rate, 1))
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token without waiting for it
+
+        :return: The number of seconds until the token is due
+        """
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0
+
+    def acquire(self):
+        """Take a token, waiting for it if needed
+
+        :return: The number of seconds waited
+        """
+        wait = self.reserve()
+        if wait:
+            self.sleep(wait)
+        return wait
+
+
+class RateLimiter(object):
+    """Paces requests to stay under Zoom's per category rate limits
+
+    Every category has its own :class:`TokenBucket`, filled at ``headroom``
+    times the plan's limit. Note that Zoom also limits Heavy and
+    Resource-intensive requests per day, which is not enforced here.
+    """
+
+    def __init__(self, plan=PLAN_PRO, headroom=0.9, limits=None, routes=ROUTES):
+        """Setup a new rate limiter
+
+        :param plan: The account plan, either :data:`PLAN_PRO` or
+                     :data:`PLAN_BUSINESS` (also used for Business+ and
+                     Enterprise accounts)
+        :param headroom: The fraction of the limit to pace requests at
+        :param limits: An optional dict of requests per second by category,
+                       overriding those of the plan
+        :param routes: The routes to categorize endpoints with
+        """
+        try:
+            rates = dict(PLAN_LIMITS[plan])
+        except KeyError:
+            raise ValueError("Unknown plan: {}".format(plan))
+        rates.update(limits or {})
+        self.routes = RouteTable(routes)
+        self.buckets = {
+            category: TokenBucket(rate * headroom) for category, rate in rates.items()
+        }
+
+    def category_for(self, method, endpoint):
+        """The rate limit category of an endpoint"""
+        return self.routes.match(method, endpoint)[1]
+
+    def reserve(self, method, endpoint):
+        """Reserve a request to the endpoint without waiting for it, e.g. to
+        wait with :func:`asyncio.sleep` instead
+
+        :param method: The HTTP method
+        :param endpoint: The endpoint
+        :return: The number of seconds to wait before sending the request
+        """
+        return self.buckets[self.category_for(method, endpoint)].reserve()
+
+    def acquire(self, method, endpoint):
+        """Wait until a request to the endpoint can be sent
+
+        :param method: The HTTP method
+        :param endpoint: The endpoint
+        :return: The number of seconds waited
+        """
+        return self.buckets[self.category_for(method, endpoint)].acquire()
+
+
+# The last rate limit headers seen for a category or endpoint template
+RateLimitStatus = collections.namedtuple(
+    "RateLimitStatus", ["category", "type", "limit", "remaining", "updated_at"]
+)
+
+
+def _int_header(headers, name):
+    with util.ignored(TypeError, ValueError):
+        return int(headers.get(name))
+    return None
+
+
+class RateLimitTracker(object):
+    """Keeps the remaining quota reported by the ``X-RateLimit-*`` headers
+
+    The status is kept per rate limit category and per endpoint template, and
+    is updated from every response. Endpoints that match no route are only
+    counted in their category, so that raw paths do not pile up. Listeners
+    are called with the method, the endpoint template and the new
+    :class:`RateLimitStatus`; an exception raised by a listener is logged,
+    and never fails the request.
+    """
+
+    def __init__(self, routes=ROUTES, clock=time.time):
+        """Setup a new rate limit tracker
+
+        :param routes: The routes to find endpoint templates with
+        :param clock: The clock to timestamp updates with
+        """
+        self.routes = RouteTable(routes)
+        self.clock = clock
+        self.listeners = []
+        self._categories = {}
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener):
+        """Add a callable to call with every update
+
+        :param listener: A callable taking ``(method, template, status)``
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Remove a listener added with :meth:`add_listener`"""
+        self.listeners.remove(listener)
+
+    def record(self, method, endpoint, response):
+        """Update the quota from the headers of a response
+
+        :param method: The HTTP method of the request
+        :param endpoint: The endpoint of the request
+        :param response: The :class:`requests.Response`
+        :return: The new :class:`RateLimitStatus`, or ``None`` if the response
+                 had no rate limit headers
+        """
+        headers = response.headers
+        limit = _int_header(headers, "X-RateLimit-Limit")
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+        if limit is None and remaining is None:
+            return None
+        template, category = self.routes.match(method, endpoint)
+        status = RateLimitStatus(
+            category=headers.get("X-RateLimit-Category") or category,
+            type=headers.get("X-RateLimit-Type"),
+            limit=limit,
+            remaining=remaining,
+            updated_at=self.clock(),
+        )
+        method = method.upper()
+        with self._lock:
+            self._categories[status.category] = status
+            if template is not None:
+                self._templates[(method, template)] = status
+        for listener in list(self.listeners):
+            try:
+                listener(method, template or endpoint, status)
+            except Exception:
+                logger.exception("Rate limit listener %r failed", listener)
+        return status
+
+    def category(self, category):
+        """The last status seen for a rate limit category, or ``None``"""
+        return self._categories.get(category)
+
+    def endpoint(self, method, template):
+        """The last status seen for an endpoint template, or ``None``
+
+        :param method: The HTTP method
+        :param template: The endpoint template, e.g. ``/users/{}``
+        """
+        return self._templates.get((method.upper(), template))
+
+    def remaining(self, category):
+        """The remaining quota of a category, or ``None`` if unknown"""
+        status = self.category(category)
+        return status.remaining if status is not None else None
+
+    def snapshot(self):
+        """A copy of all statuses
+
+        :return: A dict with a ``categories`` dict keyed by category and an
+                 ``endpoints`` dict keyed by ``(method, template)``
+        """
+        with self._lock:
+            return {
+                "categories": dict(self._categories),
+                "endpoints": dict(self._templates),
+            }
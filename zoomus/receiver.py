@@ -0,0 +1,319 @@
+"""Zoom.us REST API Python Client -- Webhook receivers
+
+Ready-made WSGI and ASGI applications that receive webhook requests. They
+validate the raw request body, answer URL validation requests, and
+acknowledge events as soon as they are queued, so that slow handlers never
+make Zoom retry a delivery.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+import json
+import queue
+import threading
+from http import HTTPStatus
+
+from zoomus import webhooks
+
+# The largest request body accepted, in bytes
+MAX_BODY_SIZE = 1024 * 1024
+
+# The default number of events waiting to be handled
+DEFAULT_MAX_PENDING = 1000
+
+# Tells the workers that no more events will come
+_DONE = object()
+
+
+class WebhookReceiver(object):
+    """Validates webhook requests, independently of a web framework"""
+
+    def __init__(
+        self, secret, delta_mins=20, max_body_size=MAX_BODY_SIZE, on_error=None
+    ):
+        """Setup a new receiver
+
+        :param secret: The secret token of the webhook, or a
+                       :class:`zoomus.webhooks.WebhookVerifier`
+        :param delta_mins: The maximum age of a request, in minutes
+        :param max_body_size: The largest request body accepted, in bytes
+        :param on_error: An optional callable that is called with the event
+                         and the exception when a handler fails
+        """
+        if isinstance(secret, webhooks.WebhookVerifier):
+            self.verifier = secret
+        else:
+            self.verifier = webhooks.verifier_for(secret)
+        self.delta_mins = delta_mins
+        self.max_body_size = max_body_size
+        self.on_error = on_error
+
+    def respond(self, headers, body):
+        """Validate a webhook request
+
+        :param headers: The ``x-zm-signature`` and ``x-zm-request-timestamp``
+                        headers, as a dict
+        :param body: The raw request body
+        :return: A ``(status, response body, event)`` tuple. The event is the
+                 parsed body of a valid request to handle, or ``None``.
+        """
+        if len(body) > self.max_body_size:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, b"", None
+        try:
+            valid, status, response = self.verifier.check(
+                {"headers": headers, "body": body}, delta_mins=self.delta_mins
+            )
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, b"", None
+        if valid is None:
+            # A URL validation request, or an event that was already delivered
+            content = json.dumps(response).encode("utf-8") if response else b""
+            return HTTPStatus(status), content, None
+        if not valid:
+            return HTTPStatus.UNAUTHORIZED, b"", None
+        try:
+            event = json.loads(bytes(body))
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, b"", None
+        return HTTPStatus.OK, b"", event
+
+    def forget(self, headers, event):
+        """Forget a valid event that could not be queued
+
+        The event was recorded in the replay index of the verifier when it
+        was validated, and would otherwise be taken for a replay when Zoom
+        delivers it again.
+
+        :param headers: The headers of the request, as for :meth:`respond`
+        :param event: The event returned by :meth:`respond`
+        """
+        if self.verifier.replays is not None:
+            signature = headers.get(webhooks.SIGNATURE_HEADER)
+            self.verifier.replays.discard(webhooks.replay_key(event, signature))
+
+    def _failed(self, event, error):
+        if self.on_error is not None:
+            self.on_error(event, error)
+
+
+class WSGIReceiver(WebhookReceiver):
+    """A WSGI application receiving webhook events
+
+    Valid events are put on a bounded queue, which the request does not wait
+    for. When the queue is full, the request is answered with a 503 so that
+    Zoom delivers the event again later.
+
+    With a handler, worker threads take the events off the queue and call
+    the handler with every one. Without one, the events are left on
+    :attr:`events` for the application to consume.
+    """
+
+    def __init__(
+        self,
+        secret,
+        handler=None,
+        events=None,
+        workers=4,
+        max_pending=DEFAULT_MAX_PENDING,
+        **kwargs,
+    ):
+        """Setup a new WSGI receiver
+
+        Takes the same arguments as :class:`WebhookReceiver`, and:
+
+        :param handler: An optional callable that is called with every event
+        :param events: The :class:`queue.Queue` to put the events on. A new
+                       one of ``max_pending`` events when ``None``.
+        :param workers: The number of threads calling the handler
+        :param max_pending: The number of events waiting to be handled
+        """
+        super(WSGIReceiver, self).__init__(secret, **kwargs)
+        self.handler = handler
+        self.events = events if events is not None else queue.Queue(max_pending)
+        self.workers = workers
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        if environ.get("REQUEST_METHOD") != "POST":
+            return self._send(start_response, HTTPStatus.METHOD_NOT_ALLOWED, b"")
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            return self._send(start_response, HTTPStatus.BAD_REQUEST, b"")
+        if length > self.max_body_size:
+            return self._send(start_response, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, b"")
+        headers = {
+            webhooks.SIGNATURE_HEADER: environ.get("HTTP_X_ZM_SIGNATURE"),
+            webhooks.TIMESTAMP_HEADER: environ.get("HTTP_X_ZM_REQUEST_TIMESTAMP"),
+        }
+        body = environ["wsgi.input"].read(length)
+        status, content, event = self.respond(headers, body)
+        if event is not None and not self.deliver(event):
+            self.forget(headers, event)
+            status = HTTPStatus.SERVICE_UNAVAILABLE
+        return self._send(start_response, status, content)
+
+    def deliver(self, event):
+        """Queue an event without waiting
+
+        :return: Whether the event was queued
+        """
+        if self.handler is not None and not self._threads:
+            self._start()
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            return False
+        return True
+
+    def close(self):
+        """Handle the queued events and stop the workers"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self.events.put(_DONE)
+        for thread in threads:
+            thread.join()
+
+    def _start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for _ in range(self.workers):
+                thread = threading.Thread(target=self._work, name="zoomus-webhooks")
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            event = self.events.get()
+            if event is _DONE:
+                return
+            try:
+                self.handler(event)
+            except Exception as error:
+                self._failed(event, error)
+
+    @staticmethod
+    def _send(start_response, status, content):
+        headers = [("Content-Length", str(len(content)))]
+        if content:
+            headers.append(("Content-Type", "application/json"))
+        start_response("{} {}".format(status.value, status.phrase), headers)
+        return [content]
+
+
+class ASGIReceiver(WebhookReceiver):
+    """An ASGI application receiving webhook events
+
+    Like :class:`WSGIReceiver`, with an :class:`asyncio.Queue` and worker
+    tasks. A handler that is a coroutine function is awaited, any other
+    handler is called in the default executor.
+    """
+
+    def __init__(
+        self, secret, handler=None, workers=4, max_pending=DEFAULT_MAX_PENDING, **kwargs
+    ):
+        """Setup a new ASGI receiver
+
+        Takes the same arguments as :class:`WebhookReceiver`, and:
+
+        :param handler: An optional callable that is called with every event
+        :param workers: The number of tasks calling the handler
+        :param max_pending: The number of events waiting to be handled
+        """
+        super(ASGIReceiver, self).__init__(secret, **kwargs)
+        self.handler = handler
+        self.workers = workers
+        self.max_pending = max_pending
+        self.events = None
+        self._tasks = []
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+        if scope.get("method") != "POST":
+            return await self._send(send, HTTPStatus.METHOD_NOT_ALLOWED, b"")
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if len(body) > self.max_body_size:
+                return await self._send(send, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, b"")
+        headers = {}
+        for name, value in scope.get("headers", []):
+            name = name.decode("latin-1").lower()
+            if name in (webhooks.SIGNATURE_HEADER, webhooks.TIMESTAMP_HEADER):
+                headers[name] = value.decode("latin-1")
+        status, content, event = self.respond(headers, body)
+        if event is not None and not self.deliver(event):
+            self.forget(headers, event)
+            status = HTTPStatus.SERVICE_UNAVAILABLE
+        await self._send(send, status, content)
+
+    def deliver(self, event):
+        """Queue an event without waiting, in the event loop
+
+        :return: Whether the event was queued
+        """
+        if self.events is None:
+            self.events = asyncio.Queue(self.max_pending)
+        if self.handler is not None and not self._tasks:
+            self._tasks = [
+                asyncio.ensure_future(self._work()) for _ in range(self.workers)
+            ]
+        try:
+            self.events.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def close(self):
+        """Handle the queued events and stop the workers"""
+        tasks, self._tasks = self._tasks, []
+        if tasks:
+            await self.events.join()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _work(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            event = await self.events.get()
+            try:
+                if asyncio.iscoroutinefunction(self.handler):
+                    await self.handler(event)
+                else:
+                    await loop.run_in_executor(None, self.handler, event)
+            except Exception as error:
+                self._failed(event, error)
+            finally:
+                self.events.task_done()
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _send(send, status, content):
+        headers = [(b"content-length", str(len(content)).encode("latin-1"))]
+        if content:
+            headers.append((b"content-type", b"application/json"))
+        await send(
+            {"type": "http.response.start", "status": status.value, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": content})
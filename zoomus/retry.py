@@ -0,0 +1,172 @@
+"""Zoom.us REST API Python Client -- Retrying failed requests"""
+
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+import email.utils
+import random
+import time
+
+import requests
+
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+WRITE_METHODS = frozenset(["POST", "PATCH"])
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+
+class RetryPolicy(object):
+    """Retries requests that failed with a transient error
+
+    Requests are retried with exponential backoff and full jitter. When the
+    API says how long to wait, through the ``Retry-After`` header, that is
+    used instead. A 429 for an exhausted daily limit without a
+    ``Retry-After`` is not retried, as it will not succeed before the next
+    day.
+    """
+
+    def __init__(
+        self,
+        retries=3,
+        backoff_factor=0.5,
+        max_backoff=60,
+        total_timeout=300,
+        statuses=RETRY_STATUSES,
+        retry_writes=False,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        """Setup a new retry policy
+
+        :param retries: The maximum number of times to retry a request
+        :param backoff_factor: The base number of seconds to back off. The
+                               n-th retry waits a random time of up to
+                               ``backoff_factor * 2 ** (n - 1)`` seconds.
+        :param max_backoff: The maximum number of seconds to wait between two
+                            attempts
+        :param total_timeout: The maximum number of seconds to spend on all
+                              attempts of a request. No retry is made that
+                              would wait past it.
+        :param statuses: The response status codes to retry
+        :param retry_writes: Whether to also retry POST and PATCH requests,
+                             which may not be idempotent
+        :param clock: The monotonic clock to use
+        :param sleep: The function to sleep with
+        """
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.total_timeout = total_timeout
+        self.statuses = frozenset(statuses)
+        self.methods = IDEMPOTENT_METHODS | (WRITE_METHODS if retry_writes else set())
+        self.clock = clock
+        self.sleep = sleep
+
+    def call(self, method, send):
+        """Send a request, retrying it as allowed by the policy
+
+        :param method: The HTTP method of the request
+        :param send: A callable that sends the request and returns the
+                     :class:`requests.Response`
+        :return: The last :class:`requests.Response`
+        :raises: The exception of the last attempt, if it failed with one
+        """
+        started = self.clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = send()
+            except RETRY_EXCEPTIONS:
+                delay = self._delay(method, started, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._delay(method, started, attempt, response)
+                if delay is None:
+                    return response
+            self.sleep(delay)
+
+    async def acall(self, method, send, exceptions=RETRY_EXCEPTIONS):
+        """Send a request with an async transport, retrying it as allowed by
+        the policy
+
+        :param method: The HTTP method of the request
+        :param send: A callable returning an awaitable of the response
+        :param exceptions: The transport exceptions to retry
+        :return: The last response
+        :raises: The exception of the last attempt, if it failed with one
+        """
+        started = self.clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await send()
+            except exceptions:
+                delay = self._delay(method, started, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._delay(method, started, attempt, response)
+                if delay is None:
+                    return response
+            await asyncio.sleep(delay)
+
+    def backoff(self, attempt):
+        """The jittered number of seconds to wait after a failed attempt"""
+        ceiling = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def delay_for(self, response, attempt):
+        """The number of seconds to wait before retrying a response
+
+        :return: The delay, or ``None`` if the request should not be retried
+        """
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return retry_after
+        headers = response.headers
+        exhausted = headers.get("X-RateLimit-Remaining") == "0"
+        daily = "daily" in headers.get("X-RateLimit-Type", "").lower()
+        if response.status_code == 429 and exhausted and daily:
+            return None
+        return self.backoff(attempt)
+
+    def _delay(self, method, started, attempt, response=None):
+        """The number of seconds to wait before the next attempt, or ``None``
+        if the request should not be retried. Without a response the attempt
+        failed with an exception."""
+        if method.upper() not in self.methods or attempt > self.retries:
+            return None
+        if response is None:
+            delay = self.backoff(attempt)
+        elif response.status_code in self.statuses:
+            delay = self.delay_for(response, attempt)
+        else:
+            return None
+        if delay is None or self.clock() - started + delay > self.total_timeout:
+            return None
+        return delay
+
+
+def parse_retry_after(value):
+    """Parse a ``Retry-After`` header
+
+    :param value: The header value, either a number of seconds or an HTTP date
+    :return: The number of seconds to wait, or ``None`` if it is missing or
+             invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(retry_at.timestamp() - time.time(), 0)
@@ -0,0 +1,293 @@
+"""Zoom.us REST API Python Client -- Webhook event routing
+
+Routes webhook events to the handlers registered for their event name, e.g.
+``meeting.started``, or for a glob pattern of names, e.g. ``recording.*``.
+The handlers of every event name are looked up once and kept in a dispatch
+table, so routing an event is a single dict lookup.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+import fnmatch
+import threading
+import time
+from concurrent import futures
+
+# The default number of threads of :meth:`EventRouter.submit`
+DEFAULT_WORKERS = 8
+
+
+class Route(object):
+    """A handler for the events matching a pattern, with its latency
+    metrics"""
+
+    def __init__(self, pattern, handler, concurrency=None):
+        """Setup a new route
+
+        :param pattern: The event name, or a glob pattern of event names
+        :param handler: The callable to call with every event. Coroutine
+                        functions are awaited by
+                        :meth:`EventRouter.dispatch_async`.
+        :param concurrency: The maximum number of events handled at once,
+                            unlimited when ``None``
+        """
+        self.pattern = pattern
+        self.handler = handler
+        self.concurrency = concurrency
+        self.is_glob = any(char in pattern for char in "*?[")
+        self.count = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self._lock = threading.Lock()
+        self._semaphore = None
+        self._async_semaphore = None
+        if concurrency is not None:
+            self._semaphore = threading.BoundedSemaphore(concurrency)
+
+    def matches(self, name):
+        """Whether an event name matches the pattern"""
+        if self.is_glob:
+            return fnmatch.fnmatchcase(name, self.pattern)
+        return name == self.pattern
+
+    def call(self, event):
+        """Call the handler with an event, within the concurrency limit"""
+        if self._semaphore is None:
+            return self._timed(event)
+        with self._semaphore:
+            return self._timed(event)
+
+    async def call_async(self, event):
+        """Like :meth:`call`, in an event loop. Handlers that are not
+        coroutine functions are called in the default executor."""
+        if self.concurrency is not None and self._async_semaphore is None:
+            self._async_semaphore = asyncio.Semaphore(self.concurrency)
+        if self._async_semaphore is None:
+            return await self._timed_async(event)
+        async with self._async_semaphore:
+            return await self._timed_async(event)
+
+    def metrics(self):
+        """The latency metrics of the route, in seconds"""
+        with self._lock:
+            return {
+                "count": self.count,
+                "errors": self.errors,
+                "total_time": self.total_time,
+                "mean_time": self.total_time / self.count if self.count else 0.0,
+                "max_time": self.max_time,
+            }
+
+    def _timed(self, event):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = self.handler(event)
+            failed = False
+            return result
+        finally:
+            self._record(time.perf_counter() - started, failed)
+
+    async def _timed_async(self, event):
+        started = time.perf_counter()
+        failed = True
+        try:
+            if asyncio.iscoroutinefunction(self.handler):
+                result = await self.handler(event)
+            else:
+                loop = asyncio.get_event_loop()
+                result = await loop.run_in_executor(None, self.handler, event)
+            failed = False
+            return result
+        finally:
+            self._record(time.perf_counter() - started, failed)
+
+    def _record(self, elapsed, failed):
+        with self._lock:
+            self.count += 1
+            self.errors += failed
+            self.total_time += elapsed
+            self.max_time = max(self.max_time, elapsed)
+
+
+class EventRouter(object):
+    """Routes webhook events to their handlers
+
+    An event is handled by every route that matches its name, in the order
+    the routes were added. :meth:`dispatch` fits the ``handler`` of
+    :class:`zoomus.receiver.WSGIReceiver`, and :meth:`dispatch_async` the one
+    of :class:`zoomus.receiver.ASGIReceiver`, whose workers then are the
+    pool the events are handled in.
+    """
+
+    def __init__(self, default=None, workers=DEFAULT_WORKERS):
+        """Setup a new router
+
+        :param default: An optional callable that is called with the events
+                        no route matches
+        :param workers: The number of threads of :meth:`submit`
+        """
+        self.default = default
+        self.workers = workers
+        self.unhandled = 0
+        self._routes = []
+        self._table = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def route(self, pattern, concurrency=None):
+        """A decorator adding a route for a function, see :meth:`add_route`
+
+        ::
+
+            @router.route("recording.*", concurrency=2)
+            def archive(event):
+                ...
+        """
+
+        def decorator(handler):
+            self.add_route(pattern, handler, concurrency)
+            return handler
+
+        return decorator
+
+    def add_route(self, pattern, handler, concurrency=None):
+        """Add a route
+
+        :param pattern: The event name, or a glob pattern of event names
+        :param handler: The callable to call with every event
+        :param concurrency: The maximum number of events the handler handles
+                            at once, unlimited when ``None``
+        :return: The :class:`Route`
+        """
+        route = Route(pattern, handler, concurrency)
+        with self._lock:
+            self._routes.append(route)
+            self._table = {}
+        return route
+
+    def compile(self, names=()):
+        """Build the dispatch table of the event names routes were added for
+
+        Names that only match glob patterns are added to the table the first
+        time an event of that name is routed.
+
+        :param names: Other event names to add to the table
+        """
+        exact = [route.pattern for route in self._routes if not route.is_glob]
+        table = {}
+        for name in list(exact) + list(names):
+            table[name] = self._match(name)
+        self._table = table
+
+    def handlers(self, name):
+        """The routes matching an event name
+
+        :return: A tuple of :class:`Route`
+        """
+        try:
+            return self._table[name]
+        except KeyError:
+            routes = self._table[name] = self._match(name)
+            return routes
+
+    def dispatch(self, event):
+        """Handle an event in the calling thread
+
+        Every matching handler is called, even when one fails; the first
+        error is raised once they all ran.
+
+        :param event: The parsed webhook body
+        :return: The list of the results of the handlers
+        """
+        routes = self.handlers(event.get("event"))
+        if not routes:
+            return self._unhandled(event)
+        results = []
+        error = None
+        for route in routes:
+            try:
+                results.append(route.call(event))
+            except Exception as exc:
+                error = error or exc
+        if error is not None:
+            raise error
+        return results
+
+    async def dispatch_async(self, event):
+        """Handle an event in the event loop, with every matching handler
+        running concurrently
+
+        :return: The list of the results of the handlers
+        """
+        routes = self.handlers(event.get("event"))
+        if not routes:
+            results = self._unhandled(event)
+            if results and asyncio.iscoroutine(results[0]):
+                results = [await results[0]]
+            return results
+        results = await asyncio.gather(
+            *[route.call_async(event) for route in routes], return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def submit(self, event):
+        """Handle an event in a pool of ``workers`` threads
+
+        :return: A list of :class:`concurrent.futures.Future`, one per
+                 matching handler
+        """
+        routes = self.handlers(event.get("event"))
+        if not routes:
+            self._unhandled(event)
+            return []
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = futures.ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="zoomus-router",
+                    )
+        return [self._executor.submit(route.call, event) for route in routes]
+
+    def close(self):
+        """Wait for the submitted events and stop the threads"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def metrics(self):
+        """The latency metrics of every route
+
+        :return: A dict of the metrics of :meth:`Route.metrics` by pattern
+        """
+        metrics = {}
+        for route in self._routes:
+            route_metrics = route.metrics()
+            if route.pattern in metrics:
+                # Sum up the routes of the same pattern
+                totals = metrics[route.pattern]
+                for key in ("count", "errors", "total_time"):
+                    totals[key] += route_metrics[key]
+                totals["max_time"] = max(totals["max_time"], route_metrics["max_time"])
+                totals["mean_time"] = (
+                    totals["total_time"] / totals["count"] if totals["count"] else 0.0
+                )
+            else:
+                metrics[route.pattern] = route_metrics
+        return metrics
+
+    def _match(self, name):
+        return tuple(route for route in self._routes if route.matches(name or ""))
+
+    def _unhandled(self, event):
+        with self._lock:
+            self.unhandled += 1
+        if self.default is not None:
+            return [self.default(event)]
+        return []
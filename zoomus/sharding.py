@@ -0,0 +1,274 @@
+"""Zoom.us REST API Python Client -- Date range sharding
+
+Report and recording queries only accept a range of about a month per call.
+These helpers split longer ranges into windows the API accepts, fetch the
+windows concurrently and merge their records into a single stream.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+import collections
+import datetime
+import itertools
+from concurrent import futures
+
+from zoomus import pagination
+
+# The longest range, in days, that report and recording queries accept
+DEFAULT_WINDOW_DAYS = 30
+
+# The number of windows fetched concurrently
+DEFAULT_WORKERS = 4
+
+
+def to_date(value):
+    """The day of a :class:`datetime.date` or :class:`datetime.datetime`"""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    return value
+
+
+def split_range(start, end, days=DEFAULT_WINDOW_DAYS):
+    """Split a range of days into windows of at most ``days`` days
+
+    The windows are contiguous and do not overlap. Both ends of each window
+    are inclusive, as they are for the API.
+
+    :param start: The first day of the range
+    :param end: The last day of the range
+    :param days: The maximum number of days per window
+    :return: A list of ``(start, end)`` tuples of :class:`datetime.date`
+    """
+    start, end = to_date(start), to_date(end)
+    if end < start:
+        raise ValueError("The end of the range is before its start")
+    if days < 1:
+        raise ValueError("Windows must be at least one day long")
+    windows = []
+    while start <= end:
+        window_end = min(start + datetime.timedelta(days=days - 1), end)
+        windows.append((start, window_end))
+        start = window_end + datetime.timedelta(days=1)
+    return windows
+
+
+def record_id(record):
+    """The default de-duplication key: the ``uuid`` or ``id`` of a record"""
+    return record.get("uuid") or record.get("id")
+
+
+def unique(records, record_key):
+    """Drop the records whose key was already seen
+
+    :param records: An iterable of records
+    :param record_key: A callable returning the key of a record, or ``None``
+                       to keep all records. Records with a ``None`` key are
+                       always kept.
+    :return: A generator of records
+    """
+    seen = set()
+    for record in records:
+        key = record_key(record) if record_key is not None else None
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        yield record
+
+
+def window_params(kwargs, start_arg, end_arg, window):
+    """The arguments to fetch a window with"""
+    params = dict(kwargs)
+    params[start_arg], params[end_arg] = window
+    return params
+
+
+def iter_windows(
+    fetch,
+    key,
+    start,
+    end,
+    start_arg="start_time",
+    end_arg="end_time",
+    days=DEFAULT_WINDOW_DAYS,
+    workers=DEFAULT_WORKERS,
+    executor=None,
+    **kwargs,
+):
+    """Fetch the pages of every window of a range, several windows at a
+    time
+
+    The first page of up to ``workers`` windows is fetched ahead, and the
+    next page of the window being consumed is fetched while its current page
+    is, so at most ``workers + 1`` pages are held at a time. The windows are
+    yielded in chronological order. The requests go through the component,
+    so they are paced by its rate limiter.
+
+    :param fetch: The component method to fetch a page with, e.g.
+                  ``client.report.get_user_report``
+    :param key: The key of the records in the response, e.g. ``meetings``
+    :param start: The first day of the range
+    :param end: The last day of the range
+    :param start_arg: The name of the argument for the start of a window
+    :param end_arg: The name of the argument for the end of a window
+    :param days: The maximum number of days per window
+    :param workers: The maximum number of windows to fetch concurrently
+    :param executor: The :class:`concurrent.futures.Executor` to fetch the
+                     windows with. A pool of ``workers`` threads is used when
+                     ``None``.
+    :param kwargs: The paging arguments of
+                   :func:`zoomus.pagination.iter_pages` and any other
+                   arguments for the list method
+    :return: A generator of ``((start, end), page)`` tuples, one per
+             :data:`zoomus.pagination.Page`
+    """
+    windows = iter(split_range(start, end, days))
+    owned = executor is None
+    if owned:
+        executor = futures.ThreadPoolExecutor(max_workers=workers)
+
+    def open_window(window):
+        params = window_params(kwargs, start_arg, end_arg, window)
+        pages = pagination.iter_pages(fetch, key, **params)
+        return [window, pages, executor.submit(next, pages)]
+
+    pending = collections.deque()
+    try:
+        for window in itertools.islice(windows, workers):
+            pending.append(open_window(window))
+        while pending:
+            current = pending[0]
+            window, pages, future = current
+            page = future.result()
+            if page.next_page_token:
+                current[2] = executor.submit(next, pages)
+            else:
+                pending.popleft()
+                for following in windows:
+                    pending.append(open_window(following))
+                    break
+            yield window, page
+    finally:
+        for _, _, future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=False)
+
+
+def iter_sharded(
+    fetch,
+    key,
+    start,
+    end,
+    start_arg="start_time",
+    end_arg="end_time",
+    days=DEFAULT_WINDOW_DAYS,
+    record_key=record_id,
+    **kwargs,
+):
+    """Fetch the records of a range of any length as a single stream
+
+    A range that fits in one window is streamed page by page. Longer ranges
+    are split with :func:`split_range` and fetched with
+    :func:`iter_windows`. Records that are returned for more than one window
+    are only yielded once.
+
+    Takes the same arguments as :func:`iter_windows`, and:
+
+    :param record_key: A callable returning the key to de-duplicate records
+                       by, or ``None`` to keep all records
+    :return: A generator of records
+    """
+    windows = split_range(start, end, days)
+    if len(windows) == 1:
+        kwargs.pop("workers", None)
+        kwargs.pop("executor", None)
+        params = window_params(kwargs, start_arg, end_arg, windows[0])
+        records = pagination.iter_records(fetch, key, **params)
+    else:
+        records = (
+            record
+            for _, page in iter_windows(
+                fetch, key, start, end, start_arg, end_arg, days, **kwargs
+            )
+            for record in page.records
+        )
+    return unique(records, record_key)
+
+
+async def aiter_windows(
+    fetch,
+    key,
+    start,
+    end,
+    start_arg="start_time",
+    end_arg="end_time",
+    days=DEFAULT_WINDOW_DAYS,
+    workers=DEFAULT_WORKERS,
+    **kwargs,
+):
+    """Like :func:`iter_windows`, for list methods that return awaitables
+
+    The pages are fetched in tasks, for at most ``workers`` windows at a
+    time.
+
+    :return: An async generator of ``((start, end), page)`` tuples
+    """
+
+    def open_window(window):
+        params = window_params(kwargs, start_arg, end_arg, window)
+        pages = pagination.aiter_pages(fetch, key, **params)
+        return [window, pages, asyncio.ensure_future(_anext(pages))]
+
+    windows = iter(split_range(start, end, days))
+    pending = collections.deque()
+    try:
+        for window in itertools.islice(windows, workers):
+            pending.append(open_window(window))
+        while pending:
+            current = pending[0]
+            window, pages, task = current
+            page = await task
+            if page.next_page_token:
+                current[2] = asyncio.ensure_future(_anext(pages))
+            else:
+                pending.popleft()
+                for following in windows:
+                    pending.append(open_window(following))
+                    break
+            yield window, page
+    finally:
+        for _, _, task in pending:
+            task.cancel()
+
+
+async def aiter_sharded(
+    fetch,
+    key,
+    start,
+    end,
+    start_arg="start_time",
+    end_arg="end_time",
+    days=DEFAULT_WINDOW_DAYS,
+    record_key=record_id,
+    **kwargs,
+):
+    """Like :func:`iter_sharded`, for list methods that return awaitables
+
+    :return: An async generator of records
+    """
+    seen = set()
+    windows = aiter_windows(fetch, key, start, end, start_arg, end_arg, days, **kwargs)
+    async for _, page in windows:
+        for record in page.records:
+            value = record_key(record) if record_key is not None else None
+            if value is not None:
+                if value in seen:
+                    continue
+                seen.add(value)
+            yield record
+
+
+async def _anext(pages):
+    return await pages.__anext__()
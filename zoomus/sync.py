@@ -0,0 +1,141 @@
+"""Zoom.us REST API Python Client -- Incremental sync
+
+Keeps a local copy of users, past meetings and recordings up to date by
+fetching only what changed since the last sync, as change sets of records to
+upsert and ids to delete.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import collections
+import datetime
+import hashlib
+import json
+
+# The changes of a resource since the last sync. ``upserts`` are the new and
+# changed records, ``deletes`` the ids of the removed ones. ``key`` and
+# ``state`` are the watermark to save once the changes were applied, with
+# :meth:`IncrementalSync.commit`.
+ChangeSet = collections.namedtuple("ChangeSet", ["key", "upserts", "deletes", "state"])
+
+# The number of days before the watermark that are fetched again, to catch
+# records that were still being processed at the last sync
+DEFAULT_OVERLAP_DAYS = 1
+
+# The number of days, up to today, to fetch on the first sync of a resource
+DEFAULT_INITIAL_DAYS = 30
+
+
+def fingerprint(record):
+    """A digest of a record, to tell whether it changed"""
+    data = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+class IncrementalSync(object):
+    """Computes the changes of resources since their last sync
+
+    The watermarks are kept in a :class:`zoomus.export.CheckpointStore`.
+    Past meetings and recordings are fetched from the day of their watermark
+    on. The users endpoint cannot be filtered by change, so users are listed
+    in full, and compared to the fingerprints saved at the last sync.
+
+    A change set is only reflected in the watermarks once it is committed, so
+    changes that failed to apply are fetched again at the next sync.
+    """
+
+    def __init__(
+        self,
+        client,
+        store,
+        overlap_days=DEFAULT_OVERLAP_DAYS,
+        initial_days=DEFAULT_INITIAL_DAYS,
+        page_size=300,
+        today=datetime.date.today,
+    ):
+        """Setup a new incremental sync
+
+        :param client: The :class:`zoomus.ZoomClient` to sync with
+        :param store: The :class:`zoomus.export.CheckpointStore` to keep the
+                      watermarks in
+        :param overlap_days: The number of days before a watermark to fetch
+                             again
+        :param initial_days: The number of days to fetch on the first sync
+        :param page_size: The number of records per page
+        :param today: A callable returning the current
+                      :class:`datetime.date`
+        """
+        self.client = client
+        self.store = store
+        self.overlap_days = overlap_days
+        self.initial_days = initial_days
+        self.page_size = page_size
+        self.today = today
+
+    def users(self, **kwargs):
+        """The users that were created, changed or removed since the last
+        sync
+
+        :param kwargs: Any other arguments to list the users with
+        :return: A :data:`ChangeSet` of user records and ids
+        """
+        key = "sync:users"
+        known = self.store.get(key) or {}
+        fingerprints = {}
+        upserts = []
+        for user in self.client.user.iter_list(page_size=self.page_size, **kwargs):
+            fingerprints[user["id"]] = digest = fingerprint(user)
+            if known.get(user["id"]) != digest:
+                upserts.append(user)
+        deletes = sorted(set(known) - set(fingerprints))
+        return ChangeSet(key, upserts, deletes, fingerprints)
+
+    def recordings(self, user_id, **kwargs):
+        """The recordings of a user that were made or moved to the trash
+        since the last sync
+
+        :param user_id: The user id
+        :param kwargs: Any other arguments to list the recordings with
+        :return: A :data:`ChangeSet` of recording records and meeting uuids
+        """
+        key = "sync:recordings:{}".format(user_id)
+        start, end = self._range(key)
+        params = dict(kwargs, user_id=user_id, start=start, end=end)
+        params.setdefault("page_size", self.page_size)
+        upserts = list(self.client.recording.iter_list(**params))
+        trashed = self.client.recording.iter_list(trash="true", **params)
+        deletes = [recording["uuid"] for recording in trashed]
+        return ChangeSet(key, upserts, deletes, {"until": end.isoformat()})
+
+    def meetings(self, user_id, **kwargs):
+        """The past meetings of a user that were held since the last sync
+
+        :param user_id: The user id
+        :param kwargs: Any other arguments for the meetings report
+        :return: A :data:`ChangeSet` of meeting records. Past meetings are
+                 never deleted.
+        """
+        key = "sync:meetings:{}".format(user_id)
+        start, end = self._range(key)
+        params = dict(kwargs, user_id=user_id, start_time=start, end_time=end)
+        params.setdefault("page_size", self.page_size)
+        upserts = list(self.client.report.iter_get_user_report(**params))
+        return ChangeSet(key, upserts, [], {"until": end.isoformat()})
+
+    def commit(self, changes):
+        """Save the watermark of a change set, once it was applied
+
+        :param changes: The :data:`ChangeSet`
+        """
+        self.store.set(changes.key, changes.state)
+
+    def _range(self, key):
+        """The range of days to fetch for a resource"""
+        end = self.today()
+        state = self.store.get(key)
+        if state:
+            watermark = datetime.datetime.strptime(state["until"], "%Y-%m-%d").date()
+            start = watermark - datetime.timedelta(days=self.overlap_days)
+        else:
+            start = end - datetime.timedelta(days=self.initial_days - 1)
+        return min(start, end), end
@@ -8,28 +8,67 @@ import contextlib
 import json
 import requests
 import base64
-from datetime import datetime, timedelta
 import hmac
 import hashlib
+import re
+import time
 
 API_VERSION_1 = 1
 API_VERSION_2 = 2
 API_GDPR = "gdpr"
 
+# Finds the URL validation event in a raw webhook body without parsing it
+URL_VALIDATION_EVENT = re.compile(rb'"event"\s*:\s*"endpoint\.url_validation"')
+
 
 class ApiClient(object):
     """Simple wrapper for REST API requests"""
 
-    def __init__(self, base_uri=None, timeout=15, **kwargs):
+    def __init__(
+        self,
+        base_uri=None,
+        timeout=15,
+        session=None,
+        token_manager=None,
+        rate_limiter=None,
+        retry_policy=None,
+        rate_limit_tracker=None,
+        response_cache=None,
+        **kwargs,
+    ):
         """Setup a new API Client
 
         :param base_uri: The base URI to the API
         :param timeout: The timeout to use for requests
+        :param session: An optional :class:`requests.Session` to send the
+                        requests with. When given, connections are pooled and
+                        kept alive between requests (see
+                        :func:`create_session`). When ``None`` every request
+                        opens a new connection.
+        :param token_manager: An optional :class:`zoomus.auth.TokenManager`
+                              to take the access token from. When ``None``
+                              the token is read from the ``config``.
+        :param rate_limiter: An optional :class:`zoomus.ratelimit.RateLimiter`
+                             to pace the requests with
+        :param retry_policy: An optional :class:`zoomus.retry.RetryPolicy` to
+                             retry failed requests with
+        :param rate_limit_tracker: An optional
+                                   :class:`zoomus.ratelimit.RateLimitTracker`
+                                   to record the rate limit headers of the
+                                   responses with
+        :param response_cache: An optional :class:`zoomus.cache.ResponseCache`
+                               to cache the responses of GET requests in
         :param kwargs: Any other attributes. These will be added as
                            attributes to the ApiClient object.
         """
         self.base_uri = base_uri
         self.timeout = timeout
+        self.session = session
+        self.token_manager = token_manager
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.rate_limit_tracker = rate_limit_tracker
+        self.response_cache = response_cache
         for k, v in kwargs.items():
             setattr(self, k, v)
 
@@ -72,18 +111,94 @@ class ApiClient(object):
             endpoint = endpoint[:-1]
         return self.base_uri + endpoint
 
+    def get_token(self):
+        """The access token to authorize V2 requests with"""
+        if self.token_manager is not None:
+            return self.token_manager.token
+        return self.config.get("token")
+
+    def cache_scope(self, headers=None):
+        """What the cached responses of this client are shared by
+
+        :param headers: The request headers
+        :return: The base URI and the account, or the ``Authorization``
+                 header when the account is unknown
+        """
+        config = getattr(self, "config", None) or {}
+        account = config.get("account_id") or config.get("api_key")
+        if account is None and headers:
+            account = headers.get("Authorization")
+        return self.base_uri, account
+
+    def send_request(self, method, endpoint, **kwargs):
+        """Send a request using the pooled session, if there is one
+
+        When a request authorized with a token from the ``token_manager`` is
+        rejected with a 401, the token is renewed once for all callers and the
+        request is sent again with the new token. Requests that fail with a
+        transient error are retried as allowed by the ``retry_policy``.
+        Requests other than GET invalidate the cached responses of the
+        endpoint and of the endpoints above and below it, if there is a
+        ``response_cache``.
+
+        :param method: The HTTP method
+        :param endpoint: The endpoint
+        :param kwargs: Any other arguments for :meth:`requests.request`
+        :return: The :class:``requests.Response`` object for this request
+        """
+        if self.retry_policy is None:
+            response = self._send_authorized(method, endpoint, **kwargs)
+        else:
+            response = self.retry_policy.call(
+                method, lambda: self._send_authorized(method, endpoint, **kwargs)
+            )
+        if self.response_cache is not None and method.upper() != "GET":
+            self.response_cache.invalidate(endpoint)
+        return response
+
+    def _send_authorized(self, method, endpoint, **kwargs):
+        response = self._send(method, endpoint, **kwargs)
+        if response.status_code == 401 and self.token_manager is not None:
+            headers = kwargs.get("headers") or {}
+            authorization = headers.get("Authorization") or ""
+            if authorization.startswith("Bearer "):
+                token = self.token_manager.renew(authorization.split(" ", 1)[1])
+                if token:
+                    headers = dict(headers, Authorization="Bearer {}".format(token))
+                    kwargs["headers"] = headers
+                    response = self._send(method, endpoint, **kwargs)
+        return response
+
+    def _send(self, method, endpoint, **kwargs):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(method, endpoint)
+        sender = self.session if self.session is not None else requests
+        response = sender.request(
+            method, self.url_for(endpoint), timeout=self.timeout, **kwargs
+        )
+        if self.rate_limit_tracker is not None:
+            self.rate_limit_tracker.record(method, endpoint, response)
+        return response
+
     def get_request(self, endpoint, params=None, headers=None):
         """Helper function for GET requests
 
         :param endpoint: The endpoint
         :param params: The URL parameters
         :param headers: request headers
-        :return: The :class:``requests.Response`` object for this request
+        :return: The :class:``requests.Response`` object for this request. It
+                 may be a cached response, if there is a ``response_cache``.
         """
         if headers is None and self.config.get("version") == API_VERSION_2:
-            headers = {"Authorization": "Bearer {}".format(self.config.get("token"))}
-        return requests.get(
-            self.url_for(endpoint), params=params, headers=headers, timeout=self.timeout
+            headers = {"Authorization": "Bearer {}".format(self.get_token())}
+        if self.response_cache is None:
+            return self.send_request("GET", endpoint, params=params, headers=headers)
+        return self.response_cache.fetch(
+            "GET",
+            endpoint,
+            params,
+            lambda: self.send_request("GET", endpoint, params=params, headers=headers),
+            scope=self.cache_scope(headers),
         )
 
     def post_request(
@@ -103,16 +218,16 @@ class ApiClient(object):
             data = json.dumps(data)
         if headers is None and self.config.get("version") == API_VERSION_2:
             headers = {
-                "Authorization": "Bearer {}".format(self.config.get("token")),
+                "Authorization": "Bearer {}".format(self.get_token()),
                 "Content-Type": "application/json",
             }
-        return requests.post(
-            self.url_for(endpoint),
+        return self.send_request(
+            "POST",
+            endpoint,
             params=params,
             data=data,
             headers=headers,
             cookies=cookies,
-            timeout=self.timeout,
         )
 
     def patch_request(
@@ -132,16 +247,16 @@ class ApiClient(object):
             data = json.dumps(data)
         if headers is None and self.config.get("version") == API_VERSION_2:
             headers = {
-                "Authorization": "Bearer {}".format(self.config.get("token")),
+                "Authorization": "Bearer {}".format(self.get_token()),
                 "Content-Type": "application/json",
             }
-        return requests.patch(
-            self.url_for(endpoint),
+        return self.send_request(
+            "PATCH",
+            endpoint,
             params=params,
             data=data,
             headers=headers,
             cookies=cookies,
-            timeout=self.timeout,
         )
 
     def delete_request(
@@ -161,16 +276,16 @@ class ApiClient(object):
             data = json.dumps(data)
         if headers is None and self.config.get("version") == API_VERSION_2:
             headers = {
-                "Authorization": "Bearer {}".format(self.config.get("token")),
+                "Authorization": "Bearer {}".format(self.get_token()),
                 "Content-Type": "application/json",
             }
-        return requests.delete(
-            self.url_for(endpoint),
+        return self.send_request(
+            "DELETE",
+            endpoint,
             params=params,
             data=data,
             headers=headers,
             cookies=cookies,
-            timeout=self.timeout,
         )
 
     def put_request(self, endpoint, params=None, data=None, headers=None, cookies=None):
@@ -188,16 +303,16 @@ class ApiClient(object):
             data = json.dumps(data)
         if headers is None and self.config.get("version") == API_VERSION_2:
             headers = {
-                "Authorization": "Bearer {}".format(self.config.get("token")),
+                "Authorization": "Bearer {}".format(self.get_token()),
                 "Content-Type": "application/json",
             }
-        return requests.put(
-            self.url_for(endpoint),
+        return self.send_request(
+            "PUT",
+            endpoint,
             params=params,
             data=data,
             headers=headers,
             cookies=cookies,
-            timeout=self.timeout,
         )
 
 
@@ -261,7 +376,37 @@ def date_to_str(d):
     return d.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
-def generate_jwt(client_id, client_secret, account):
+def create_session(pool_connections=10, pool_maxsize=10, pool_block=False):
+    """Create a session that keeps a pool of persistent connections
+
+    :param pool_connections: The number of hosts to keep connection pools for
+    :param pool_maxsize: The maximum number of connections to keep alive per
+                         host
+    :param pool_block: Whether to block when all connections to a host are in
+                       use, rather than opening a connection that will not be
+                       kept alive. This makes ``pool_maxsize`` a hard per-host
+                       limit.
+    :return: The :class:`requests.Session`
+    """
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def access_token_request(client_id, client_secret, account):
+    """Build the Server-to-Server OAuth access token request
+
+    :param client_id: The Server-to-Server OAuth client id
+    :param client_secret: The Server-to-Server OAuth client secret
+    :param account: The Zoom.us account id
+    :return: A ``(url, data, headers)`` tuple for the POST request
+    """
     base64_auth_string = base64.b64encode(f"{client_id}:{client_secret}".encode("ascii")).decode("ascii")
 
     url = "https://zoom.us/oauth/token"
@@ -273,10 +418,29 @@ def generate_jwt(client_id, client_secret, account):
     headers = {
         "Authorization": f"Basic {base64_auth_string}",
     }
+    return url, payload, headers
+
+
+def request_access_token(client_id, client_secret, account, session=None):
+    """Request a Server-to-Server OAuth access token
+
+    :param client_id: The Server-to-Server OAuth client id
+    :param client_secret: The Server-to-Server OAuth client secret
+    :param account: The Zoom.us account id
+    :param session: An optional :class:`requests.Session` to use
+    :return: The decoded token response, which includes the ``access_token``
+             and the number of seconds it ``expires_in``
+    """
+    url, payload, headers = access_token_request(client_id, client_secret, account)
+    sender = session if session is not None else requests
+    response = sender.post(url, data=payload, headers=headers)
+    return response.json()
 
-    response = requests.post(url, data=payload, headers=headers)
-    token = response.json().get('access_token')
-    return token
+
+def generate_jwt(client_id, client_secret, account, session=None):
+    return request_access_token(client_id, client_secret, account, session=session).get(
+        "access_token"
+    )
 
 
 def encode_uuid(val):
@@ -293,13 +457,27 @@ def encode_uuid(val):
     return val
 
 
-def timestamp_is_valid(timestamp, delta_mins=5):
-    current_time = datetime.today()
-    sanity_timestamp = datetime.fromtimestamp(int(timestamp)/1000)
+def now_ms(clock=time.time):
+    """The current time of a clock, in integer milliseconds since the epoch"""
+    return int(clock() * 1000)
+
 
-    diff = current_time - sanity_timestamp
+def timestamp_is_valid(timestamp, delta_mins=5, now=None):
+    """Whether a webhook timestamp is within ``delta_mins`` minutes of now
 
-    return diff < timedelta(minutes=delta_mins)
+    Timestamps are compared as milliseconds since the epoch, which do not
+    depend on the timezone of the host. Timestamps in the future are accepted
+    within the same window, for clocks that are ahead.
+
+    :param timestamp: The ``x-zm-request-timestamp`` header, in milliseconds
+    :param delta_mins: The maximum difference with now, in minutes
+    :param now: The current time, in milliseconds since the epoch. Read from
+                the clock when ``None``.
+    :return: Whether the timestamp is valid
+    """
+    if now is None:
+        now = now_ms()
+    return abs(now - int(timestamp)) < delta_mins * 60 * 1000
 
 
 def contains_valid_signature(payload, timestamp, signature, secret):
@@ -320,6 +498,33 @@ def contains_valid_signature(payload, timestamp, signature, secret):
     return False
 
 
+def contains_valid_raw_signature(body, timestamp, signature, secret):
+    """Check the signature of a webhook over its raw request body
+
+    The HMAC is computed over the bytes as they were received, so unlike
+    :func:`contains_valid_signature` the body does not need to be parsed and
+    serialized again.
+
+    https://developers.zoom.us/docs/api/rest/webhook-reference/
+
+    :param body: The raw request body, as :class:`bytes`, :class:`bytearray`
+                 or :class:`memoryview`
+    :param timestamp: The ``x-zm-request-timestamp`` header
+    :param signature: The ``x-zm-signature`` header
+    :param secret: The secret token of the webhook
+    :return: Whether the signature is valid
+    """
+    # Imported here, as the webhooks module is built on this one
+    from zoomus import webhooks
+
+    return webhooks.verifier_for(secret).verify(body, timestamp, signature)
+
+
+def is_raw_body(body):
+    """Whether a webhook body is the raw request body rather than parsed"""
+    return isinstance(body, (bytes, bytearray, memoryview))
+
+
 def webhook_validation(plain_token, secret):
     """
     https://developers.zoom.us/docs/api/rest/webhook-reference/#validate-your-webhook-endpoint
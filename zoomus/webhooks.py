@@ -0,0 +1,385 @@
+"""Zoom.us REST API Python Client -- Webhooks
+
+Verifies the signatures of webhook requests with HMAC states that are keyed
+once per secret and copied for every message, and optionally rejects events
+that were already delivered.
+
+https://developers.zoom.us/docs/api/rest/webhook-reference/
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import collections
+import functools
+import hashlib
+import hmac
+import json
+import sqlite3
+import threading
+import time
+
+from zoomus import util
+
+SIGNATURE_HEADER = "x-zm-signature"
+TIMESTAMP_HEADER = "x-zm-request-timestamp"
+URL_VALIDATION = "endpoint.url_validation"
+
+
+class WebhookVerifier(object):
+    """Verifies webhook signatures for one or more secret tokens
+
+    Keying an HMAC hashes the secret, so this is done once per secret, and
+    the keyed state is copied for every message. Several secrets can be
+    active at once, e.g. while the secret token of a webhook is rotated: a
+    signature is valid if it matches any of them.
+    """
+
+    def __init__(self, secrets, replays=None, clock=time.time):
+        """Setup a new verifier
+
+        :param secrets: The secret token, or a list of secret tokens. The
+                        first one answers URL validation requests.
+        :param replays: An optional :class:`ReplayIndex`. Valid requests for
+                        events that were already delivered are then answered
+                        with ``(None, 200, None)``: they should be
+                        acknowledged, but not processed again.
+        :param clock: The callable returning the current time, in seconds
+                      since the epoch
+        """
+        self.replays = replays
+        self.clock = clock
+        if util.is_str_type(secrets):
+            secrets = [secrets]
+        if not secrets:
+            raise ValueError("At least one secret is required")
+        self._keyed = []
+        self._signing = []
+        for secret in secrets:
+            keyed = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+            signing = keyed.copy()
+            signing.update(b"v0:")
+            self._keyed.append(keyed)
+            self._signing.append(signing)
+
+    def signature(self, body, timestamp, index=0):
+        """The signature of a message with one of the secrets
+
+        :param body: The raw request body
+        :param timestamp: The request timestamp
+        :param index: The index of the secret
+        :return: The signature, as sent in the ``x-zm-signature`` header
+        """
+        mac = self._signing[index].copy()
+        mac.update(_prefix(timestamp))
+        mac.update(memoryview(body))
+        return "v0={}".format(mac.hexdigest())
+
+    def verify(self, body, timestamp, signature):
+        """Check the signature of a webhook over its raw request body
+
+        :param body: The raw request body, as :class:`bytes`,
+                     :class:`bytearray` or :class:`memoryview`
+        :param timestamp: The ``x-zm-request-timestamp`` header
+        :param signature: The ``x-zm-signature`` header
+        :return: Whether the signature matches any of the secrets
+        """
+        if isinstance(signature, bytes):
+            signature = signature.decode("latin-1")
+        if util.is_str_type(body):
+            body = body.encode("utf-8")
+        prefix = _prefix(timestamp)
+        body = memoryview(body)
+        for signing in self._signing:
+            mac = signing.copy()
+            mac.update(prefix)
+            mac.update(body)
+            try:
+                if hmac.compare_digest(signature, "v0={}".format(mac.hexdigest())):
+                    return True
+            except TypeError:
+                # Signatures with non-ASCII characters cannot be valid
+                return False
+        return False
+
+    def verify_payload(self, payload, timestamp, signature):
+        """Like :meth:`verify`, for a body that was already parsed
+
+        Prefer :meth:`verify` with the raw body, as the payload has to be
+        serialized again, exactly like Zoom did.
+        """
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return self.verify(body, timestamp, signature)
+
+    def encrypt_token(self, plain_token):
+        """The ``encryptedToken`` to answer a URL validation request with
+
+        :param plain_token: The ``plainToken`` of the request
+        :return: The HMAC of the token with the first secret
+        """
+        mac = self._keyed[0].copy()
+        mac.update(plain_token.encode("utf-8"))
+        return mac.hexdigest()
+
+    def validate(self, event, delta_mins=20):
+        """Validate a webhook request, see
+        :func:`zoomus.client.validate_webhook`
+
+        Malformed requests are rejected like invalid ones.
+
+        :return: A ``(valid, status, response)`` tuple
+        """
+        return self._validate(event, util.now_ms(self.clock), delta_mins)
+
+    def check(self, event, delta_mins=20):
+        """Like :meth:`validate`, but raise an error for a malformed request,
+        e.g. to answer it with a 400
+
+        :return: A ``(valid, status, response)`` tuple
+        :raises: :class:`ValueError` if the request is malformed
+        """
+        return self._check(event, util.now_ms(self.clock), delta_mins)
+
+    def validate_batch(self, events, delta_mins=20, now=None):
+        """Validate a batch of webhook requests
+
+        The current time is read once for the whole batch, and the signature
+        of a request outside of the time window is not computed at all. A
+        malformed request is rejected, without affecting the others.
+
+        :param events: The requests, as for :meth:`validate`
+        :param delta_mins: The maximum difference between the timestamp of a
+                           request and the current time, in minutes
+        :param now: The current time, in milliseconds since the epoch. Read
+                    from the clock when ``None``.
+        :return: A list of ``(valid, status, response)`` tuples, in the order
+                 of the requests
+        """
+        if now is None:
+            now = util.now_ms(self.clock)
+        return [self._validate(event, now, delta_mins) for event in events]
+
+    def _validate(self, event, now, delta_mins):
+        try:
+            return self._check(event, now, delta_mins)
+        except ValueError:
+            return False, None, None
+
+    def _check(self, event, now, delta_mins):
+        try:
+            return self._parse_and_verify(event, now, delta_mins)
+        except (KeyError, TypeError) as error:
+            raise ValueError("Malformed webhook request: {!r}".format(error))
+
+    def _parse_and_verify(self, event, now, delta_mins):
+        headers = event.get("headers", {})
+        signature = headers.get(SIGNATURE_HEADER)
+        timestamp = headers.get(TIMESTAMP_HEADER)
+        payload = event.get("body")
+
+        if util.is_raw_body(payload):
+            if not util.URL_VALIDATION_EVENT.search(payload):
+                if not _fresh(signature, timestamp, now, delta_mins):
+                    return False, None, None
+                if not self.verify(payload, timestamp, signature):
+                    return False, None, None
+                return self._first_delivery(payload, signature, now)
+            payload = json.loads(bytes(payload))
+
+        if payload and payload["event"] == URL_VALIDATION:
+            plain_token = payload["payload"]["plainToken"]
+            response = {
+                "plainToken": plain_token,
+                "encryptedToken": self.encrypt_token(plain_token),
+            }
+            return None, 200, response
+
+        if not _fresh(signature, timestamp, now, delta_mins):
+            return False, None, None
+        if not self.verify_payload(payload, timestamp, signature):
+            return False, None, None
+        return self._first_delivery(payload, signature, now)
+
+    def _first_delivery(self, payload, signature, now):
+        """The result for a valid request, which is a replay if its key is
+        already in the replay index"""
+        if self.replays is None:
+            return True, None, None
+        if util.is_raw_body(payload):
+            with util.ignored(ValueError):
+                payload = json.loads(bytes(payload))
+        if self.replays.add(replay_key(payload, signature), now):
+            return True, None, None
+        return None, 200, None
+
+
+def replay_key(payload, signature=None):
+    """The key that a redelivered event is recognized by
+
+    Zoom signs a redelivered event again, with a new timestamp, so the key is
+    made of the event, its ``event_ts`` and the id of its object. Payloads
+    without an ``event_ts`` are recognized by their signature.
+
+    :param payload: The parsed request body
+    :param signature: The ``x-zm-signature`` header
+    """
+    if isinstance(payload, dict) and payload.get("event_ts") is not None:
+        obj = (payload.get("payload") or {}).get("object") or {}
+        object_id = obj.get("uuid") or obj.get("id") or ""
+        return "{}:{}:{}".format(payload.get("event"), payload["event_ts"], object_id)
+    return signature
+
+
+class ReplayIndex(object):
+    """Remembers the webhook events that were already delivered
+
+    Subclasses must implement :meth:`add` and :meth:`discard`. An event is remembered for
+    ``ttl_mins`` minutes, which should be at least the ``delta_mins`` the
+    requests are validated with: older requests are rejected anyway.
+    """
+
+    def add(self, key, now=None):
+        """Remember an event
+
+        :param key: The :func:`replay_key` of the event
+        :param now: The current time, in milliseconds since the epoch
+        :return: Whether the event was not seen before
+        """
+        raise NotImplementedError
+
+    def discard(self, key):
+        """Forget an event, e.g. when it could not be handled, so that its
+        redelivery is not taken for a replay
+
+        :param key: The :func:`replay_key` of the event
+        """
+        raise NotImplementedError
+
+
+class MemoryReplayIndex(ReplayIndex):
+    """Remembers events in memory, for a single receiver process
+
+    Keys are kept in the order they were added, so expired keys are always
+    the oldest ones, and are dropped from the front. Once ``max_entries``
+    keys are remembered, the oldest one is dropped for every new one.
+    """
+
+    def __init__(self, ttl_mins=20, max_entries=100000):
+        """Setup a new in-memory replay index
+
+        :param ttl_mins: The number of minutes to remember an event for
+        :param max_entries: The maximum number of events to remember
+        """
+        self.ttl = ttl_mins * 60 * 1000
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, key, now=None):
+        if now is None:
+            now = util.now_ms()
+        with self._lock:
+            entries = self._entries
+            while entries and next(iter(entries.values())) <= now:
+                entries.popitem(last=False)
+            if key in entries:
+                return False
+            if len(entries) >= self.max_entries:
+                entries.popitem(last=False)
+            entries[key] = now + self.ttl
+            return True
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SQLiteReplayIndex(ReplayIndex):
+    """Remembers events in a SQLite database, which can be shared by several
+    receiver processes on the same host"""
+
+    def __init__(self, path, ttl_mins=20, timeout=30, purge_every=1000):
+        """Setup a new SQLite replay index
+
+        :param path: The path of the database file
+        :param ttl_mins: The number of minutes to remember an event for
+        :param timeout: The number of seconds to wait for another process
+                        writing to the database
+        :param purge_every: The number of events after which expired events
+                            are deleted
+        """
+        self.path = path
+        self.ttl = ttl_mins * 60 * 1000
+        self.timeout = timeout
+        self.purge_every = purge_every
+        self._added = 0
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS zoomus_webhook_replays "
+            "(key TEXT PRIMARY KEY, expires INTEGER NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS zoomus_webhook_replays_expires "
+            "ON zoomus_webhook_replays (expires)"
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            self._local.connection = connection
+        return connection
+
+    def add(self, key, now=None):
+        if now is None:
+            now = util.now_ms()
+        now = int(now)
+        connection = self._connection()
+        self._added += 1
+        if self._added % self.purge_every == 0:
+            connection.execute(
+                "DELETE FROM zoomus_webhook_replays WHERE expires <= ?", (now,)
+            )
+        else:
+            connection.execute(
+                "DELETE FROM zoomus_webhook_replays WHERE key = ? AND expires <= ?",
+                (key, now),
+            )
+        # Only one process can insert a key, however many see it at once
+        cursor = connection.execute(
+            "INSERT OR IGNORE INTO zoomus_webhook_replays (key, expires) "
+            "VALUES (?, ?)",
+            (key, now + self.ttl),
+        )
+        return cursor.rowcount == 1
+
+    def discard(self, key):
+        self._connection().execute(
+            "DELETE FROM zoomus_webhook_replays WHERE key = ?", (key,)
+        )
+
+
+def _fresh(signature, timestamp, now, delta_mins):
+    if not signature or not timestamp:
+        return False
+    try:
+        return util.timestamp_is_valid(timestamp, delta_mins, now=now)
+    except ValueError:
+        return False
+
+
+def _prefix(timestamp):
+    if isinstance(timestamp, bytes):
+        return timestamp + b":"
+    return "{}:".format(timestamp).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=32)
+def verifier_for(secret):
+    """A shared :class:`WebhookVerifier` for a secret token"""
+    return WebhookVerifier(secret)